@@ -0,0 +1,7 @@
+# Largest distance in Earth radii between a critical point and the same critical point in the next timestep. Used in get_nearest_matches()
+MATCH_TOLERANCE = 0.5
+
+# Critical point tracking across timesteps. Used in CriticalPointTracker
+MIN_TRACK_LENGTH = 3
+TRACK_TABLE_FILENAME = 'tracks/critical_point_tracks.csv'
+TRACK_TABLE_COLUMNS = ['TrackId', 'Timestep', 'Index', 'X', 'Y', 'Z', 'Type_text']
@@ -1,6 +1,5 @@
 
 
-import csv
 import logging
 import os
 from typing import Dict, List
@@ -11,6 +10,7 @@ import pandas as pd
 import criticalpoint_processor.helpers as helpers
 from vtk_visualization import helpers as vtk_helper
 from vectorfieldtopology.constants import TYPES, DETAILED_TYPES 
+from vectorfieldtopology.helpers import load_critical_points_info, save_critical_points_info
 
 class CriticalPointProcessor:
 
@@ -21,11 +21,10 @@ class CriticalPointProcessor:
         self.list_of_actors = []
 
     def load_critical_points_info(self, critical_points_info_filename:str):
-        """Loads critical point info from csv file"""
+        """Loads critical point info from a csv or npz file"""
 
         if(os.path.exists(critical_points_info_filename)):
-            df = pd.read_csv(critical_points_info_filename)
-            self.critical_points_info = df.to_dict('records')
+            self.critical_points_info = load_critical_points_info(critical_points_info_filename)
             self.critical_points = [[x['X'], x['Y'], x['Z']] for x in self.critical_points_info]
         else:
             raise FileNotFoundError("File not found..")
@@ -33,6 +32,7 @@ class CriticalPointProcessor:
     def set_critical_points_info(self, critical_points_info:List[Dict]):
         """Sets the critical point info"""
         self.critical_points_info = critical_points_info
+        self.critical_points = [[x['X'], x['Y'], x['Z']] for x in self.critical_points_info]
 
     def __filter_according_to(self, key:str, possible_types:List[str], wanted_types:List[str])-> List[Dict]:
 
@@ -72,13 +72,19 @@ class CriticalPointProcessor:
        
 
     def update_list_of_actors(self) -> None:
-        """Clears list of actors and updates based on current instance values of critical points"""
+        """Clears list of actors and updates based on current instance values of critical points. Does nothing in headless mode."""
         self.list_of_actors.clear()
+        if(vtk_helper.is_headless()):
+            return
+
         critical_point_actor = helpers.get_points_actor_from_list_of_points(self.critical_points)
         self.list_of_actors.append(critical_point_actor)
 
     def visualize(self) -> None:
         """Starts the rendering"""
+        if(vtk_helper.is_headless()):
+            return
+
         if(len(self.list_of_actors) == 0):
             warnings.warn("List of actors is empty. Make sure to update the list of actors with the function update_list_of_actors()")
 
@@ -86,6 +92,9 @@ class CriticalPointProcessor:
 
     def visualize_types(self, list_of_types):
         """Filteres critical points without overwriting the class attribute. Only used for visualization and starts the rendering."""
+        if(vtk_helper.is_headless()):
+            return
+
         info = self.__filter_according_to('Type_text', TYPES.values(), list_of_types)
         filtered_cp = [[x['X'], x['Y'], x['Z']] for x in info]
         critical_point_actor = helpers.get_points_actor_from_list_of_points(filtered_cp)
@@ -94,6 +103,9 @@ class CriticalPointProcessor:
 
     def visualize_detailed_types(self, list_of_types):
         """Filteres critical points without overwriting the class attribute. Only used for visualization and starts the rendering."""
+        if(vtk_helper.is_headless()):
+            return
+
         info = self.__filter_according_to('Detailed_type_text', DETAILED_TYPES.values(), list_of_types)
         filtered_cp = [[x['X'], x['Y'], x['Z']] for x in info]
         critical_point_actor = helpers.get_points_actor_from_list_of_points(filtered_cp)
@@ -102,9 +114,9 @@ class CriticalPointProcessor:
 
     def save_critical_points_to_file(self, critical_point_filename='critical_points.txt', critical_point_info_filename='critical_points_info.csv') -> None:
         """
-        Creates processed_critical_points directory with critical points as txt file and critical point information as a csv file
+        Creates processed_critical_points directory with critical points as txt file and critical point information as a csv or npz file
         :critical_point_filename: critical point filename
-        :critical_point_info_filename: critical point info filename
+        :critical_point_info_filename: critical point info filename. A '.npz' extension saves a binary file that keeps the gradients as float arrays.
         """
         dirName = 'processed_critical_points'
 
@@ -114,19 +126,8 @@ class CriticalPointProcessor:
         else:    
             logging.info(f"Directory {dirName} already exists.")
 
-        keys = self.critical_points_info[0].keys()
-
         try:
-            with open(f'{dirName}/{critical_point_info_filename}', mode='w',encoding='utf8', newline='') as output_to_csv:
-                dict_csv_writer = csv.DictWriter(output_to_csv, fieldnames=keys, dialect='excel')
-                dict_csv_writer.writeheader()
-                dict_csv_writer.writerows(self.critical_points_info)
-
-            # # TODO: Remove this, is for debugging in paraview.
-            # df = pd.read_csv(f'{dirName}/critical_points_info.csv')
-            # df.drop('gradient', inplace=True, axis=1)
-            # df.to_csv(f'{dirName}/critical_points_info_no_gradient.csv', index=False)
-            # # ===========================================================
+            save_critical_points_info(f'{dirName}/{critical_point_info_filename}', self.critical_points_info)
             
             np.savetxt(f"{dirName}/{critical_point_filename}", self.critical_points, fmt='%1.5f')
             logging.info(f"Saved critical point files, '{dirName}/{critical_point_filename}', and '{dirName}/{critical_point_info_filename}'")
@@ -1,6 +1,16 @@
-from vtk import vtkNamedColors, vtkPolyData, vtkSphereSource, vtkGlyph3D, vtkPolyDataMapper, vtkActor, vtkPoints
+from typing import Optional
+
+import numpy as np
+from vtkmodules.vtkCommonColor import vtkNamedColors
+from vtkmodules.vtkCommonCore import vtkIdList, vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkKdTreePointLocator, vtkPolyData
+from vtkmodules.vtkFiltersCore import vtkGlyph3D
+from vtkmodules.vtkFiltersSources import vtkSphereSource
+from vtkmodules.util.numpy_support import numpy_to_vtk
+from vtk_visualization.helpers import load_rendering_modules
 
 def get_points_actor_from_list_of_points(list_of_points):
+    rendering = load_rendering_modules()
 
     points = vtkPoints()
     for x,y,z in list_of_points:
@@ -21,13 +31,61 @@ def get_points_actor_from_list_of_points(list_of_points):
     glyph3D.SetInputData(polydata)
     glyph3D.Update()
 
-    mapper = vtkPolyDataMapper()
+    mapper = rendering.vtkPolyDataMapper()
     mapper.SetInputConnection(glyph3D.GetOutputPort())
 
-    actor = vtkActor()
+    actor = rendering.vtkActor()
     actor.SetMapper(mapper)
     actor.GetProperty().SetColor(colors.GetColor3d("Red"))
     actor.GetProperty().SetPointSize(5.)
     actor.GetProperty().SetRenderPointsAsSpheres(True)
 
-    return actor
\ No newline at end of file
+    return actor
+
+
+def get_nearest_matches(points: np.ndarray, previous_points: np.ndarray, tolerance: float, labels: Optional[np.ndarray] = None, previous_labels: Optional[np.ndarray] = None) -> np.ndarray:
+    """Returns the index of the matching previous point of every point, -1 if it has none.
+    The closest pairs are matched first, and every previous point is matched at most once.
+    :points: (N,3) array, e.g. the critical points of a timestep
+    :previous_points: (M,3) array, e.g. the critical points of the previous timestep
+    :tolerance: Largest distance between two matched points
+    :labels: (N,) array (optional), only points with the same label as a previous point can match it, e.g. the critical point types
+    :previous_labels: (M,) array of the previous labels, required with labels
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    previous_points = np.asarray(previous_points, dtype=float).reshape(-1, 3)
+    matches = np.full(len(points), -1, dtype=np.int64)
+    if(len(points) == 0 or len(previous_points) == 0):
+        return matches
+
+    vtk_points = vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(np.ascontiguousarray(previous_points), deep=True))
+    polydata = vtkPolyData()
+    polydata.SetPoints(vtk_points)
+
+    locator = vtkKdTreePointLocator()
+    locator.SetDataSet(polydata)
+    locator.BuildLocator()
+
+    # Candidate pairs (point, previous point) closer than the tolerance
+    ids = vtkIdList()
+    first, second = [], []
+    for i, point in enumerate(points):
+        locator.FindPointsWithinRadius(tolerance, point, ids)
+        candidates = [ids.GetId(j) for j in range(ids.GetNumberOfIds())]
+        first.extend([i]*len(candidates))
+        second.extend(candidates)
+
+    first, second = np.asarray(first, dtype=np.int64), np.asarray(second, dtype=np.int64)
+    if(labels is not None):
+        is_same_label = np.asarray(labels)[first] == np.asarray(previous_labels)[second]
+        first, second = first[is_same_label], second[is_same_label]
+
+    distances = np.linalg.norm(points[first]-previous_points[second], axis=1)
+    is_previous_matched = np.zeros(len(previous_points), dtype=bool)
+    for k in np.argsort(distances, kind='stable'):
+        if(matches[first[k]] < 0 and not is_previous_matched[second[k]]):
+            matches[first[k]] = second[k]
+            is_previous_matched[second[k]] = True
+
+    return matches
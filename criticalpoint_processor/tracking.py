@@ -0,0 +1,116 @@
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from criticalpoint_processor import constants
+from criticalpoint_processor.helpers import get_nearest_matches
+
+
+class CriticalPointTracker():
+    """
+    Links the critical points of consecutive timesteps into tracks with a persistent track id.
+    A critical point continues the track of the closest critical point of the previous timestep with the same type within the tolerance,
+    otherwise it starts a new track. The previous critical points are indexed in a kd-tree, and the closest pairs are linked first.
+    """
+
+    def __init__(self, tolerance: float = constants.MATCH_TOLERANCE):
+        """
+        :tolerance: Largest distance in Earth radii a critical point moves between two timesteps
+        """
+        self.tolerance = tolerance
+        self.track_table = pd.DataFrame(columns=constants.TRACK_TABLE_COLUMNS)
+        self.number_of_tracks = 0
+        self.timesteps = []
+
+        self.__list_of_rows = []
+        self.__previous_points = np.empty((0, 3))
+        self.__previous_types = np.empty(0, dtype=object)
+        self.__previous_track_ids = np.empty(0, dtype=np.int64)
+
+    def add_timestep(self, critical_points_info: List[Dict], timestep: Optional[Any] = None) -> np.ndarray:
+        """
+        Links the critical points of the next timestep to the tracks and returns the track id of every critical point.
+        :critical_points_info: List of critical point info dictionaries of the timestep, e.g. CriticalPointProcessor.critical_points_info
+        :timestep: Name of the timestep (optional), default is the number of the timestep
+        """
+        timestep = len(self.timesteps) if timestep is None else timestep
+        if(timestep in self.timesteps):
+            raise ValueError(f"Timestep '{timestep}' has already been added")
+
+        points = np.array([[x['X'], x['Y'], x['Z']] for x in critical_points_info], dtype=float).reshape(-1, 3)
+        types = np.array([x['Type_text'] for x in critical_points_info], dtype=object)
+
+        matches = get_nearest_matches(points, self.__previous_points, self.tolerance, types, self.__previous_types)
+        is_matched = matches >= 0
+
+        track_ids = np.empty(len(points), dtype=np.int64)
+        track_ids[is_matched] = self.__previous_track_ids[matches[is_matched]]
+        track_ids[~is_matched] = self.number_of_tracks + np.arange(np.count_nonzero(~is_matched))
+        self.number_of_tracks += np.count_nonzero(~is_matched)
+
+        self.__list_of_rows.append(pd.DataFrame({
+            'TrackId': track_ids,
+            'Timestep': [timestep]*len(points),
+            'Index': np.arange(len(points)),
+            'X': points[:, 0],
+            'Y': points[:, 1],
+            'Z': points[:, 2],
+            'Type_text': types,
+        }, columns=constants.TRACK_TABLE_COLUMNS))
+        self.track_table = pd.concat(self.__list_of_rows, ignore_index=True)
+        self.timesteps.append(timestep)
+
+        self.__previous_points, self.__previous_types, self.__previous_track_ids = points, types, track_ids
+
+        logging.info(f"Timestep {timestep}: {np.count_nonzero(is_matched)} of {len(points)} critical points continue a track, {np.count_nonzero(~is_matched)} new tracks.")
+        return track_ids
+
+    def get_track_lengths(self) -> pd.Series:
+        """Returns the number of timesteps of every track, indexed by track id"""
+        return self.track_table.groupby('TrackId').size()
+
+    def get_track_summary(self) -> pd.DataFrame:
+        """Returns one row per track with its type, first and last timestep, number of timesteps and the distance it moved"""
+        table = self.track_table.copy()
+        step = np.linalg.norm(table.groupby('TrackId')[['X', 'Y', 'Z']].diff().fillna(0).to_numpy(dtype=float), axis=1)
+        table['Distance'] = step
+
+        return table.groupby('TrackId').agg(
+            Type_text=('Type_text', 'first'),
+            FirstTimestep=('Timestep', 'first'),
+            LastTimestep=('Timestep', 'last'),
+            Length=('Timestep', 'size'),
+            Distance=('Distance', 'sum'),
+        ).reset_index()
+
+    def get_long_lived_indices(self, timestep: Any, min_length: int = constants.MIN_TRACK_LENGTH) -> List[int]:
+        """
+        Returns the indices in the critical point info of a timestep of the critical points whose track lasts at least min_length timesteps.
+        Tracks are only complete once every timestep has been added.
+        :timestep: Name of the timestep given to add_timestep()
+        :min_length: Smallest number of timesteps of a track
+        """
+        if(timestep not in self.timesteps):
+            raise ValueError(f"Unknown timestep '{timestep}'")
+
+        lengths = self.get_track_lengths()
+        rows = self.track_table[self.track_table['Timestep'] == timestep]
+        is_long_lived = lengths.loc[rows['TrackId']].to_numpy() >= min_length
+
+        return rows['Index'][is_long_lived].astype(int).tolist()
+
+    def filter_long_lived(self, critical_points_info: List[Dict], timestep: Any, min_length: int = constants.MIN_TRACK_LENGTH) -> List[Dict]:
+        """Returns the critical point info of a timestep without the critical points of tracks shorter than min_length, e.g. to seed only around long-lived critical points"""
+        indices = self.get_long_lived_indices(timestep, min_length)
+        return [critical_points_info[i] for i in indices]
+
+    def save_track_table_to_file(self, filename: str = constants.TRACK_TABLE_FILENAME) -> None:
+        """Saves the track table, one row per critical point and timestep, as csv"""
+        directory = os.path.dirname(filename)
+        if(directory != '' and not os.path.exists(directory)):
+            os.makedirs(directory)
+
+        self.track_table.to_csv(filename, index=False)
+        logging.info(f"Saved {self.number_of_tracks} tracks to '{filename}'")
@@ -0,0 +1,286 @@
+"""
+Runs the headless pipeline for every timestep file in a process pool.
+
+    python -m pipeline.batch "data/cut_mhd_*.dat" --parameters parameters.json --workers 8 --memory-limit 16
+
+Every timestep gets its own directory in the output directory, and a summary table with the time of every stage is written to summary.csv.
+With --prefetch-depth, every worker gets a contiguous range of timesteps and reads the next ones in the background while it processes the current one.
+With --incremental, every worker also gets a contiguous range and reuses the seed point status of the previous timestep in its range.
+With --min-track-length, the critical points are first tracked over all timesteps and only the long-lived ones are seeded.
+"""
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+import glob
+import json
+import logging
+import multiprocessing
+import os
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from pipeline import constants, helpers
+
+if TYPE_CHECKING:
+    from criticalpoint_processor.tracking import CriticalPointTracker
+    from vectorfieldtopology.reader import PrefetchingReader
+
+
+def get_arguments(arguments: Optional[List[str]] = None) -> argparse.Namespace:
+    """Returns the parsed command line arguments"""
+    parser = argparse.ArgumentParser(description="Runs the critical point pipeline for every timestep file, without rendering.")
+    parser.add_argument('inputs', nargs='+', help="Glob patterns of the timestep files, e.g. 'data/cut_mhd_*.dat'")
+    parser.add_argument('--parameters', help="JSON file with the stage parameters to change, in the layout of PARAMETERS in pipeline/constants.py")
+    parser.add_argument('--output-directory', default=constants.BATCH_OUTPUT_DIRECTORY, help="Directory of the timestep directories and the summary table")
+    parser.add_argument('--cache-directory', default=constants.CACHE_DIRECTORY, help="Directory of the stage cache, shared by all workers")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument('--memory-limit', type=float, help="Largest memory in GB of every worker process (Unix only)")
+    parser.add_argument('--export-scene', action='store_true', help="Also write the critical points, seed points and fieldlines of every timestep to a .vtm file")
+    parser.add_argument('--prefetch-depth', type=int, default=0, help="Number of timesteps every worker reads ahead in the background, 0 turns prefetching off")
+    parser.add_argument('--incremental', action='store_true', help="Only retrace the seed points that may have changed since the previous timestep")
+    parser.add_argument('--verify', action='store_true', help="With --incremental, also trace every seed point and count the ones with another status")
+    parser.add_argument('--min-track-length', type=int, help="Only seed around critical points that are tracked over at least this many timesteps")
+
+    return parser.parse_args(arguments)
+
+
+def get_filenames(patterns: List[str]) -> List[str]:
+    """Returns the sorted files matching any of the glob patterns"""
+    filenames = sorted({filename for pattern in patterns for filename in glob.glob(pattern)})
+    if(len(filenames) == 0):
+        raise FileNotFoundError(f"File not found.. No files match {patterns}")
+
+    return filenames
+
+
+def initialize_worker(memory_limit: Optional[int]) -> None:
+    """Runs once in every worker process"""
+    from vtk_visualization.helpers import set_headless
+
+    logging.basicConfig(level=logging.INFO, format=f'%(asctime)s [{os.getpid()}] %(message)s')
+    set_headless(True)
+    if(memory_limit is not None):
+        helpers.set_memory_limit(memory_limit)
+
+
+def get_critical_points_info(filename: str, parameters: Dict[str, Dict[str, Any]], cache_directory: str) -> List[Dict[str, Any]]:
+    """Runs the pipeline up to the filter stage for one timestep and returns its critical point info"""
+    from pipeline.pipeline import get_pipeline
+
+    parameters = helpers.get_merged_parameters(parameters, {'read': {'filename': filename}})
+    return get_pipeline(parameters, cache_directory).run(['filter'])['filter']
+
+
+def process_timestep(filename: str, parameters: Dict[str, Dict[str, Any]], output_directory: str, cache_directory: str, export_scene: bool = False, reader: Optional['PrefetchingReader'] = None, overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Runs the pipeline for one timestep and saves its outputs in '<output_directory>/<timestep>'. Returns the row of the summary table.
+    :filename: Timestep file
+    :parameters: Stage parameters, the filename of the read stage is replaced
+    :reader: PrefetchingReader of the timestep files (optional)
+    :overrides: Stage parameters of only this timestep (optional)
+    """
+    summary, _ = _process_timestep(filename, parameters, output_directory, cache_directory, export_scene, reader, overrides=overrides)
+    return summary
+
+
+def _process_timestep(filename: str, parameters: Dict[str, Dict[str, Any]], output_directory: str, cache_directory: str, export_scene: bool = False, reader: Optional['PrefetchingReader'] = None, previous: Optional[Dict[str, Any]] = None, overrides: Optional[Dict[str, Dict[str, Any]]] = None) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Returns the row of the summary table and the outputs for the incremental trace of the next timestep, None if the timestep failed"""
+    from criticalpoint_processor.criticalpoint_processor import CriticalPointProcessor
+    from pipeline.pipeline import get_pipeline
+    from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+    from vtk_visualization.helpers import export_scene as export
+
+    timestep = helpers.get_timestep_name(filename)
+    summary = {'timestep': timestep, 'filename': filename, 'status': 'done', 'error': ''}
+    outputs_for_next = None
+    start = time.perf_counter()
+    working_directory = os.getcwd()
+
+    try:
+        parameters = helpers.get_merged_parameters(parameters, {'read': {'filename': filename}})
+        if(overrides is not None):
+            parameters = helpers.get_merged_parameters(parameters, overrides)
+        pipeline = get_pipeline(parameters, cache_directory, reader=reader, previous=previous)
+        outputs = pipeline.run(['filter', 'seed', 'trace'])
+
+        # The save functions write relative to the working directory, it is restored when the timestep is done
+        timestep_directory = os.path.join(output_directory, timestep)
+        os.makedirs(timestep_directory, exist_ok=True)
+        os.chdir(timestep_directory)
+
+        cp_processor = CriticalPointProcessor()
+        cp_processor.set_critical_points_info(outputs['filter'])
+        cp_processor.save_critical_points_to_file()
+
+        sp_processor = SeedpointProcessor()
+        sp_processor.set_seed_critical_pair(outputs['seed'])
+        sp_processor.seedpoint_info = outputs['trace']['seedpoint_info']
+        sp_processor.fieldlines = outputs['trace']['fieldlines']
+        sp_processor.save_seed_point_info_to_file()
+        sp_processor.save_seed_points_to_file()
+        sp_processor.save_fieldlines_to_file()
+
+        if(export_scene):
+            export({'seed_points': outputs['seed'].to_polydata(), 'fieldlines': sp_processor.get_fieldlines_polydata()}, constants.BATCH_SCENE_FILENAME)
+
+        for name, elapsed in pipeline.timings.items():
+            summary[f'{name}_seconds'] = elapsed
+            summary[f'{name}_cached'] = pipeline.cache_hits[name]
+
+        summary['number_of_critical_points'] = len(outputs['filter'])
+        summary['number_of_seed_points'] = len(outputs['trace']['seedpoint_info'])
+        summary['retrace_fraction'] = outputs['trace']['retrace_fraction']
+        summary['number_of_mismatched_seed_points'] = outputs['trace']['number_of_mismatched_seed_points']
+        outputs_for_next = {'key': pipeline.get_key('trace'), 'seed': outputs['seed'], 'trace': outputs['trace']}
+
+    except Exception as error:
+        logging.exception(f"Timestep {timestep} failed")
+        summary.update({'status': 'failed', 'error': f"{type(error).__name__}: {error}"})
+
+    finally:
+        # The worker process is reused for the next timestep
+        os.chdir(working_directory)
+
+    summary['total_seconds'] = time.perf_counter()-start
+    return summary, outputs_for_next
+
+
+def process_timesteps(filenames: List[str], parameters: Dict[str, Dict[str, Any]], output_directory: str, cache_directory: str, export_scene: bool = False, prefetch_depth: int = 1, incremental: bool = False, overrides: Optional[Dict[str, Dict[str, Dict[str, Any]]]] = None) -> List[Dict[str, Any]]:
+    """
+    Runs process_timestep() for consecutive timesteps. Returns the rows of the summary table.
+    :filenames: Timestep files, in the order they are processed
+    :prefetch_depth: Number of files read ahead in the background, 0 turns prefetching off
+    :incremental: Reuse the seed point status of the previous timestep. A failed timestep makes the next one trace every seed point.
+    :overrides: Stage parameters of every timestep file (optional)
+    """
+    from vectorfieldtopology.reader import PrefetchingReader
+
+    reader = PrefetchingReader(filenames, parameters['read']['rename_xyz'], prefetch_depth) if prefetch_depth > 0 else None
+    list_of_summaries = []
+    previous = None
+
+    try:
+        for filename in filenames:
+            summary, outputs = _process_timestep(filename, parameters, output_directory, cache_directory, export_scene, reader, previous, (overrides or {}).get(filename))
+            list_of_summaries.append(summary)
+            previous = outputs if incremental else None
+    finally:
+        if(reader is not None):
+            reader.close()
+
+    return list_of_summaries
+
+
+def get_chunks(filenames: List[str], number_of_chunks: int) -> List[List[str]]:
+    """Splits the files into at most number_of_chunks contiguous ranges of about the same size"""
+    number_of_chunks = max(1, min(number_of_chunks, len(filenames)))
+    size, remainder = divmod(len(filenames), number_of_chunks)
+
+    chunks, start = [], 0
+    for i in range(number_of_chunks):
+        end = start+size+(1 if i < remainder else 0)
+        chunks.append(filenames[start:end])
+        start = end
+
+    return chunks
+
+
+def track_critical_points(executor: Executor, filenames: List[str], parameters: Dict[str, Dict[str, Any]], cache_directory: str) -> 'CriticalPointTracker':
+    """Finds the critical points of every timestep in the pool and links them into tracks, in the order of the files. A failed timestep ends every track."""
+    from criticalpoint_processor.tracking import CriticalPointTracker
+
+    tracker = CriticalPointTracker()
+    futures = [executor.submit(get_critical_points_info, filename, parameters, cache_directory) for filename in filenames]
+    for filename, future in zip(filenames, futures):
+        try:
+            critical_points_info = future.result()
+        except Exception as error:
+            logging.info(f"Critical points of {helpers.get_timestep_name(filename)} not found ({type(error).__name__}: {error}), the tracks are ended.")
+            critical_points_info = []
+
+        tracker.add_timestep(critical_points_info, helpers.get_timestep_name(filename))
+
+    return tracker
+
+
+def run_batch(filenames: List[str], parameters: Dict[str, Dict[str, Any]], output_directory: str = constants.BATCH_OUTPUT_DIRECTORY, cache_directory: str = constants.CACHE_DIRECTORY, workers: Optional[int] = None, memory_limit: Optional[int] = None, export_scene: bool = False, prefetch_depth: int = 0, incremental: bool = False, min_track_length: Optional[int] = None) -> pd.DataFrame:
+    """
+    Processes every timestep in a pool of worker processes and writes the summary table to '<output_directory>/summary.csv'. Returns the summary table.
+    :filenames: Timestep files
+    :parameters: Stage parameters, see PARAMETERS
+    :workers: Number of worker processes (optional), default is the number of CPUs
+    :memory_limit: Largest memory in bytes of every worker process (optional), the prefetching process is limited as well
+    :prefetch_depth: Number of timesteps every worker reads ahead, 0 turns prefetching off
+    :incremental: Reuse the seed point status of the previous timestep of the same worker, see SeedpointProcessor.update_seed_point_info_incremental()
+    :min_track_length: Only seed around critical points tracked over at least this many timesteps (optional). The track table is saved in the output directory.
+    """
+    # Absolute paths, since the workers change their working directory
+    filenames = [os.path.abspath(filename) for filename in filenames]
+    output_directory, cache_directory = os.path.abspath(output_directory), os.path.abspath(cache_directory)
+    os.makedirs(output_directory, exist_ok=True)
+
+    list_of_summaries = []
+    workers = os.cpu_count() if workers is None else workers
+    # Spawned workers don't inherit the state of vtk or of threads in the main process
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'), initializer=initialize_worker, initargs=(memory_limit,)) as executor:
+        overrides = {}
+        if(min_track_length is not None):
+            # The critical points are cached, so the pipeline below only runs the stages after the filter again
+            tracker = track_critical_points(executor, filenames, parameters, cache_directory)
+            tracker.save_track_table_to_file(os.path.join(output_directory, constants.BATCH_TRACK_TABLE_FILENAME))
+            tracker.get_track_summary().to_csv(os.path.join(output_directory, constants.BATCH_TRACK_SUMMARY_FILENAME), index=False)
+            overrides = {filename: {'filter': {'indices': tracker.get_long_lived_indices(helpers.get_timestep_name(filename), min_track_length)}} for filename in filenames}
+            logging.info(f"{int((tracker.get_track_lengths() >= min_track_length).sum())} of {tracker.number_of_tracks} critical point tracks last at least {min_track_length} timesteps.")
+
+        if(prefetch_depth > 0 or incremental):
+            # Prefetching and the incremental trace only help within a range of consecutive timesteps, so every worker gets one range
+            futures = {executor.submit(process_timesteps, chunk, parameters, output_directory, cache_directory, export_scene, prefetch_depth, incremental, overrides): chunk for chunk in get_chunks(filenames, workers)}
+        else:
+            futures = {executor.submit(process_timestep, filename, parameters, output_directory, cache_directory, export_scene, None, overrides.get(filename)): [filename] for filename in filenames}
+
+        for future in as_completed(futures):
+            try:
+                summaries = future.result()
+                summaries = summaries if isinstance(summaries, list) else [summaries]
+            except Exception as error:
+                # The worker failed outside of the pipeline, e.g. a BrokenProcessPool when it was killed for running out of memory
+                summaries = [{'timestep': helpers.get_timestep_name(filename), 'filename': filename, 'status': 'failed', 'error': f"{type(error).__name__}: {error}"} for filename in futures[future]]
+
+            for summary in summaries:
+                list_of_summaries.append(summary)
+                logging.info(f"{len(list_of_summaries)}/{len(filenames)} {summary['timestep']}: {summary['status']} in {summary.get('total_seconds', float('nan')):.2f} s")
+
+    summary_table = pd.DataFrame(list_of_summaries).sort_values('timestep').reset_index(drop=True)
+    summary_table.to_csv(os.path.join(output_directory, constants.BATCH_SUMMARY_FILENAME), index=False)
+    logging.info(f"Saved the summary of {len(summary_table)} timesteps to '{output_directory}/{constants.BATCH_SUMMARY_FILENAME}'")
+
+    return summary_table
+
+
+def main(arguments: Optional[List[str]] = None) -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    arguments = get_arguments(arguments)
+
+    parameters = constants.PARAMETERS
+    if(arguments.parameters is not None):
+        if(not os.path.exists(arguments.parameters)):
+            raise FileNotFoundError("File not found..")
+        with open(arguments.parameters) as file:
+            parameters = helpers.get_merged_parameters(parameters, json.load(file))
+
+    if(arguments.verify):
+        parameters = helpers.get_merged_parameters(parameters, {'trace': {'verify': True}})
+
+    memory_limit = None if arguments.memory_limit is None else int(arguments.memory_limit*1024**3)
+    summary_table = run_batch(get_filenames(arguments.inputs), parameters, arguments.output_directory, arguments.cache_directory, arguments.workers, memory_limit, arguments.export_scene, arguments.prefetch_depth, arguments.incremental, arguments.min_track_length)
+
+    number_of_failed = int((summary_table['status'] == 'failed').sum())
+    if(number_of_failed > 0):
+        logging.info(f"{number_of_failed} timesteps failed, see the error column of the summary.")
+
+    if(arguments.incremental and 'retrace_fraction' in summary_table):
+        logging.info(f"Retraced {100*summary_table['retrace_fraction'].mean():.1f}% of the seed points on average.")
+
+
+if __name__ == '__main__':
+    main()
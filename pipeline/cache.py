@@ -0,0 +1,102 @@
+import logging
+import os
+import pickle
+from typing import Any, Tuple
+
+from pipeline import constants
+
+
+class StageCache():
+    """
+    Disk cache of stage outputs. Every output is pickled to '<key>.pkl' in the directory.
+    When the files grow larger than max_bytes, the least recently used ones are deleted.
+    """
+
+    def __init__(self, directory: str = constants.CACHE_DIRECTORY, max_bytes: int = constants.CACHE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Returns (True, output) if the key is cached, otherwise (False, None)"""
+        path = self.__get_path(key)
+        try:
+            with open(path, 'rb') as file:
+                output = pickle.load(file)
+        except FileNotFoundError:
+            return False, None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError) as error:
+            logging.info(f"Cached output {key} can't be loaded ({error}) and is deleted.")
+            self.__remove(path)
+            return False, None
+
+        # The modification time marks when the output was last used
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return True, output
+
+    def set(self, key: str, output: Any) -> None:
+        """Pickles the output and evicts the least recently used outputs if the cache is full"""
+        data = pickle.dumps(output, protocol=pickle.HIGHEST_PROTOCOL)
+        if(len(data) > self.max_bytes):
+            logging.info(f"Output {key} is larger than the stage cache and is not cached.")
+            return
+
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+        # Written to a temporary file first so a crash, or another process using the cache, never sees a broken output
+        path = self.__get_path(key)
+        with open(f"{path}.{os.getpid()}.tmp", 'wb') as file:
+            file.write(data)
+        os.replace(f"{path}.{os.getpid()}.tmp", path)
+
+        self.__evict()
+
+    def get_cache_size(self) -> int:
+        """Returns the number of bytes of the cached outputs"""
+        return sum(size for _, _, size in self.__get_files())
+
+    def clear(self) -> None:
+        """Deletes every cached output"""
+        for path, _, _ in self.__get_files():
+            self.__remove(path)
+
+    def __get_path(self, key: str) -> str:
+        return f"{self.directory}/{key}.pkl"
+
+    def __get_files(self):
+        """Returns (path, modification time, size) of every cached output, least recently used first"""
+        if not os.path.exists(self.directory):
+            return []
+
+        files = []
+        for entry in os.scandir(self.directory):
+            if(entry.name.endswith('.pkl')):
+                # Another process can evict the file in the meantime
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_mtime_ns, stat.st_size))
+
+        return sorted(files, key=lambda file: file[1])
+
+    def __evict(self) -> None:
+        files = self.__get_files()
+        cache_size = sum(size for _, _, size in files)
+
+        for path, _, size in files:
+            if(cache_size <= self.max_bytes):
+                break
+            self.__remove(path)
+            cache_size -= size
+            logging.info(f"Evicted '{path}' from the stage cache.")
+
+    def __remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,51 @@
+# Stage cache. Used in Pipeline
+CACHE_DIRECTORY = '.pipeline_cache'
+CACHE_SIZE = 10*1024**3
+
+# Modules hashed into the cache key of every stage: the stage functions, the code they call and its constants.
+# A change in their source reruns the stage.
+_STAGE_MODULES = ['pipeline.stages']
+_VECTORFIELD_MODULES = ['vectorfieldtopology.vectorfieldtopology', 'vectorfieldtopology.helpers', 'vectorfieldtopology.derived_fields', 'vectorfieldtopology.reader', 'vectorfieldtopology.sampling', 'vectorfieldtopology.constants']
+_CRITICAL_POINT_MODULES = ['criticalpoint_processor.criticalpoint_processor', 'criticalpoint_processor.helpers', 'criticalpoint_processor.constants']
+_SEED_MODULES = ['seedpoint_generator.seedpoint_generator', 'seedpoint_generator.seed_critical_pair', 'seedpoint_generator.template_engine', 'vectorfieldtopology.sampling', 'seedpoint_generator.helpers', 'seedpoint_generator.constants']
+_TRACE_MODULES = ['seedpoint_processor.seedpoint_processor', 'seedpoint_processor.fieldlines', 'seedpoint_processor.helpers', 'seedpoint_processor.constants', 'criticalpoint_processor.helpers', 'criticalpoint_processor.constants']
+STAGE_SOURCE_MODULES = {
+    'read': _STAGE_MODULES + _VECTORFIELD_MODULES,
+    'topology': _STAGE_MODULES + _VECTORFIELD_MODULES,
+    'filter': _STAGE_MODULES + _CRITICAL_POINT_MODULES,
+    'seed': _STAGE_MODULES + _SEED_MODULES,
+    'trace': _STAGE_MODULES + _TRACE_MODULES,
+}
+
+# Parameters of every stage of get_pipeline()
+PARAMETERS = {
+    'read': {
+        'filename': 'data/cut_mhd_2_e20000101-020000-000.dat',
+        'rename_xyz': True,
+        'scalar_names': ['B_x [nT]', 'B_y [nT]', 'B_z [nT]'],
+    },
+    'topology': {
+        'radius': 3,
+        'center': [0, 0, 0],
+    },
+    'filter': {
+        'types': ['SADDLE_2_3D', 'SADDLE_1_3D'],
+        # Positions in the filtered critical point info to keep, None keeps all
+        'indices': None,
+    },
+    'seed': {
+        'template': 'SPHERICAL',
+        'seed_budget': None,
+    },
+    'trace': {
+        # Only used in incremental mode, compares the result with a full recomputation
+        'verify': False,
+    },
+}
+
+# Batch processing of timesteps. Used in batch.py
+BATCH_OUTPUT_DIRECTORY = 'results'
+BATCH_SUMMARY_FILENAME = 'summary.csv'
+BATCH_SCENE_FILENAME = 'scene.vtm'
+BATCH_TRACK_TABLE_FILENAME = 'critical_point_tracks.csv'
+BATCH_TRACK_SUMMARY_FILENAME = 'critical_point_track_summary.csv'
@@ -0,0 +1,74 @@
+import hashlib
+import importlib.util
+import json
+import os
+from typing import Any, Dict, List, Tuple
+import warnings
+
+
+def get_file_stat(filename: str) -> Tuple[str, int, int]:
+    """Returns (absolute path, size, modification time in ns) of the file, a cheap stand-in for its content"""
+    if(not os.path.exists(filename)):
+        raise FileNotFoundError(f"File not found.. {filename}")
+
+    stat = os.stat(filename)
+    return os.path.abspath(filename), stat.st_size, stat.st_mtime_ns
+
+
+def get_module_source_hash(module_name: str) -> str:
+    """Returns the sha256 of the source file of a module, without importing it"""
+    spec = importlib.util.find_spec(module_name)
+    if(spec is None or spec.origin is None):
+        raise ValueError(f"Module '{module_name}' not found")
+
+    with open(spec.origin, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def get_key(name: str, parameters: Dict[str, Any], input_files: List[str], source_modules: List[str], upstream_keys: List[str]) -> str:
+    """Returns the cache key of a stage, the sha256 of everything its output depends on
+    :name: Name of the stage
+    :parameters: Parameters of the stage, must be JSON serializable or have a unique str()
+    :input_files: Files read by the stage, hashed by their stat
+    :source_modules: Modules hashed by their source
+    :upstream_keys: Keys of the stages the stage depends on
+    """
+    description = {
+        'name': name,
+        'parameters': parameters,
+        'input_files': [get_file_stat(filename) for filename in input_files],
+        'source_modules': {module_name: get_module_source_hash(module_name) for module_name in source_modules},
+        'upstream_keys': upstream_keys,
+    }
+
+    return hashlib.sha256(json.dumps(description, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def get_merged_parameters(parameters: Dict[str, Dict[str, Any]], overrides: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Returns a copy of the stage parameters with the parameters in overrides replaced
+    :parameters: Dictionary with the parameters of every stage
+    :overrides: Dictionary with the parameters to replace of some stages
+    """
+    for name in overrides:
+        if(name not in parameters):
+            raise ValueError(f"Unknown stage '{name}'. Use one of {list(parameters)}")
+
+    return {name: {**stage_parameters, **overrides.get(name, {})} for name, stage_parameters in parameters.items()}
+
+
+def get_timestep_name(filename: str) -> str:
+    """Returns the name of a timestep from its filename, e.g. 'cut_mhd_2_e20000101-020000-000' from 'data/cut_mhd_2_e20000101-020000-000.dat'"""
+    return os.path.splitext(os.path.basename(filename))[0]
+
+
+def set_memory_limit(max_bytes: int) -> None:
+    """Limits the address space of the current process. A stage going over it gets a MemoryError. Only works on Unix.
+    :max_bytes: Largest address space in bytes
+    """
+    try:
+        import resource
+    except ImportError:
+        warnings.warn("The memory limit is only supported on Unix and is ignored.")
+        return
+
+    resource.setrlimit(resource.RLIMIT_AS, (max_bytes, max_bytes))
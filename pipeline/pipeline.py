@@ -0,0 +1,147 @@
+from collections import OrderedDict
+from functools import partial
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pipeline import constants, helpers, stages
+from pipeline.cache import StageCache
+from vectorfieldtopology.reader import PrefetchingReader
+
+
+class Stage():
+    """One step of a Pipeline. The function gets the parameters and the outputs of the upstream stages, in order."""
+
+    def __init__(self, name: str, function: Callable[..., Any], parameters: Optional[Dict[str, Any]] = None, upstream: List[str] = (), input_files: List[str] = (), source_modules: List[str] = (), is_cached: bool = True):
+        """
+        :name: Name of the stage
+        :function: Function computing the output of the stage
+        :parameters: Parameters given to the function, part of the cache key
+        :upstream: Names of the stages whose outputs are given to the function
+        :input_files: Files read by the stage, their stat is part of the cache key
+        :source_modules: Modules whose source is part of the cache key, e.g. the module of the function, the code it calls and its constants
+        :is_cached: Store the output in the disk cache. Turn off for outputs that can't be pickled.
+        """
+        self.name = name
+        self.function = function
+        self.parameters = {} if parameters is None else parameters
+        self.upstream = list(upstream)
+        self.input_files = list(input_files)
+        self.source_modules = list(source_modules)
+        self.is_cached = is_cached
+
+
+class Pipeline():
+    """
+    Stages forming a DAG, run in dependency order. The output of every cached stage is stored on disk under a hash of its
+    parameters, input files, source modules and the keys of its upstream stages. A stage whose key is cached is loaded instead
+    of run, and its upstream stages are only run if another stage needs them.
+    """
+
+    def __init__(self, cache_directory: str = constants.CACHE_DIRECTORY, cache_size: int = constants.CACHE_SIZE):
+        """
+        :cache_directory: Directory of the disk cache
+        :cache_size: Largest size in bytes of the disk cache, the least recently used outputs are evicted
+        """
+        self.stages = OrderedDict()
+        self.cache = StageCache(cache_directory, cache_size)
+        self.outputs = {}
+        self.timings = OrderedDict()
+        self.cache_hits = OrderedDict()
+
+    def add_stage(self, stage: Stage) -> None:
+        """Adds a stage. Upstream stages have to be added first, so the stages can't form a cycle."""
+        for name in stage.upstream:
+            if(name not in self.stages):
+                raise ValueError(f"Upstream stage '{name}' of '{stage.name}' has not been added")
+
+        self.stages[stage.name] = stage
+
+    def set_parameters(self, name: str, parameters: Dict[str, Any]) -> None:
+        """Replaces the parameters of a stage"""
+        self.__get_stage(name).parameters = parameters
+
+    def get_key(self, name: str) -> str:
+        """Returns the cache key of a stage"""
+        stage = self.__get_stage(name)
+        return helpers.get_key(stage.name, stage.parameters, stage.input_files, stage.source_modules, [self.get_key(upstream) for upstream in stage.upstream])
+
+    def run(self, targets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Returns the output of every target. Only the stages needed for them are run, the others are loaded from the cache or skipped.
+        The time and the cache hit of every stage are stored in timings and cache_hits.
+        :targets: Names of the stages (optional), default is every stage no other stage depends on
+        """
+        if(targets is None):
+            upstream = {name for stage in self.stages.values() for name in stage.upstream}
+            targets = [name for name in self.stages if name not in upstream]
+
+        self.outputs = {}
+        self.timings = OrderedDict()
+        self.cache_hits = OrderedDict()
+
+        return {name: self.get_output(name) for name in targets}
+
+    def get_output(self, name: str) -> Any:
+        """Returns the output of a stage, from this run, the cache or by running it"""
+        if(name in self.outputs):
+            return self.outputs[name]
+
+        stage = self.__get_stage(name)
+        key = self.get_key(name)
+
+        if(stage.is_cached):
+            start = time.perf_counter()
+            is_cached, output = self.cache.get(key)
+            if(is_cached):
+                self.__set_output(name, output, time.perf_counter()-start, True)
+                logging.info(f"Stage '{name}' loaded from the cache ({key[:12]}).")
+                return output
+
+        inputs = [self.get_output(upstream) for upstream in stage.upstream]
+
+        start = time.perf_counter()
+        output = stage.function(stage.parameters, *inputs)
+        elapsed = time.perf_counter()-start
+
+        if(stage.is_cached):
+            self.cache.set(key, output)
+
+        self.__set_output(name, output, elapsed, False)
+        logging.info(f"Stage '{name}' ran in {elapsed:.2f} s.")
+        return output
+
+    def __set_output(self, name: str, output: Any, elapsed: float, is_cache_hit: bool) -> None:
+        self.outputs[name] = output
+        self.timings[name] = elapsed
+        self.cache_hits[name] = is_cache_hit
+
+    def __get_stage(self, name: str) -> Stage:
+        if(name not in self.stages):
+            raise ValueError(f"Unknown stage '{name}'. Use one of {list(self.stages)}")
+
+        return self.stages[name]
+
+
+def get_pipeline(parameters: Dict[str, Dict[str, Any]] = constants.PARAMETERS, cache_directory: str = constants.CACHE_DIRECTORY, cache_size: int = constants.CACHE_SIZE, reader: Optional[PrefetchingReader] = None, previous: Optional[Dict[str, Any]] = None) -> Pipeline:
+    """
+    Returns the pipeline of main.py: read -> topology -> filter -> seed -> trace, where trace also needs the vectorfield of read.
+    :parameters: Dictionary with the parameters of every stage, see PARAMETERS
+    :reader: PrefetchingReader used by the read stage (optional)
+    :previous: Outputs of the previous timestep for the incremental trace stage (optional), a dictionary with its 'seed' and 'trace' outputs and the 'key' of its trace stage
+    """
+    pipeline = Pipeline(cache_directory, cache_size)
+    modules = constants.STAGE_SOURCE_MODULES
+
+    pipeline.add_stage(Stage('read', partial(stages.read_vectorfield, reader=reader), parameters['read'], input_files=[parameters['read']['filename']], source_modules=modules['read'], is_cached=False))
+    pipeline.add_stage(Stage('topology', stages.find_critical_points, parameters['topology'], upstream=['read'], source_modules=modules['topology']))
+    pipeline.add_stage(Stage('filter', stages.filter_critical_points, parameters['filter'], upstream=['topology'], source_modules=modules['filter']))
+    pipeline.add_stage(Stage('seed', stages.generate_seed_points, parameters['seed'], upstream=['filter'], source_modules=modules['seed']))
+    if(previous is None):
+        pipeline.add_stage(Stage('trace', stages.trace_seed_points, parameters['trace'], upstream=['read', 'seed'], source_modules=modules['trace']))
+    else:
+        # The incremental output depends on the previous timestep, so its key is part of the cache key
+        trace_parameters = {**parameters['trace'], 'previous_key': previous['key']}
+        pipeline.add_stage(Stage('trace', partial(stages.trace_seed_points, previous=previous), trace_parameters, upstream=['read', 'seed'], source_modules=modules['trace']))
+
+    return pipeline
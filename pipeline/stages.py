@@ -0,0 +1,69 @@
+from typing import Any, Dict, List, Optional
+
+from criticalpoint_processor.criticalpoint_processor import CriticalPointProcessor
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+from vectorfieldtopology.reader import PrefetchingReader
+from vectorfieldtopology.vectorfieldtopology import CriticalPointInfo, VectorFieldTopology
+
+# The stages of get_pipeline(). Every stage gets its parameters and the outputs of its upstream stages, in order.
+
+
+def read_vectorfield(parameters: Dict[str, Any], reader: Optional[PrefetchingReader] = None) -> VectorFieldTopology:
+    """Reads the file and builds the vectorfield. Not cached, since vtk objects can't be pickled.
+    :reader: PrefetchingReader of the timestep files (optional)
+    """
+    vft = VectorFieldTopology()
+    vft.read_file(parameters['filename'], rename_xyz=parameters['rename_xyz'], reader=reader)
+    vft.update_vectorfield_from_scalars(*parameters['scalar_names'])
+    return vft
+
+
+def find_critical_points(parameters: Dict[str, Any], vft: VectorFieldTopology) -> List[CriticalPointInfo]:
+    """Returns the critical point info outside the removed sphere"""
+    vft.update_topology_object()
+    vft.update_critical_points()
+    vft.remove_critical_points_in_sphere(radius=parameters['radius'], center=tuple(parameters['center']))
+    return vft.critical_points_info
+
+
+def filter_critical_points(parameters: Dict[str, Any], critical_points_info: List[CriticalPointInfo]) -> List[CriticalPointInfo]:
+    """Returns the critical point info of the given types. If indices is given, only the critical points at those positions of the filtered info are kept, e.g. the long-lived ones of a CriticalPointTracker."""
+    cp_processor = CriticalPointProcessor()
+    cp_processor.set_critical_points_info(critical_points_info)
+    cp_processor.filter_critical_points_by_types(parameters['types'])
+
+    if(parameters['indices'] is not None):
+        return [cp_processor.critical_points_info[i] for i in parameters['indices']]
+    return cp_processor.critical_points_info
+
+
+def generate_seed_points(parameters: Dict[str, Any], critical_points_info: List[CriticalPointInfo]) -> SeedCriticalPair:
+    """Returns the seed points around the critical points"""
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(critical_points_info)
+    sp_generator.set_template(Template[parameters['template']])
+    sp_generator.update_seed_points(seed_budget=parameters['seed_budget'])
+    return sp_generator.seed_critical_pair
+
+
+def trace_seed_points(parameters: Dict[str, Any], vft: VectorFieldTopology, seed_critical_pair: SeedCriticalPair, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Returns the 'seedpoint_info', 'fieldlines', 'number_of_invalid_seed_points', 'retrace_fraction' and 'number_of_mismatched_seed_points' of the traced seed points
+    :previous: 'seed' and 'trace' outputs of the previous timestep (optional), only the seed points that may have changed are traced
+    """
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_seed_critical_pair(seed_critical_pair)
+    sp_processor.set_vector_field_domain(vft.vectorfield)
+    if(previous is not None):
+        sp_processor.update_seed_point_info_incremental(previous['seed'], previous['trace']['seedpoint_info'], verify=parameters['verify'])
+    else:
+        sp_processor.update_seed_point_info()
+
+    return {
+        'seedpoint_info': sp_processor.seedpoint_info,
+        'fieldlines': sp_processor.fieldlines,
+        'number_of_invalid_seed_points': sp_processor.number_of_invalid_seed_points,
+        'retrace_fraction': sp_processor.retrace_fraction,
+        'number_of_mismatched_seed_points': sp_processor.number_of_mismatched_seed_points,
+    }
@@ -4,3 +4,16 @@ PHI_RESOLUTION = 3
 RADIUS = 0.5
 
 # Disc Template
+INNER_RADIUS = 0.01
+OUTER_RADIUS = 0.5
+RADIAL_RESOLUTION = 2
+CIRCUMFERENTIAL_RESOLUTION = 12
+
+# Seed budget, used in update_seed_points(seed_budget=...)
+CLUSTER_RADIUS = 2.0
+
+# Rows read at a time in load_custom_points()
+CUSTOM_POINTS_CHUNKSIZE = 100000
+
+# Approximate number of seedpoints per chunk in iter_seed_chunks()
+SEED_CHUNK_SIZE = 10000
@@ -1,16 +1,20 @@
+from typing import TYPE_CHECKING
+
 from vtkmodules.vtkCommonColor import vtkNamedColors
-from vtkmodules.vtkCommonDataModel import vtkPolyData
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData
+from vtkmodules.vtkCommonTransforms import vtkTransform
 from vtkmodules.vtkFiltersCore import vtkGlyph3D
-from vtkmodules.vtkFiltersSources import vtkSphereSource
-from vtkmodules.vtkRenderingCore import (
-    vtkActor,
-    vtkPolyDataMapper,
-) 
-
-from vtk import vtkSimplePointsWriter, vtkPoints, vtkTransform, vtkDiskSource, vtkTransformPolyDataFilter, vtkArrowSource
+from vtkmodules.vtkFiltersGeneral import vtkTransformPolyDataFilter
+from vtkmodules.vtkFiltersSources import vtkArrowSource, vtkDiskSource, vtkSphereSource
+from vtkmodules.vtkIOLegacy import vtkSimplePointsWriter
 import numpy as np
-from seedpoint_generator import constants
+from seedpoint_generator import constants, template_engine
 from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from vtk_visualization.helpers import load_rendering_modules
+
+if TYPE_CHECKING:
+    from vtkmodules.vtkRenderingCore import vtkActor
 
 def write_seed_points_to_file(outfile, glyph):
     """Writes the glyph data into a file
@@ -27,11 +31,13 @@ def write_seed_points_to_file(outfile, glyph):
 
     print(f"Generated {glyph.GetOutput().GetPointData().GetNumberOfTuples()} seed points in file: '{outfile}'")
 
-def get_sphere_around_points_actor(critical_points) -> vtkActor:
+def get_sphere_around_points_actor(critical_points) -> 'vtkActor':
     """Returns the actor of the sphere surrounding a point. Returns glyph data if wanted.
         :points: Points where the normal vector lies (vtkPoint())
         :plane_vectors: List of eigen vectors building up the plane ([[v1,w1],..,[vn,wn]])
     """
+    rendering = load_rendering_modules()
+
     colors = vtkNamedColors()
 
     points = vtkPoints()
@@ -52,10 +58,10 @@ def get_sphere_around_points_actor(critical_points) -> vtkActor:
     glyph3D.Update()
 
     # Visualize seed points
-    mapper = vtkPolyDataMapper()
+    mapper = rendering.vtkPolyDataMapper()
     mapper.SetInputConnection(glyph3D.GetOutputPort())
 
-    actor = vtkActor()
+    actor = rendering.vtkActor()
     actor.SetMapper(mapper)
     actor.GetProperty().SetColor(colors.GetColor3d('Salmon'))
     actor.GetProperty().SetOpacity(0.5)
@@ -64,14 +70,16 @@ def get_sphere_around_points_actor(critical_points) -> vtkActor:
     return actor
 
 def get_disc_actor(normal, point):
+    rendering = load_rendering_modules()
+
     colors = vtkNamedColors()
 
     # Default is (0,0,1)
     diskSource = vtkDiskSource()
-    diskSource.SetInnerRadius(0.01)
-    diskSource.SetOuterRadius(0.5)
-    diskSource.SetRadialResolution(2)
-    diskSource.SetCircumferentialResolution(12)
+    diskSource.SetInnerRadius(constants.INNER_RADIUS)
+    diskSource.SetOuterRadius(constants.OUTER_RADIUS)
+    diskSource.SetRadialResolution(constants.RADIAL_RESOLUTION)
+    diskSource.SetCircumferentialResolution(constants.CIRCUMFERENTIAL_RESOLUTION)
 
     matrix = rotation_matrix_from_vectors([0,0,1], normal)
 
@@ -90,21 +98,77 @@ def get_disc_actor(normal, point):
     transformFilter.Update()
 
     # Create a mapper and actor.
-    mapper = vtkPolyDataMapper()
+    mapper = rendering.vtkPolyDataMapper()
     mapper.SetInputConnection(transformFilter.GetOutputPort())
 
-    actor = vtkActor()
+    actor = rendering.vtkActor()
     actor.GetProperty().SetColor(colors.GetColor3d("Black"))
     actor.GetProperty().SetOpacity(0.5)
     actor.SetMapper(mapper)
 
     return actor, transformFilter.GetOutput()
 
+def get_discs_actor(normals, points, owners=None) -> 'vtkActor':
+    """Returns one actor with a disc around every point, in the plane with the given normal
+        :normals: (N,3) array of disc normals
+        :points: (N,3) array of disc centers
+        :owners: (N,) array with the critical point of every disc, stored as 'CriticalPointId' cell data (optional)
+    """
+    rendering = load_rendering_modules()
+
+    colors = vtkNamedColors()
+
+    diskSource = vtkDiskSource()
+    diskSource.SetInnerRadius(constants.INNER_RADIUS)
+    diskSource.SetOuterRadius(constants.OUTER_RADIUS)
+    diskSource.SetRadialResolution(constants.RADIAL_RESOLUTION)
+    diskSource.SetCircumferentialResolution(constants.CIRCUMFERENTIAL_RESOLUTION)
+    diskSource.Update()
+
+    # Place the disc geometry around every point at once and repeat the cells with shifted point ids
+    disc = diskSource.GetOutput()
+    disc_points = vtk_to_numpy(disc.GetPoints().GetData()).astype(float)
+    disc_offsets = vtk_to_numpy(disc.GetPolys().GetOffsetsArray())
+    disc_connectivity = vtk_to_numpy(disc.GetPolys().GetConnectivityArray())
+
+    normals = np.asarray(normals).real.astype(float).reshape(-1, 3)
+    rotations = template_engine.rotation_matrices_from_vectors([0, 0, 1], normals)
+    all_points, _ = template_engine.place_template(points, disc_points, rotations)
+
+    number_of_discs = len(normals)
+    offsets = np.concatenate([[0], (disc_offsets[1:] + disc_offsets[-1]*np.arange(number_of_discs)[:, None]).ravel()])
+    connectivity = (disc_connectivity + len(disc_points)*np.arange(number_of_discs)[:, None]).ravel()
+
+    vtk_points = vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(all_points, deep=True))
+    polys = vtkCellArray()
+    polys.SetData(numpy_to_vtk(offsets.astype(np.int64), deep=True), numpy_to_vtk(connectivity.astype(np.int64), deep=True))
+    owners = np.arange(number_of_discs) if owners is None else np.asarray(owners)
+    disc_ids = numpy_to_vtk(np.repeat(owners, disc.GetNumberOfCells()).astype(np.int64), deep=True)
+    disc_ids.SetName('CriticalPointId')
+
+    polydata = vtkPolyData()
+    polydata.SetPoints(vtk_points)
+    polydata.SetPolys(polys)
+    polydata.GetCellData().AddArray(disc_ids)
+
+    mapper = rendering.vtkPolyDataMapper()
+    mapper.SetInputData(polydata)
+    mapper.ScalarVisibilityOff()
+
+    actor = rendering.vtkActor()
+    actor.GetProperty().SetColor(colors.GetColor3d("Black"))
+    actor.GetProperty().SetOpacity(0.5)
+    actor.SetMapper(mapper)
+
+    return actor
+
 def get_plane_normal_actor(points, planes):
     """Returns the actor of the normal of the given planes
         :points: Points where the normal vector lies (vtkPoint())
         :planes: List of plane objects [{"point": [x1,y1,z1], "normal": [x2,y2,z2]}]
     """
+    rendering = load_rendering_modules()
 
     colors = vtkNamedColors()
 
@@ -128,10 +192,10 @@ def get_plane_normal_actor(points, planes):
     normalGlyph.Update()
 
     # Create a mapper and actor
-    normalMapper = vtkPolyDataMapper()
+    normalMapper = rendering.vtkPolyDataMapper()
     normalMapper.SetInputData(normalGlyph.GetOutput())
 
-    normalActor = vtkActor()
+    normalActor = rendering.vtkActor()
     normalActor.SetMapper(normalMapper)
     normalActor.GetProperty().SetColor(colors.GetColor3d('Yellow'))
     normalActor.GetProperty().SetOpacity(1)
@@ -140,6 +204,7 @@ def get_plane_normal_actor(points, planes):
     return normalActor
 
 def get_points_actor(points):
+    rendering = load_rendering_modules()
 
     colors = vtkNamedColors()
 
@@ -156,10 +221,10 @@ def get_points_actor(points):
     glyph3D.SetInputData(polydata)
     glyph3D.Update()
 
-    mapper = vtkPolyDataMapper()
+    mapper = rendering.vtkPolyDataMapper()
     mapper.SetInputConnection(glyph3D.GetOutputPort())
 
-    actor = vtkActor()
+    actor = rendering.vtkActor()
     actor.GetProperty().SetColor(colors.GetColor3d("Black"))
     actor.GetProperty().SetOpacity(1)
     actor.SetMapper(mapper)
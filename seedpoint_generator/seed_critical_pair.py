@@ -0,0 +1,101 @@
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData
+from vtkmodules.util.numpy_support import numpy_to_vtk
+
+
+class SeedCriticalPair():
+    """
+    Compressed (CSR) mapping between seed points and the critical points they were generated around.
+    The seed points of critical point i are seed_points[offsets[i]:offsets[i+1]].
+    Seed point j can share its classification with seed point representatives[j], only representatives have to be traced.
+    """
+
+    def __init__(self, seed_points, owners, critical_points):
+        """
+        :seed_points: (N,3) array of seed points
+        :owners: (N,) array with the index in critical_points that every seed point belongs to
+        :critical_points: (K,3) table of critical points
+        """
+        self.seed_points = np.asarray(seed_points, dtype=float).reshape(-1, 3)
+        self.owners = np.asarray(owners, dtype=np.int64).reshape(-1)
+        self.critical_points = np.asarray(critical_points, dtype=float).reshape(-1, 3)
+
+        if(len(self.seed_points) != len(self.owners)):
+            raise ValueError(f"Got {len(self.seed_points)} seed points but {len(self.owners)} owners.")
+
+        # Seeds have to be grouped by owner for the offsets to be valid. Templates already produce them in order.
+        if(np.any(np.diff(self.owners) < 0)):
+            order = np.argsort(self.owners, kind='stable')
+            self.seed_points = self.seed_points[order]
+            self.owners = self.owners[order]
+
+        self.offsets = np.searchsorted(self.owners, np.arange(len(self.critical_points)+1))
+        self.representatives = np.arange(len(self.seed_points))
+
+    def __len__(self) -> int:
+        return len(self.critical_points)
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Iterates over (critical point, seed points) pairs. The seed points are views, not copies."""
+        for i in range(len(self.critical_points)):
+            yield self.critical_points[i], self.seed_points[self.offsets[i]:self.offsets[i+1]]
+
+    def get_seed_points(self, index: int) -> np.ndarray:
+        """Returns a view of the seed points belonging to critical point number index"""
+        return self.seed_points[self.offsets[index]:self.offsets[index+1]]
+
+    def get_number_of_seed_points(self) -> np.ndarray:
+        """Returns the number of seed points of every critical point"""
+        return np.diff(self.offsets)
+
+    def to_polydata(self) -> vtkPolyData:
+        """Returns the seed points as vtkPolyData vertices with 'CriticalPointId' and 'RepresentativeId' point arrays"""
+        points = vtkPoints()
+        points.SetData(numpy_to_vtk(np.ascontiguousarray(self.seed_points), deep=True))
+
+        vertices = vtkCellArray()
+        vertices.SetData(numpy_to_vtk(np.arange(len(self.seed_points)+1, dtype=np.int64), deep=True), numpy_to_vtk(np.arange(len(self.seed_points), dtype=np.int64), deep=True))
+
+        poly = vtkPolyData()
+        poly.SetPoints(points)
+        poly.SetVerts(vertices)
+        for name, values in [('CriticalPointId', self.owners), ('RepresentativeId', self.representatives)]:
+            array = numpy_to_vtk(np.asarray(values, dtype=np.int64), deep=True)
+            array.SetName(name)
+            poly.GetPointData().AddArray(array)
+
+        return poly
+
+    def get_traced_seed_indices(self) -> np.ndarray:
+        """Returns the indices of the seed points that have to be traced"""
+        return np.flatnonzero(self.representatives == np.arange(len(self.seed_points)))
+
+    @classmethod
+    def from_pairs(cls, pairs: Sequence[Tuple[Sequence[float], Sequence[Tuple[float, float, float]]]]) -> 'SeedCriticalPair':
+        """Creates the mapping from a list of (critical point, seed points) tuples"""
+        if(isinstance(pairs, cls)):
+            return pairs
+
+        critical_points = [critical_point for critical_point, _ in pairs]
+        seed_points = [np.asarray(seeds, dtype=float).reshape(-1, 3) for _, seeds in pairs]
+        owners = np.repeat(np.arange(len(seed_points)), [len(seeds) for seeds in seed_points])
+
+        return cls(np.concatenate(seed_points) if len(seed_points) > 0 else np.empty((0, 3)), owners, critical_points)
+
+    @classmethod
+    def concatenate(cls, list_of_pairs: List['SeedCriticalPair']) -> 'SeedCriticalPair':
+        """Concatenates several mappings into one. The critical point tables are stacked in the given order."""
+        owner_offsets = np.cumsum([0] + [len(pair) for pair in list_of_pairs])
+
+        seed_points = np.concatenate([pair.seed_points for pair in list_of_pairs])
+        owners = np.concatenate([pair.owners + offset for pair, offset in zip(list_of_pairs, owner_offsets)])
+        critical_points = np.concatenate([pair.critical_points for pair in list_of_pairs])
+
+        seed_offsets = np.cumsum([0] + [len(pair.seed_points) for pair in list_of_pairs])
+        result = cls(seed_points, owners, critical_points)
+        result.representatives = np.concatenate([pair.representatives + offset for pair, offset in zip(list_of_pairs, seed_offsets)])
+
+        return result
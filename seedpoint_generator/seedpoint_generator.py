@@ -1,17 +1,24 @@
 from enum import Enum
 import logging
 import os
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
 import warnings
 import numpy as np
 import pandas as pd
-from vtk import vtkPoints, vtkPolyData, vtkSphereSource, vtkGlyph3D
-from seedpoint_generator import constants, helpers
-from vtkmodules.util.numpy_support import vtk_to_numpy
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkFiltersCore import vtkGlyph3D
+from seedpoint_generator import constants, helpers, template_engine
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+from vtkmodules.util.numpy_support import numpy_to_vtk
 from vectorfieldtopology.vectorfieldtopology import CriticalPointInfo
+from vectorfieldtopology import sampling
+from vectorfieldtopology.helpers import load_critical_points_info
 from vtk_visualization import helpers as vtk_helper
 from seedpoint_processor import constants as p_constant
 
+if TYPE_CHECKING:
+    from vtkmodules.vtkRenderingCore import vtkActor
+
 class Template(Enum):
     SPHERICAL = 1
     EIGEN_PLANE = 2
@@ -19,6 +26,11 @@ class Template(Enum):
     SMART = 4
     USER_CHOICE = 5
 
+class BudgetWeight(Enum):
+    EIGENVALUE = 1
+    CLUSTER_SIZE = 2
+    EARTH_DISTANCE = 3
+
 class SeedpointGenerator():
 
     def __init__(self):
@@ -32,7 +44,7 @@ class SeedpointGenerator():
         self.gradient = []
         self.seed_points:List[float] = []
         self.template = None
-        self.seed_critical_pair = []
+        self.seed_critical_pair = SeedCriticalPair(np.empty((0, 3)), [], [])
         self.list_of_actors = []
 
     def set_template(self, template: Template):
@@ -50,10 +62,9 @@ class SeedpointGenerator():
             raise FileNotFoundError("File not found..")
         
     def load_critical_point_info(self, critical_point_info_filename:str) -> None:
-        """Loads a csv file containing the critical_point_info"""
+        """Loads a csv or npz file containing the critical_point_info"""
         if(os.path.exists(critical_point_info_filename)):
-            df = pd.read_csv(critical_point_info_filename)
-            critical_point_info = df.to_dict('records')
+            critical_point_info = load_critical_points_info(critical_point_info_filename)
 
             self.critical_points = [[x['X'], x['Y'], x['Z']] for x in critical_point_info]
             self.gradient = [x['Gradient'] for x in critical_point_info]
@@ -67,95 +78,254 @@ class SeedpointGenerator():
         self.critical_points = [[x['X'], x['Y'], x['Z']] for x in critical_point_info]
         self.gradient = [x['Gradient'] for x in critical_point_info]
 
-    def set_custom_points(self, custom_points: List[Tuple[float,float,float]]) -> None:
-        """Uses to our own custom points we want to seed around. Works for custom template and spherical template
+    def set_custom_points(self, custom_points: List[Tuple[float,float,float]], gradient:Optional[List[float]] = None) -> None:
+        """Uses to our own custom points we want to seed around. Works for custom template and spherical template, and for the eigen plane templates if a gradient is given.
         :custom_points: A list of points with x,y,z coordinates.
+        :gradient: The 9 component gradient at every point (optional), e.g. from VectorFieldTopology.get_gradient_at_points()
         """
         self.critical_points = custom_points
+        self.gradient = []
 
-    def load_custom_points(self, custom_point_filename:str, every_nth:int=1):
-        """Loads a csv file containing the custom points with 'X','Y','Z' columns or Points:0,Points:1,Points:2(ParaView standard)."""
+        if(gradient is not None):
+            self.set_gradient(gradient)
+
+    def set_gradient(self, gradient: List[float]) -> None:
+        """Sets the 9 component gradient of every critical point or custom point, needed by Template.TRIPPLE_EIGEN_PLANE and Template.SMART
+        :gradient: List or (N,9) array, e.g. from VectorFieldTopology.get_gradient_at_points()
+        """
+        gradient = np.asarray(gradient, dtype=float).reshape(-1, 9)
+        if(len(gradient) != len(self.critical_points)):
+            raise ValueError(f"Got {len(gradient)} gradients for {len(self.critical_points)} points")
+
+        self.gradient = list(gradient)
+
+    def load_custom_points(self, custom_point_filename:str, every_nth:int=1, voxel_size:Optional[float]=None, chunksize:int=constants.CUSTOM_POINTS_CHUNKSIZE):
+        """Loads a csv file containing the custom points with 'X','Y','Z' columns or Points:0,Points:1,Points:2(ParaView standard).
+        Only the coordinate columns are read, in chunks, so large contour files don't have to fit in memory.
+        :every_nth: Keeps every nth row
+        :voxel_size: Keeps one point per voxel of this size (optional). Gives even coverage, unlike every_nth which keeps dense regions dense.
+        :chunksize: Number of rows read at a time
+        """
         
         if(os.path.exists(custom_point_filename)):
-            df = pd.read_csv(custom_point_filename)
-            if(every_nth != 1):
-                df = df.iloc[::every_nth, :]
-
-            if('Points:0' and 'Points:1' and 'Points:2' in df.columns):
-                df['X'] = df['Points:0']
-                df['Y'] = df['Points:1']
-                df['Z'] = df['Points:2']
-                logging.info(f"Converted Points:0,Points:1,Points:2 to X,Y,Z")
+            columns = pd.read_csv(custom_point_filename, nrows=0).columns
 
-            custom_points_dict = df.to_dict('records')
-            self.critical_points = [[x['X'], x['Y'], x['Z']] for x in custom_points_dict]
+            if(all(c in columns for c in ['Points:0', 'Points:1', 'Points:2'])):
+                xyz_columns = ['Points:0', 'Points:1', 'Points:2']
+                logging.info(f"Converted Points:0,Points:1,Points:2 to X,Y,Z")
+            else:
+                xyz_columns = ['X', 'Y', 'Z']
+
+            def chunks():
+                first_row = 0
+                for df in pd.read_csv(custom_point_filename, usecols=xyz_columns, chunksize=chunksize):
+                    points = df[xyz_columns].to_numpy(dtype=float)
+                    yield points[(-first_row) % every_nth::every_nth]
+                    first_row += len(df)
+
+            self.critical_points = sampling.get_voxel_subsampled_points_from_chunks(chunks(), voxel_size)
+            self.gradient = []
+            logging.info(f"Loaded {len(self.critical_points)} custom points.")
         else:
             raise FileNotFoundError("File not found..")
 
 
-    def update_seed_points(self, is_custom_points = False) -> None:
-        """ Generates seedpoints based on critical points"""
+    def update_seed_points(self, is_custom_points = False, seed_budget:Optional[int] = None, budget_weight:BudgetWeight = BudgetWeight.EIGENVALUE) -> None:
+        """ Generates seedpoints based on critical points
+        :seed_budget: Total number of seedpoints (optional). The budget is split across the critical points according to budget_weight, and each template is generated at the largest resolution that fits in its share.
+        The shares are upper bounds, not exact counts: a template only uses the part of its share that fits a whole resolution, so fewer than seed_budget seedpoints can be generated. thin_seed_points() lowers the number of traced seedpoints further.
+        :budget_weight: How the seed budget is split. BudgetWeight.EIGENVALUE, BudgetWeight.CLUSTER_SIZE or BudgetWeight.EARTH_DISTANCE
+        """
+        if(self.template == Template.EIGEN_PLANE):
+            print("Doing fun eigenplane stuff")
+            return
+        elif(self.template not in [Template.SPHERICAL, Template.TRIPPLE_EIGEN_PLANE, Template.USER_CHOICE, Template.SMART]):
+            raise ValueError("No template has been selected. To update template, use set_template() function")
+        elif(seed_budget is not None and self.template == Template.USER_CHOICE):
+            raise ValueError("A seed budget can't be used with Template.USER_CHOICE since the template has a fixed size")
+        self.__check_gradient()
+
+        number_of_seeds = None
+        if(seed_budget is not None):
+            number_of_seeds = template_engine.get_seed_budget_allocation(self.__get_budget_weights(budget_weight), seed_budget)
+
+        self.seed_critical_pair = self.__get_seed_critical_pair(self.critical_points, self.gradient, number_of_seeds)
+        self.seed_points = self.seed_critical_pair.seed_points
+        # Actors are built on demand with update_list_of_actors()
+        self.list_of_actors = []
+
+        if(number_of_seeds is not None):
+            skipped = np.count_nonzero(self.seed_critical_pair.get_number_of_seed_points() == 0)
+            logging.info(f"Generated {len(self.seed_points)} seedpoints with a budget of {seed_budget}. {skipped} critical points were too small for a template.")
+
+
+    def iter_seed_chunks(self, chunk_size:int = constants.SEED_CHUNK_SIZE) -> Iterator[SeedCriticalPair]:
+        """
+        Generates the seedpoints in chunks instead of all at once. Nothing is stored in the class and no actors are created.
+        Every chunk is a SeedCriticalPair for a block of critical points, with owner ids into the critical points of that chunk.
+        Feed the chunks to SeedpointProcessor.update_seed_point_info_from_chunks().
+        :chunk_size: Approximate number of seedpoints in every chunk
+        """
+        if(self.template not in [Template.SPHERICAL, Template.TRIPPLE_EIGEN_PLANE, Template.USER_CHOICE, Template.SMART]):
+            raise ValueError("No template has been selected. To update template, use set_template() function")
+        self.__check_gradient()
+
+        critical_points_per_chunk = max(1, chunk_size // self.__get_template_size())
+
+        for start in range(0, len(self.critical_points), critical_points_per_chunk):
+            end = start + critical_points_per_chunk
+            yield self.__get_seed_critical_pair(self.critical_points[start:end], self.gradient[start:end])
+
+    def __check_gradient(self) -> None:
+        """Raises a ValueError if the template needs a gradient that is missing"""
+        if(self.template in [Template.TRIPPLE_EIGEN_PLANE, Template.SMART] and len(self.gradient) != len(self.critical_points)):
+            raise ValueError("The template needs the gradient of every point. For custom points, use set_gradient() with VectorFieldTopology.get_gradient_at_points()")
+
+    def __get_template_size(self) -> int:
+        """Returns the largest number of seedpoints the template generates around one critical point"""
+        sphere_size = len(template_engine.get_unit_sphere_template(constants.THETA_RESOLUTION, constants.PHI_RESOLUTION, constants.RADIUS))
+        discs_size = 3*len(template_engine.get_unit_disc_template(constants.INNER_RADIUS, constants.OUTER_RADIUS, constants.RADIAL_RESOLUTION, constants.CIRCUMFERENTIAL_RESOLUTION))
+
+        if(self.template == Template.SPHERICAL):
+            return sphere_size
+        elif(self.template == Template.TRIPPLE_EIGEN_PLANE):
+            return discs_size
+        elif(self.template == Template.USER_CHOICE):
+            return max(1, len(template_engine.get_custom_template(self.template_filename)))
+        else:
+            return max(sphere_size, discs_size)
+
+    def __get_seed_critical_pair(self, critical_points:List[Tuple[float,float,float]], gradient:List[float], number_of_seeds:Optional[np.ndarray] = None) -> SeedCriticalPair:
+        """Generates the seedpoints around the given critical points with the current template"""
 
         if(self.template == Template.SPHERICAL):
             # Generate seedpoint by sampling a sphere around the critical point
-            glyphs = self.__get_spherical_glyph()
-            self.seed_points = vtk_to_numpy(glyphs.GetOutput().GetPoints().GetData())
-            self.seed_critical_pair = self.__get_seed_point_critical_point_pair(self.critical_points, self.seed_points)
-            actor = helpers.get_sphere_around_points_actor(self.critical_points)
-            self.list_of_actors = [actor]
-        elif(self.template == Template.EIGEN_PLANE):
-            print("Doing fun eigenplane stuff")
-            pass
+            if(number_of_seeds is None):
+                seed_points, owners = template_engine.get_spherical_seed_points(critical_points)
+            else:
+                seed_points, owners = template_engine.get_budgeted_spherical_seed_points(critical_points, number_of_seeds)
+            return self.__get_seed_point_critical_point_pair(critical_points, seed_points, owners)
+
         elif(self.template == Template.TRIPPLE_EIGEN_PLANE):
             # Generate seedpoint by sampling the planes created by the eigen vector of the critical point as the normal of the planes.
-            poly, self.list_of_actors = self.__get_tripple_plane(show_normal=False)
-            self.seed_points = vtk_to_numpy(poly.GetPoints().GetData())
-            self.seed_critical_pair = self.__get_seed_point_critical_point_pair(self.critical_points, self.seed_points)
+            if(number_of_seeds is None):
+                seed_points, owners = template_engine.get_tripple_eigen_plane_seed_points(critical_points, gradient)
+            else:
+                seed_points, owners = template_engine.get_budgeted_tripple_eigen_plane_seed_points(critical_points, gradient, number_of_seeds)
+            return self.__get_seed_point_critical_point_pair(critical_points, seed_points, owners)
 
         elif(self.template == Template.USER_CHOICE):
             # Generate seedpoint by sampling the template given by the user.
-            poly = self.__get_custom_seedpoints_from_file_template()
-            self.seed_points = vtk_to_numpy(poly.GetPoints().GetData())
-            self.seed_critical_pair = self.__get_seed_point_critical_point_pair(self.critical_points, self.seed_points)
-            actor = helpers.get_points_actor(poly.GetPoints())
-            self.list_of_actors = [actor]
+            seed_points, owners = template_engine.get_custom_template_seed_points(critical_points, self.template_filename)
+            return self.__get_seed_point_critical_point_pair(critical_points, seed_points, owners)
 
         elif(self.template == Template.SMART):
-            self.seed_points.clear()
-            self.list_of_actors.clear()
-
             # Get dayside and nightside.
-            critical_points_dayside_position = np.array([ cp for cp in self.critical_points if cp[0] >= p_constant.DAYSIDE_NIGHTSIDE_THRESHOLD ])
-            critical_points_nightside_info = [ (cp,ind) for ind, cp in enumerate(self.critical_points) if cp[0] < p_constant.DAYSIDE_NIGHTSIDE_THRESHOLD ]
-            critical_point_nighside_position = np.array([i[0] for i in critical_points_nightside_info])
-            critical_point_nightside_gradient = np.array([self.gradient[i[1]] for i in critical_points_nightside_info])
+            dayside_indices, nightside_indices = self.__get_dayside_nightside_indices(critical_points)
+            critical_points_dayside_position = np.asarray(critical_points, dtype=float).reshape(-1, 3)[dayside_indices]
+            critical_point_nighside_position = np.asarray(critical_points, dtype=float).reshape(-1, 3)[nightside_indices]
+            critical_point_nightside_gradient = np.array([gradient[i] for i in nightside_indices])
+
+            # Sample spheres on the dayside and eigen planes on the nightside
+            if(number_of_seeds is None):
+                seed_dayside, owners_dayside = template_engine.get_spherical_seed_points(critical_points_dayside_position)
+                seed_nightside, owners_nightside = template_engine.get_tripple_eigen_plane_seed_points(critical_point_nighside_position, critical_point_nightside_gradient)
+            else:
+                seed_dayside, owners_dayside = template_engine.get_budgeted_spherical_seed_points(critical_points_dayside_position, number_of_seeds[dayside_indices])
+                seed_nightside, owners_nightside = template_engine.get_budgeted_tripple_eigen_plane_seed_points(critical_point_nighside_position, critical_point_nightside_gradient, number_of_seeds[nightside_indices])
 
-            # Get planes and glyphs where the seedpoint lies
-            glyphs = self.__get_spherical_glyph_from_critical_points(critical_points_dayside_position)
-            poly, actors = self.__get_tripple_plane_from_critical_points(critical_point_nightside_gradient, critical_point_nighside_position)
+            # Generate pair information to know which seed points corresponds to which critical point
+            seed_critical_pair_dayside = self.__get_seed_point_critical_point_pair(critical_points_dayside_position, seed_dayside, owners_dayside)
+            seed_critical_pair_nightside = self.__get_seed_point_critical_point_pair(critical_point_nighside_position, seed_nightside, owners_nightside)
 
-            seed_dayside = vtk_to_numpy(glyphs.GetOutput().GetPoints().GetData())
-            seed_nightside = vtk_to_numpy(poly.GetPoints().GetData())
+            return SeedCriticalPair.concatenate([seed_critical_pair_dayside, seed_critical_pair_nightside])
 
-            # Generate pair information to know which seed points corresponds to which critical point
-            seed_critical_pair_dayside = self.__get_seed_point_critical_point_pair(critical_points_dayside_position, seed_dayside)
-            seed_critical_pair_nightside = self.__get_seed_point_critical_point_pair(critical_point_nighside_position, seed_nightside)
-
-            # Update seedpoints and seedpoint pairs
-            self.seed_critical_pair = np.concatenate([np.array(seed_critical_pair_dayside, dtype=object), np.array(seed_critical_pair_nightside, dtype=object)])
-            self.seed_points = np.concatenate([seed_dayside, seed_nightside])
-
-            # Update list of actors
-            dayside_actor = helpers.get_sphere_around_points_actor(critical_points_dayside_position)
-            self.list_of_actors.append(dayside_actor)
-            for nightside_actor in actors:
-                self.list_of_actors.append(nightside_actor)
         else:
             raise ValueError("No template has been selected. To update template, use set_template() function")
 
+    def update_list_of_actors(self) -> None:
+        """Builds the actors illustrating the current template around the critical points. Does nothing in headless mode."""
+        self.list_of_actors = []
+        if(vtk_helper.is_headless() or self.seed_critical_pair is None):
+            return
+
+        self.list_of_actors = self.__get_list_of_actors()
+
+    def __get_list_of_actors(self) -> List['vtkActor']:
+        """Returns the actors illustrating the current template around the critical points"""
+
+        if(self.template == Template.SPHERICAL):
+            return [helpers.get_sphere_around_points_actor(self.critical_points)]
+
+        elif(self.template == Template.TRIPPLE_EIGEN_PLANE):
+            return self.__get_tripple_plane_actors(self.gradient, self.critical_points, show_normal=False)
+
+        elif(self.template == Template.USER_CHOICE):
+            points = vtkPoints()
+            points.SetData(numpy_to_vtk(self.seed_points, deep=True))
+            return [helpers.get_points_actor(points)]
+
+        elif(self.template == Template.SMART):
+            dayside_indices, nightside_indices = self.__get_dayside_nightside_indices(self.critical_points)
+            critical_points = np.asarray(self.critical_points, dtype=float).reshape(-1, 3)
+            critical_point_nightside_gradient = np.array([self.gradient[i] for i in nightside_indices])
+
+            dayside_actor = helpers.get_sphere_around_points_actor(critical_points[dayside_indices])
+            return [dayside_actor] + self.__get_tripple_plane_actors(critical_point_nightside_gradient, critical_points[nightside_indices])
+
+        return []
+
+    def __get_dayside_nightside_indices(self, critical_points:List[Tuple[float,float,float]]) -> Tuple[List[int], List[int]]:
+        dayside_indices = [ind for ind, cp in enumerate(critical_points) if cp[0] >= p_constant.DAYSIDE_NIGHTSIDE_THRESHOLD]
+        nightside_indices = [ind for ind, cp in enumerate(critical_points) if cp[0] < p_constant.DAYSIDE_NIGHTSIDE_THRESHOLD]
+        return dayside_indices, nightside_indices
+
+    def __get_budget_weights(self, budget_weight: BudgetWeight) -> np.ndarray:
+        """Returns the weight of every critical point used to split the seed budget"""
+        critical_points = np.asarray(self.critical_points, dtype=float).reshape(-1, 3)
+
+        if(budget_weight == BudgetWeight.EIGENVALUE):
+            if(len(self.gradient) != len(critical_points)):
+                raise ValueError("BudgetWeight.EIGENVALUE requires the gradient of every critical point")
+            eigenvalues = np.linalg.eigvals(np.asarray(self.gradient, dtype=float).reshape(-1, 3, 3))
+            return np.max(np.abs(eigenvalues.real), axis=1)
+
+        elif(budget_weight == BudgetWeight.CLUSTER_SIZE):
+            # Number of critical points within CLUSTER_RADIUS, computed in blocks to bound the memory.
+            cluster_size = np.zeros(len(critical_points))
+            for start in range(0, len(critical_points), 1024):
+                block = critical_points[start:start+1024]
+                distances = np.linalg.norm(block[:, None, :]-critical_points[None, :, :], axis=2)
+                cluster_size[start:start+1024] = np.count_nonzero(distances <= constants.CLUSTER_RADIUS, axis=1)
+            return cluster_size
+
+        elif(budget_weight == BudgetWeight.EARTH_DISTANCE):
+            # Critical points closer to Earth get more seeds
+            return 1/np.maximum(np.linalg.norm(critical_points, axis=1), 1e-6)
+
+        else:
+            raise ValueError(f"Unknown budget weight {budget_weight}")
+
+    def thin_seed_points(self, min_spacing:float) -> None:
+        """
+        Marks near-duplicate seedpoints, e.g. from overlapping templates, so that the SeedpointProcessor only traces one of them.
+        All seedpoints are kept, removed ones share the FieldlineStatus of the seedpoint that represents them.
+        :min_spacing: Seedpoints closer than this to a kept seedpoint are not traced. Kept seedpoints are at least min_spacing apart.
+        """
+        representatives = sampling.get_minimum_spacing_representatives(self.seed_critical_pair.seed_points, min_spacing)
+        self.seed_critical_pair.representatives = representatives
+
+        number_of_traces = len(self.seed_critical_pair.get_traced_seed_indices())
+        logging.info(f"Thinned seedpoints to {number_of_traces} of {len(representatives)}, avoiding {len(representatives)-number_of_traces} traces.")
 
     def visualize(self) -> None:
         """Starts the rendering"""
+        if(vtk_helper.is_headless()):
+            return
+
+        if(len(self.list_of_actors) == 0):
+            self.update_list_of_actors()
+
         if(len(self.list_of_actors) == 0):
             warnings.warn("List of actors is empty. Make sure to update the list of actors with the function update_list_of_actors()")
 
@@ -175,108 +345,28 @@ class SeedpointGenerator():
 
         np.savetxt(f"{dirName}/{filename}", self.seed_points, fmt='%1.5f')
 
-    def __get_seed_point_critical_point_pair(self, critical_points:List[Tuple[float, float, float]], seedpoints: List[Tuple[float, float, float]]):
+    def __get_seed_point_critical_point_pair(self, critical_points:List[Tuple[float, float, float]], seedpoints: np.ndarray, owners: np.ndarray) -> SeedCriticalPair:
         
-        if(len(critical_points) > 0):
-            #print(seedpoints)
-            seed_point_chunks = np.array_split(np.array(seedpoints), len(critical_points))
-
-            return list(zip(critical_points, seed_point_chunks))
-        else:
+        if(len(critical_points) == 0):
             warnings.warn("Zero critical points.. ")
-            return []
 
-    def __get_spherical_glyph_from_critical_points(self, critical_points: List[Tuple[float, float, float]]) -> vtkGlyph3D:
-        points = vtkPoints()
-        for x,y,z in critical_points:
-            points.InsertNextPoint(x, y, z)
-        
-        polydata = vtkPolyData()
-        polydata.SetPoints(points)
+        return SeedCriticalPair(seedpoints, owners, critical_points)
 
-        sphereSource = vtkSphereSource()
-        sphereSource.SetThetaResolution(constants.THETA_RESOLUTION)
-        sphereSource.SetPhiResolution(constants.PHI_RESOLUTION)
-        sphereSource.SetRadius(constants.RADIUS)
+    def __get_tripple_plane_actors(self, gradients:List[float], critical_points:List[Tuple[float,float,float]], show_normal=False) -> List['vtkActor']:
+        """Returns one actor with the discs of every eigen vector of every critical point"""
+        normals = template_engine.get_eigen_plane_normals(gradients)
+        disc_centers = np.repeat(np.asarray(critical_points, dtype=float).reshape(-1, 3), 3, axis=0)
+        owners = np.repeat(np.arange(len(disc_centers)//3), 3)
 
-        glyph3D = vtkGlyph3D()
-        glyph3D.SetSourceConnection(sphereSource.GetOutputPort())
-        glyph3D.SetInputData(polydata)
-        glyph3D.Update()
-
-        return glyph3D
-    
-    def __get_spherical_glyph(self) -> vtkGlyph3D:
-        """Return glyph that contains structure of seedpoints. This case, a spheres surrounding the critical points"""
-        return self.__get_spherical_glyph_from_critical_points(self.critical_points)
-
-        
-    def __get_tripple_plane_from_critical_points(self, gradients:List[float], critical_points:List[Tuple[float,float,float]], show_normal=False) -> vtkPolyData:
-        list_of_eigenvectors = []
-
-        for jacobian in gradients:
-            
-            _, eig_vec = np.linalg.eig(jacobian.reshape(3,3))
-            list_of_eigenvectors.append(eig_vec.tolist())
-
-        planes_to_generate = []
-        
-        # Create point cloud
-        points = vtkPoints()
-        for point, vecs in zip(critical_points, list_of_eigenvectors):
-
-            for vec in vecs: 
-
-                planes_to_generate.append({
-                    'point': point, 
-                    'normal': vec
-                })
-
-                #Add point multiple time.
-                points.InsertNextPoint(point[0], point[1], point[2])
-
-        # loop through critical points and go through each of the eigen vectors at that point and generate a plane actor.
-        list_of_plane_actors = []
-        list_of_polys = []
-        for p in planes_to_generate:
-            actor, poly = helpers.get_disc_actor(p['normal'], p['point'])
-            list_of_plane_actors.append(actor)
-            list_of_polys.append(poly)
-
-        all_points = vtkPoints()
-
-        for poly in list_of_polys:
-            for p in vtk_to_numpy(poly.GetPoints().GetData()):
-                all_points.InsertNextPoint(p[0],p[1],p[2])
-
-        cp_polydata = vtkPolyData()
-        cp_polydata.SetPoints(all_points)
+        list_of_plane_actors = [helpers.get_discs_actor(normals, disc_centers, owners)]
 
         if(show_normal):
-            normals_actor = helpers.get_plane_normal_actor(points, planes_to_generate)
-            list_of_plane_actors.append(normals_actor)
-
-        return cp_polydata, list_of_plane_actors
-
-    def __get_tripple_plane(self, show_normal=False) -> vtkPolyData:
-        return self.__get_tripple_plane_from_critical_points(self.gradient, self.critical_points, show_normal)
-        
-    
-    def __get_custom_seedpoints_from_file_template(self):
-
-        custom_template = np.loadtxt(self.template_filename)
-
-        seedpoints = vtkPoints()
-
-        for cp in self.critical_points:
-            for t in custom_template:
-                res = np.add(cp,t)
-                seedpoints.InsertNextPoint(res[0],res[1],res[2])
-                
-        cp_polydata = vtkPolyData()
-        cp_polydata.SetPoints(seedpoints)
+            points = vtkPoints()
+            points.SetData(numpy_to_vtk(disc_centers, deep=True))
+            planes_to_generate = [{'point': point, 'normal': normal} for point, normal in zip(disc_centers, normals)]
+            list_of_plane_actors.append(helpers.get_plane_normal_actor(points, planes_to_generate))
 
-        return cp_polydata
+        return list_of_plane_actors
 
     def __get_plane(self) -> vtkGlyph3D:
         pass
@@ -0,0 +1,244 @@
+import os
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from seedpoint_generator import constants
+
+
+@lru_cache(maxsize=None)
+def get_unit_sphere_template(theta_resolution: int, phi_resolution: int, radius: float) -> np.ndarray:
+    """Returns the points of a sphere centered in origo. Same point layout as vtkSphereSource.
+    :theta_resolution: Number of points in the longitude direction
+    :phi_resolution: Number of points in the latitude direction, including the poles
+    :radius: Radius of the sphere
+    """
+    theta = 2*np.pi*np.arange(theta_resolution)/theta_resolution
+    phi = np.pi*np.arange(1, phi_resolution-1)/(phi_resolution-1)
+
+    # Poles first, then one ring of latitudes for every longitude
+    theta, phi = np.meshgrid(theta, phi, indexing='ij')
+    ring = np.stack([np.sin(phi)*np.cos(theta), np.sin(phi)*np.sin(theta), np.cos(phi)], axis=-1).reshape(-1, 3)
+    template = radius*np.concatenate([[[0., 0., 1.], [0., 0., -1.]], ring])
+
+    template.setflags(write=False)
+    return template
+
+
+@lru_cache(maxsize=None)
+def get_unit_disc_template(inner_radius: float, outer_radius: float, radial_resolution: int, circumferential_resolution: int) -> np.ndarray:
+    """Returns the points of a disc in the xy-plane centered in origo. Same point layout as vtkDiskSource.
+    :inner_radius: Inner radius of the disc
+    :outer_radius: Outer radius of the disc
+    :radial_resolution: Number of segments in the radial direction
+    :circumferential_resolution: Number of segments around the disc
+    """
+    theta = 2*np.pi*np.arange(circumferential_resolution)/circumferential_resolution
+    radii = inner_radius + np.arange(radial_resolution+1)*(outer_radius-inner_radius)/radial_resolution
+
+    theta, radii = np.meshgrid(theta, radii, indexing='ij')
+    template = np.stack([radii*np.cos(theta), radii*np.sin(theta), np.zeros_like(radii)], axis=-1).reshape(-1, 3)
+
+    template.setflags(write=False)
+    return template
+
+
+@lru_cache(maxsize=None)
+def _load_custom_template(template_filename: str, modified_time: float) -> np.ndarray:
+    template = np.loadtxt(template_filename, ndmin=2).reshape(-1, 3)
+    template.setflags(write=False)
+    return template
+
+
+def get_custom_template(template_filename: str) -> np.ndarray:
+    """Returns the template offsets stored in a txt file. Cached until the file is modified.
+    :template_filename: Path to the .txt file containing one x,y,z offset per row
+    """
+    return _load_custom_template(template_filename, os.path.getmtime(template_filename))
+
+
+def rotation_matrices_from_vectors(vec1, vec2) -> np.ndarray:
+    """Batched version of helpers.rotation_matrix_from_vectors.
+    :vec1: A 3d "source" vector
+    :vec2: (N,3) array of "destination" vectors
+    :return: (N,3,3) array of rotation matrices which when applied to vec1, aligns it with vec2[i].
+    """
+    a = np.asarray(vec1).real.astype(float).reshape(3)
+    a = a/np.linalg.norm(a)
+    b = np.asarray(vec2).real.astype(float).reshape(-1, 3)
+    b = b/np.linalg.norm(b, axis=1)[:, None]
+
+    v = np.cross(a, b)
+    c = b @ a
+    s = np.linalg.norm(v, axis=1)
+
+    kmat = np.zeros((len(b), 3, 3))
+    kmat[:, 0, 1], kmat[:, 0, 2] = -v[:, 2], v[:, 1]
+    kmat[:, 1, 0], kmat[:, 1, 2] = v[:, 2], -v[:, 0]
+    kmat[:, 2, 0], kmat[:, 2, 1] = -v[:, 1], v[:, 0]
+
+    # Parallel vectors have no rotation axis, they are handled separately below.
+    is_parallel = s < 1e-12
+    scale = np.divide(1-c, s**2, out=np.zeros_like(s), where=~is_parallel)
+    rotation_matrices = np.eye(3) + kmat + (kmat @ kmat)*scale[:, None, None]
+
+    # Anti-parallel vectors: rotate half a turn around any axis perpendicular to vec1.
+    is_opposite = is_parallel & (c < 0)
+    if(np.any(is_opposite)):
+        axis = np.cross(a, [1., 0., 0.]) if abs(a[0]) < 0.9 else np.cross(a, [0., 1., 0.])
+        axis = axis/np.linalg.norm(axis)
+        rotation_matrices[is_opposite] = 2*np.outer(axis, axis) - np.eye(3)
+
+    return rotation_matrices
+
+
+def place_template(centers, template: np.ndarray, rotations: Optional[np.ndarray] = None, owners: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Places a template around every center with one broadcasted operation.
+    :centers: (N,3) array of template centers
+    :template: (M,3) array of template points around origo
+    :rotations: (N,3,3) array of rotations applied to the template before moving it (optional)
+    :owners: (N,) array with the owner index of every center, defaults to 0..N-1 (optional)
+    :return: Contiguous (N*M,3) array of seed points and (N*M,) array with the owner index of every seed point
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    template = np.asarray(template, dtype=float).reshape(-1, 3)
+
+    if(rotations is None):
+        seeds = centers[:, None, :] + template[None, :, :]
+    else:
+        seeds = centers[:, None, :] + template @ np.transpose(rotations, (0, 2, 1))
+
+    if(owners is None):
+        owners = np.arange(len(centers))
+
+    return np.ascontiguousarray(seeds.reshape(-1, 3)), np.repeat(owners, len(template))
+
+
+def get_spherical_seed_points(centers, theta_resolution: int = constants.THETA_RESOLUTION, phi_resolution: int = constants.PHI_RESOLUTION, radius: float = constants.RADIUS) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns seed points sampled on a sphere around every center, and the owner index of every seed point"""
+    template = get_unit_sphere_template(int(theta_resolution), int(phi_resolution), float(radius))
+    return place_template(centers, template)
+
+
+def get_eigen_plane_normals(gradients) -> np.ndarray:
+    """Returns the (N*3,3) array of plane normals, the three eigen vectors of every gradient, used in the TRIPPLE_EIGEN_PLANE template"""
+    jacobians = np.asarray(gradients, dtype=float).reshape(-1, 3, 3)
+    if(len(jacobians) == 0):
+        return np.empty((0, 3))
+
+    # np.linalg.eig returns the eigen vectors as the columns of the matrix
+    _, eig_vec = np.linalg.eig(jacobians)
+    return np.swapaxes(eig_vec, 1, 2).real.reshape(-1, 3)
+
+
+def get_tripple_eigen_plane_seed_points(centers, gradients, inner_radius: float = constants.INNER_RADIUS, outer_radius: float = constants.OUTER_RADIUS, radial_resolution: int = constants.RADIAL_RESOLUTION, circumferential_resolution: int = constants.CIRCUMFERENTIAL_RESOLUTION) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns seed points sampled on three discs around every center, one disc per eigen vector of the gradient, and the owner index of every seed point"""
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    template = get_unit_disc_template(float(inner_radius), float(outer_radius), int(radial_resolution), int(circumferential_resolution))
+
+    normals = get_eigen_plane_normals(gradients)
+    rotations = rotation_matrices_from_vectors([0, 0, 1], normals)
+
+    return place_template(np.repeat(centers, 3, axis=0), template, rotations, np.repeat(np.arange(len(centers)), 3))
+
+
+def get_custom_template_seed_points(centers, template_filename: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns seed points from a user template file around every center, and the owner index of every seed point"""
+    return place_template(centers, get_custom_template(template_filename))
+
+
+def get_seed_budget_allocation(weights, seed_budget: int) -> np.ndarray:
+    """Splits a seed budget proportionally to the weights (largest remainder method). The counts sum up to the budget.
+    :weights: (N,) array of non negative weights
+    :seed_budget: Total number of seed points
+    """
+    weights = np.asarray(weights, dtype=float).reshape(-1)
+    if(len(weights) == 0):
+        return np.zeros(0, dtype=np.int64)
+
+    weights = np.nan_to_num(np.clip(weights, 0, None))
+    if(weights.sum() <= 0):
+        weights = np.ones_like(weights)
+
+    shares = seed_budget*weights/weights.sum()
+    counts = np.floor(shares).astype(np.int64)
+    remainder = int(seed_budget - counts.sum())
+    counts[np.argsort(counts-shares, kind='stable')[:remainder]] += 1
+
+    return counts
+
+
+def get_sphere_resolution_from_number_of_seeds(number_of_seeds) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the largest sphere resolutions (theta, phi) that use at most the given number of seeds.
+    Resolutions are 0 where the number is smaller than the smallest sphere (5 seeds).
+    """
+    number_of_seeds = np.asarray(number_of_seeds, dtype=np.int64).reshape(-1)
+
+    # theta*(phi-2)+2 seeds, with about twice as many longitudes as latitude rings.
+    rings = np.maximum(np.floor(np.sqrt(np.maximum(number_of_seeds-2, 0)/2)), 1).astype(np.int64)
+    theta = (number_of_seeds-2)//rings
+
+    is_valid = theta >= 3
+    return np.where(is_valid, theta, 0), np.where(is_valid, rings+2, 0)
+
+
+def get_disc_resolution_from_number_of_seeds(number_of_seeds, radial_resolution: int = constants.RADIAL_RESOLUTION) -> np.ndarray:
+    """Returns the largest circumferential resolution of the three discs that use at most the given number of seeds.
+    Resolutions are 0 where the number is smaller than three of the smallest discs.
+    """
+    number_of_seeds = np.asarray(number_of_seeds, dtype=np.int64).reshape(-1)
+    circumferential_resolution = number_of_seeds//(3*(radial_resolution+1))
+
+    return np.where(circumferential_resolution >= 3, circumferential_resolution, 0)
+
+
+def _group_by_resolution(resolutions: np.ndarray):
+    """Yields (resolution, indices) for every unique non zero resolution row"""
+    resolutions = resolutions.reshape(len(resolutions), -1)
+    is_valid = np.all(resolutions > 0, axis=1)
+
+    unique_resolutions, inverse = np.unique(resolutions[is_valid], axis=0, return_inverse=True)
+    valid_indices = np.flatnonzero(is_valid)
+    for i, resolution in enumerate(unique_resolutions):
+        yield resolution, valid_indices[inverse.reshape(-1) == i]
+
+
+def _concatenate_by_owner(list_of_seeds: List[np.ndarray], list_of_owners: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    if(len(list_of_seeds) == 0):
+        return np.empty((0, 3)), np.empty(0, dtype=np.int64)
+
+    seeds = np.concatenate(list_of_seeds)
+    owners = np.concatenate(list_of_owners)
+    order = np.argsort(owners, kind='stable')
+    return np.ascontiguousarray(seeds[order]), owners[order]
+
+
+def get_budgeted_spherical_seed_points(centers, number_of_seeds, radius: float = constants.RADIUS) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns seed points sampled on a sphere around every center, using at most number_of_seeds[i] seeds for center i"""
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    theta, phi = get_sphere_resolution_from_number_of_seeds(number_of_seeds)
+
+    list_of_seeds, list_of_owners = [], []
+    for (theta_resolution, phi_resolution), indices in _group_by_resolution(np.stack([theta, phi], axis=1)):
+        template = get_unit_sphere_template(int(theta_resolution), int(phi_resolution), float(radius))
+        seeds, owners = place_template(centers[indices], template, owners=indices)
+        list_of_seeds.append(seeds)
+        list_of_owners.append(owners)
+
+    return _concatenate_by_owner(list_of_seeds, list_of_owners)
+
+
+def get_budgeted_tripple_eigen_plane_seed_points(centers, gradients, number_of_seeds, inner_radius: float = constants.INNER_RADIUS, outer_radius: float = constants.OUTER_RADIUS, radial_resolution: int = constants.RADIAL_RESOLUTION) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns seed points sampled on three eigen vector discs around every center, using at most number_of_seeds[i] seeds for center i"""
+    centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+    gradients = np.asarray(gradients, dtype=float).reshape(-1, 9)
+    circumferential_resolutions = get_disc_resolution_from_number_of_seeds(number_of_seeds, radial_resolution)
+
+    list_of_seeds, list_of_owners = [], []
+    for (circumferential_resolution,), indices in _group_by_resolution(circumferential_resolutions):
+        seeds, owners = get_tripple_eigen_plane_seed_points(centers[indices], gradients[indices], inner_radius, outer_radius, radial_resolution, int(circumferential_resolution))
+        list_of_seeds.append(seeds)
+        list_of_owners.append(indices[owners])
+
+    return _concatenate_by_owner(list_of_seeds, list_of_owners)
@@ -2,4 +2,58 @@
 DAYSIDE_NIGHTSIDE_THRESHOLD = -4
 UPPERBOUND = (0,0,1)
 LOWERBOUND = (0,0,-1)
-BOUND_RADIUS = 0.5
\ No newline at end of file
+BOUND_RADIUS = 0.5
+
+# Streamline tracer used to find the seedpoint status
+MAXIMUM_PROPAGATION = 300
+INITIAL_INTEGRATION_STEP = 0.2
+MAXIMUM_ERROR = 1e-06
+TERMINAL_SPEED = 1e-12
+MAXIMUM_NUMBER_OF_STEPS = 2000
+INTEGRATION_STEP_UNIT = 2
+
+# Adaptive refinement, used in refine_seed_points()
+REFINEMENT_TOLERANCE = 0.05
+REFINEMENT_NEIGHBOURS = 4
+REFINEMENT_MAX_ITERATIONS = 10
+
+# Groups of seedpoints up to this size are compared with a distance matrix, larger ones with a kd-tree. Used in refine_seed_points() and update_seed_point_info_incremental()
+DENSE_DISTANCE_LIMIT = 256
+
+# Number of seed chunks generated ahead of the tracing, used in update_seed_point_info_from_chunks()
+SEED_QUEUE_SIZE = 2
+# Seconds the chunk producer waits on a full queue before checking if the tracing has stopped
+SEED_QUEUE_TIMEOUT = 0.1
+
+# Number of rows in every group of openspace_seeding()
+OPENSPACE_GROUP_SIZE = 5
+
+# Largest distance in Earth radii between a removed point and the simplified fieldline, used in decimate_fieldlines()
+DECIMATION_TOLERANCE = 0.01
+
+# Color of every FieldlineStatus in visualize()
+FIELDLINE_STATUS_COLORS = {
+    'IMF': (200/255, 200/255, 200/255),
+    'CLOSED': (60/255, 120/255, 255/255),
+    'OPEN_NORTH': (255/255, 90/255, 90/255),
+    'OPEN_SOUTH': (255/255, 200/255, 60/255),
+}
+
+# Keys of the layers and sides in add_to_viewer(). The None side shows both sides.
+FIELDLINE_STATUS_KEYS = {
+    'IMF': 'F1',
+    'CLOSED': 'F2',
+    'OPEN_NORTH': 'F3',
+    'OPEN_SOUTH': 'F4',
+}
+EARTH_LAYER_KEY = 'F5'
+EARTH_SIDE_KEYS = {
+    'DAYSIDE': 'd',
+    'NIGHTSIDE': 'n',
+    None: 'b',
+}
+
+# Incremental mode for time series, used in update_seed_point_info_incremental()
+# Fraction of the reused seedpoints that is retraced to find changes, and the seed of the random sample
+TEMPORAL_SAMPLE_FRACTION = 0.1
+TEMPORAL_RANDOM_SEED = 0
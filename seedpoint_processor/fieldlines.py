@@ -0,0 +1,113 @@
+from typing import List
+
+import numpy as np
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkPolyData
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from seedpoint_processor import helpers
+
+
+class Fieldlines():
+    """
+    Compressed (CSR) store of traced fieldlines. The points of line i are points[offsets[i]:offsets[i+1]].
+    Line i was traced from the seed point with id seed_ids[i]. A seed point traced in both directions has two lines.
+    """
+
+    def __init__(self, points, offsets, seed_ids):
+        """
+        :points: (N,3) array with the points of all lines
+        :offsets: (L+1,) array with the start of every line
+        :seed_ids: (L,) array with the seed point id of every line
+        """
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.offsets = np.asarray(offsets, dtype=np.int64).reshape(-1)
+        self.seed_ids = np.asarray(seed_ids, dtype=np.int64).reshape(-1)
+
+        if(len(self.offsets) != len(self.seed_ids)+1):
+            raise ValueError(f"Got {len(self.offsets)} offsets for {len(self.seed_ids)} lines.")
+
+    def __len__(self) -> int:
+        return len(self.seed_ids)
+
+    def get_number_of_points(self) -> int:
+        return len(self.points)
+
+    def get_line_ids(self) -> np.ndarray:
+        """Returns the line id of every point"""
+        return np.repeat(np.arange(len(self.seed_ids)), np.diff(self.offsets))
+
+    def select(self, is_selected: np.ndarray) -> 'Fieldlines':
+        """Returns the lines where is_selected is True"""
+        is_selected = np.asarray(is_selected, dtype=bool)
+        lengths = np.diff(self.offsets)[is_selected]
+
+        return Fieldlines(self.points[is_selected[self.get_line_ids()]], np.concatenate([[0], np.cumsum(lengths)]), self.seed_ids[is_selected])
+
+    def select_seed_ids(self, seed_ids) -> 'Fieldlines':
+        """Returns the lines that were traced from the given seed point ids"""
+        return self.select(np.isin(self.seed_ids, seed_ids))
+
+    def decimate(self, tolerance: float) -> 'Fieldlines':
+        """Returns the lines simplified with the Douglas-Peucker algorithm
+        :tolerance: Largest distance between a removed point and the simplified line
+        """
+        keep = helpers.get_douglas_peucker_mask(self.points, self.offsets, tolerance)
+        lengths = np.bincount(self.get_line_ids()[keep], minlength=len(self))
+
+        return Fieldlines(self.points[keep], np.concatenate([[0], np.cumsum(lengths)]), self.seed_ids)
+
+    def to_polydata(self) -> vtkPolyData:
+        """Returns the lines as vtkPolyData with a 'SeedIds' cell array"""
+        points = vtkPoints()
+        points.SetData(numpy_to_vtk(np.ascontiguousarray(self.points), deep=True))
+
+        lines = vtkCellArray()
+        lines.SetData(numpy_to_vtk(self.offsets, deep=True), numpy_to_vtk(np.arange(len(self.points), dtype=np.int64), deep=True))
+
+        seed_ids = numpy_to_vtk(self.seed_ids, deep=True)
+        seed_ids.SetName('SeedIds')
+
+        poly = vtkPolyData()
+        poly.SetPoints(points)
+        poly.SetLines(lines)
+        poly.GetCellData().AddArray(seed_ids)
+        return poly
+
+    @classmethod
+    def from_streamlines(cls, streamlines: vtkPolyData, seed_ids=None) -> 'Fieldlines':
+        """Creates the store from the output of a vtkStreamTracer
+        :seed_ids: Seed point id of every seed given to the tracer (optional), default is the index of the seed
+        """
+        if(streamlines.GetNumberOfCells() == 0):
+            return cls.empty()
+
+        lines = streamlines.GetLines()
+        offsets = vtk_to_numpy(lines.GetOffsetsArray())
+        connectivity = vtk_to_numpy(lines.GetConnectivityArray())
+        tracer_seed_ids = vtk_to_numpy(streamlines.GetCellData().GetArray('SeedIds'))
+
+        if(seed_ids is not None):
+            tracer_seed_ids = np.asarray(seed_ids)[tracer_seed_ids]
+
+        return cls(vtk_to_numpy(streamlines.GetPoints().GetData())[connectivity], offsets, tracer_seed_ids)
+
+    @classmethod
+    def empty(cls) -> 'Fieldlines':
+        return cls(np.empty((0, 3)), [0], [])
+
+    @classmethod
+    def concatenate(cls, list_of_fieldlines: List['Fieldlines'], seed_id_offsets=None) -> 'Fieldlines':
+        """Concatenates several stores into one
+        :seed_id_offsets: Offset added to the seed ids of every store (optional)
+        """
+        if(len(list_of_fieldlines) == 0):
+            return cls.empty()
+        if(seed_id_offsets is None):
+            seed_id_offsets = np.zeros(len(list_of_fieldlines), dtype=np.int64)
+
+        point_offsets = np.cumsum([0] + [fieldlines.get_number_of_points() for fieldlines in list_of_fieldlines])
+        offsets = np.concatenate([[0]] + [fieldlines.offsets[1:] + offset for fieldlines, offset in zip(list_of_fieldlines, point_offsets)])
+
+        points = np.concatenate([fieldlines.points for fieldlines in list_of_fieldlines])
+        seed_ids = np.concatenate([fieldlines.seed_ids + offset for fieldlines, offset in zip(list_of_fieldlines, seed_id_offsets)])
+        return cls(points, offsets, seed_ids)
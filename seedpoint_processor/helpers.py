@@ -0,0 +1,173 @@
+from typing import TYPE_CHECKING, Tuple
+
+import numpy as np
+from vtkmodules.vtkCommonCore import vtkIdList, vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkKdTreePointLocator, vtkPolyData
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from seedpoint_processor import constants
+
+if TYPE_CHECKING:
+    from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+
+
+def get_streamline_points_and_seed_ids(streamlines: vtkPolyData) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns all points of the streamlines from a vtkStreamTracer and the id of the seed each point was traced from.
+    :streamlines: Output of a vtkStreamTracer (vtkPolyData with a 'SeedIds' cell array)
+    """
+    lines = streamlines.GetLines()
+    offsets = vtk_to_numpy(lines.GetOffsetsArray())
+    connectivity = vtk_to_numpy(lines.GetConnectivityArray())
+    seed_ids = vtk_to_numpy(streamlines.GetCellData().GetArray('SeedIds'))
+
+    points = vtk_to_numpy(streamlines.GetPoints().GetData())[connectivity]
+    return points, np.repeat(seed_ids, np.diff(offsets))
+
+
+def get_neighbour_pairs(points: np.ndarray, owners: np.ndarray, number_of_neighbours: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns index pairs (i, j), i < j, of points that are among each others closest points with the same owner.
+    Owners with more than DENSE_DISTANCE_LIMIT points are searched with a kd-tree instead of a distance matrix.
+    :points: (N,3) array of points
+    :owners: (N,) array with the owner of every point, only points with the same owner can be neighbours
+    :number_of_neighbours: Number of closest points of every point
+    """
+    order = np.argsort(owners, kind='stable')
+    bounds = np.flatnonzero(np.diff(owners[order])) + 1
+    bounds = np.concatenate([[0], bounds, [len(order)]])
+
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        indices = order[start:end]
+        k = min(number_of_neighbours, len(indices)-1)
+        if(k < 1):
+            continue
+
+        group = points[indices]
+        if(len(indices) <= constants.DENSE_DISTANCE_LIMIT):
+            distances = np.linalg.norm(group[:, None, :]-group[None, :, :], axis=2)
+            np.fill_diagonal(distances, np.inf)
+            nearest = np.argpartition(distances, k-1, axis=1)[:, :k]
+        else:
+            nearest = _get_closest_points(group, group, k+1)
+            # Drop every point itself, or the furthest point if a duplicate point came first
+            is_self = nearest == np.arange(len(indices))[:, None]
+            is_self[~is_self.any(axis=1), -1] = True
+            nearest = nearest[~is_self].reshape(-1, k)
+
+        i = np.repeat(indices, k)
+        j = indices[nearest.ravel()]
+        pairs.append(np.stack([np.minimum(i, j), np.maximum(i, j)], axis=1))
+
+    pairs = np.unique(np.concatenate(pairs), axis=0)
+    return pairs[:, 0], pairs[:, 1]
+
+
+def get_nearest_relative_points(seed_critical_pair: 'SeedCriticalPair', previous_seed_critical_pair: 'SeedCriticalPair', matches: np.ndarray, tolerance: float) -> np.ndarray:
+    """Returns the index of the previous seed point of every seed point, -1 if it has none.
+    It is the seed point of the matched previous critical point that is closest relative to the critical point, e.g. the same seed point of the template.
+    Critical points with more than DENSE_DISTANCE_LIMIT seed points are searched with a kd-tree instead of a distance matrix.
+    :matches: (K,) array with the index of the previous critical point of every critical point, -1 if it has none
+    :tolerance: Largest distance between the relative positions of a seed point and its previous seed point
+    """
+    previous_seeds = np.full(len(seed_critical_pair.seed_points), -1, dtype=np.int64)
+
+    for i in np.flatnonzero(matches >= 0):
+        start, end = seed_critical_pair.offsets[i], seed_critical_pair.offsets[i+1]
+        previous_start, previous_end = previous_seed_critical_pair.offsets[matches[i]], previous_seed_critical_pair.offsets[matches[i]+1]
+        if(start == end or previous_start == previous_end):
+            continue
+
+        relative = seed_critical_pair.seed_points[start:end] - seed_critical_pair.critical_points[i]
+        previous_relative = previous_seed_critical_pair.seed_points[previous_start:previous_end] - previous_seed_critical_pair.critical_points[matches[i]]
+        if(max(len(relative), len(previous_relative)) <= constants.DENSE_DISTANCE_LIMIT):
+            nearest = np.argmin(np.linalg.norm(relative[:, None, :]-previous_relative[None, :, :], axis=2), axis=1)
+        else:
+            nearest = _get_closest_points(previous_relative, relative, 1)[:, 0]
+
+        is_close = np.linalg.norm(relative-previous_relative[nearest], axis=1) <= tolerance
+        previous_seeds[start:end][is_close] = previous_start + nearest[is_close]
+
+    return previous_seeds
+
+
+def _get_closest_points(points: np.ndarray, query_points: np.ndarray, k: int) -> np.ndarray:
+    """Returns (M,k) indices of the k closest points of every query point, closest first, using a kd-tree of points"""
+    vtk_points = vtkPoints()
+    vtk_points.SetData(numpy_to_vtk(np.ascontiguousarray(points, dtype=float), deep=True))
+    polydata = vtkPolyData()
+    polydata.SetPoints(vtk_points)
+
+    locator = vtkKdTreePointLocator()
+    locator.SetDataSet(polydata)
+    locator.BuildLocator()
+
+    ids = vtkIdList()
+    closest = np.empty((len(query_points), k), dtype=np.int64)
+    for i, point in enumerate(np.asarray(query_points, dtype=float)):
+        locator.FindClosestNPoints(k, point, ids)
+        closest[i] = [ids.GetId(j) for j in range(k)]
+
+    return closest
+
+
+def get_douglas_peucker_mask(points: np.ndarray, offsets: np.ndarray, tolerance: float) -> np.ndarray:
+    """Returns a mask of the points to keep when every polyline is simplified with the Douglas-Peucker algorithm.
+    All polylines are simplified at once, every iteration splits all segments that are further than tolerance from a point between its ends.
+    :points: (N,3) array with the points of all polylines
+    :offsets: (L+1,) array, the points of polyline i are points[offsets[i]:offsets[i+1]]
+    :tolerance: Largest distance between a removed point and the simplified polyline
+    """
+    keep = np.zeros(len(points), dtype=bool)
+    has_points = offsets[1:] > offsets[:-1]
+    keep[offsets[:-1][has_points]] = True
+    keep[offsets[1:][has_points]-1] = True
+
+    # Segments (start, end) that still have points between their ends
+    start = offsets[:-1][has_points]
+    end = offsets[1:][has_points]-1
+
+    while(True):
+        number_of_inner_points = end-start-1
+        is_open = number_of_inner_points > 0
+        start, end, number_of_inner_points = start[is_open], end[is_open], number_of_inner_points[is_open]
+        if(len(start) == 0):
+            break
+
+        segment = np.repeat(np.arange(len(start)), number_of_inner_points)
+        segment_offsets = np.concatenate([[0], np.cumsum(number_of_inner_points)])
+        inner = start[segment] + 1 + np.arange(len(segment)) - segment_offsets[segment]
+
+        # Distance from every inner point to the line segment between the ends
+        a, b = points[start[segment]], points[end[segment]]
+        ab = b-a
+        length_squared = np.sum(ab**2, axis=1)
+        t = np.clip(np.sum((points[inner]-a)*ab, axis=1)/np.where(length_squared > 0, length_squared, 1), 0, 1)
+        distance = np.linalg.norm(points[inner]-(a+t[:, None]*ab), axis=1)
+
+        largest = np.maximum.reduceat(distance, segment_offsets[:-1])
+        is_split = largest > tolerance
+
+        # First inner point with the largest distance of every split segment
+        is_largest = (distance == largest[segment]) & is_split[segment]
+        split_segments, first = np.unique(segment[is_largest], return_index=True)
+        split = inner[is_largest][first]
+        keep[split] = True
+
+        start = np.concatenate([start[split_segments], split])
+        end = np.concatenate([split, end[split_segments]])
+
+    return keep
+
+
+def get_enum_indices(values, enum) -> np.ndarray:
+    """Returns the position in the enum of every value, -1 for values that are not in the enum (e.g. 'null')
+    :values: Enum values or members
+    :enum: Enum class
+    """
+    lookup = {}
+    for index, member in enumerate(enum):
+        lookup[member] = index
+        lookup[member.value] = index
+
+    unique_values, inverse = np.unique(np.asarray(values, dtype=object).astype(str), return_inverse=True)
+    lookup = {str(key): index for key, index in lookup.items()}
+    return np.array([lookup.get(value, -1) for value in unique_values], dtype=np.int64)[inverse].reshape(-1)
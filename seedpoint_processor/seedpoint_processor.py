@@ -1,15 +1,30 @@
 from enum import Enum
 import logging
 import os
-from typing import List, Optional, Tuple
+import queue
+import threading
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
 import warnings
 import numpy as np
 import pandas as pd
-from vtk import vtkStreamTracer, vtkPoints, vtkPolyDataMapper, vtkActor, vtkPolyData, vtkImageData
-from vtkmodules.util.numpy_support import vtk_to_numpy
-from seedpoint_processor import constants
+from vtkmodules.vtkCommonCore import vtkLookupTable, vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkDataObject, vtkImageData, vtkPolyData, vtkStaticCellLocator
+from vtkmodules.vtkFiltersCore import vtkPassThrough, vtkProbeFilter, vtkThreshold
+from vtkmodules.vtkFiltersFlowPaths import vtkStreamTracer
+from vtkmodules.vtkIOXML import vtkXMLPolyDataWriter
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from seedpoint_processor import constants, helpers
+from seedpoint_processor.fieldlines import Fieldlines
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+from criticalpoint_processor import constants as cp_constants
+from criticalpoint_processor.helpers import get_nearest_matches
 from vectorfieldtopology.helpers import get_sphere_actor
-from vtk_visualization.helpers import start_window
+from vtk_visualization.helpers import is_headless, load_rendering_modules, start_window
+
+if TYPE_CHECKING:
+    from vtkmodules.vtkCommonExecutionModel import vtkAlgorithm
+    from vtkmodules.vtkRenderingCore import vtkActor
+    from vtk_visualization.viewer import ViewerSession
 
 class FieldlineStatus(Enum): 
     IMF = 'IMF'
@@ -22,6 +37,9 @@ class EarthSide(Enum):
     DAYSIDE = 'DAYSIDE'
 
 
+# Status of seedpoints that can't be classified. 'null' has an empty streamline, 'invalid' is outside the domain and never traced.
+_UNCLASSIFIED_STATUS = ['null', 'invalid']
+
 class SeedpointProcessor():
 
     def __init__(self):
@@ -30,14 +48,15 @@ class SeedpointProcessor():
         self.seedpoints = []
         self.list_of_actors = []
         self.seedpoint_info = pd.DataFrame()
-
-    def set_seed_critical_pair(self, seed_critical_pair: List[Tuple[List[Tuple[float,float,float]], List[Tuple[float,float,float]]]]) -> None:
-        """Sets the seedpoints and seedpoint/criticalpoint pairs"""
-        self.seed_critical_pair = seed_critical_pair
-        
-        for _, seeds in seed_critical_pair:
-            for seed in seeds:
-                self.seedpoints.append(seed)
+        self.number_of_invalid_seed_points = np.empty(0, dtype=int)
+        self.fieldlines = Fieldlines.empty()
+        self.retrace_fraction = 1.0
+        self.number_of_mismatched_seed_points = None
+
+    def set_seed_critical_pair(self, seed_critical_pair: Union[SeedCriticalPair, List[Tuple[Tuple[float,float,float], List[Tuple[float,float,float]]]]]) -> None:
+        """Sets the seedpoints and seedpoint/criticalpoint pairs. The seed points are shared with the given SeedCriticalPair, not copied."""
+        self.seed_critical_pair = SeedCriticalPair.from_pairs(seed_critical_pair)
+        self.seedpoints = self.seed_critical_pair.seed_points
         
         logging.info("Updated seed_critical_pair")        
 
@@ -121,6 +140,39 @@ class SeedpointProcessor():
         self.seedpoint_info.to_csv(f'{dirName}/{filename}', index=False)
         logging.info(f"Saved seedpoint information to '{dirName}/{filename}'")
 
+    def save_fieldlines_to_file(self, filename='fieldlines.vtp') -> None:
+        """Save the traced fieldlines of the seedpoints in seedpoint_info to a vtp file, with the seedpoint row as 'SeedIds' cell data"""
+
+        dirName = 'seed_points'
+
+        if not os.path.exists(dirName):
+            os.mkdir(dirName)
+            logging.info(f"Directory {dirName} created.")
+        else:    
+            logging.info(f"Directory {dirName} already exists.")
+
+        writer = vtkXMLPolyDataWriter()
+        writer.SetFileName(f'{dirName}/{filename}')
+        writer.SetInputData(self.fieldlines.select_seed_ids(self.seedpoint_info.index.to_numpy()).to_polydata())
+        writer.SetDataModeToAppended()
+        writer.Write()
+        logging.info(f"Saved fieldlines to '{dirName}/{filename}'")
+
+    def decimate_fieldlines(self, tolerance:float = constants.DECIMATION_TOLERANCE) -> None:
+        """
+        Simplifies the traced fieldlines with the Douglas-Peucker algorithm. Used by visualize() and save_fieldlines_to_file().
+        :tolerance: Largest distance in Earth radii between a removed point and the simplified fieldline
+        """
+        if(len(self.fieldlines) == 0):
+            warnings.warn("No fieldlines to decimate.. Run update_seed_point_info() first")
+            return
+
+        number_of_points = self.fieldlines.get_number_of_points()
+        self.fieldlines = self.fieldlines.decimate(tolerance)
+
+        reduction = 1 - self.fieldlines.get_number_of_points()/number_of_points if number_of_points > 0 else 0
+        logging.info(f"Decimated fieldlines from {number_of_points} to {self.fieldlines.get_number_of_points()} points ({100*reduction:.1f}% reduction)")
+
 
     def update_seed_point_info(self) -> None:
         """
@@ -128,228 +180,627 @@ class SeedpointProcessor():
         Information is a dataframe containing: 'FieldlineStatus', 'EarthSide', 'X', 'Y', 'Z', 'CriticalPoint'.
         """
 
-        seed_side = []
-        seed_status = []
-        critical_point_location = []
-
         logging.info(f"Generating seedpoint information..")
 
-        for i, (critical_point, seed_points) in enumerate(self.seed_critical_pair):
-            
-            for seed in seed_points:
-
-                seeds = vtkPoints()
-                seeds.InsertNextPoint(seed)
-                    
-                poly = vtkPolyData()
-                poly.SetPoints(seeds)
-
-                streamline = vtkStreamTracer()
-                streamline.SetInputData(self.vectorfield)
-                streamline.SetSourceData(poly)
-                streamline.SetMaximumPropagation(300)
-                streamline.SetInitialIntegrationStep(.2)
-                streamline.SetIntegrationDirectionToBoth()
-                streamline.SetInterpolatorTypeToCellLocator()
-                streamline.SetIntegratorTypeToRungeKutta4()
-                streamline.SetMaximumError(1e-06)
-                streamline.SetTerminalSpeed(1e-12)
-                streamline.SetMaximumNumberOfSteps(2000)
-                streamline.SetIntegrationStepUnit(2)
-                streamline.Update()
-
-                streamline_points = vtk_to_numpy(streamline.GetOutput().GetPoints().GetData())
-
-                if(len(streamline_points) > 0):
-                    side, status = self.__get_status_seedpoint(streamline_points, critical_point)
-                    seed_side.append(side)
-                    seed_status.append(status)
-                    critical_point_location.append(critical_point)
+        self.seedpoints = self.seed_critical_pair.seed_points
+        self.seedpoint_info, self.fieldlines = self.__get_seed_point_info(self.seed_critical_pair)
+        self.__update_number_of_invalid_seed_points(self.seedpoint_info['FieldlineStatus'].to_numpy(dtype=object), self.seed_critical_pair.owners, self.seed_critical_pair.critical_points)
+        self.retrace_fraction = 1.0
+
+    def update_seed_point_info_from_chunks(self, seed_chunks: Iterable[SeedCriticalPair], queue_size:int = constants.SEED_QUEUE_SIZE, filename:Optional[str] = None) -> None:
+        """
+        Updates seedpoint information from chunks of seedpoints, e.g. SeedpointGenerator.iter_seed_chunks().
+        The next chunks are generated in a background thread while the current chunk is traced. At most queue_size chunks are waiting at once.
+        Every chunk is dropped after it is traced, only its seedpoint information, fieldlines and owners are kept.
+        :seed_chunks: Iterable of SeedCriticalPair
+        :queue_size: Number of chunks that are generated ahead of the tracing
+        :filename: If given, the seedpoint information of every chunk is appended to this csv file in 'seed_points' instead of being kept, and no fieldlines are kept
+        """
+
+        logging.info(f"Generating seedpoint information from chunks..")
+
+        chunk_queue = queue.Queue(maxsize=max(1, queue_size))
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            """Puts item on the queue, returns False if the consumer stopped"""
+            while not stop.is_set():
+                try:
+                    chunk_queue.put(item, timeout=constants.SEED_QUEUE_TIMEOUT)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for chunk in seed_chunks:
+                    if(not put(chunk)):
+                        return
+            except Exception as e:
+                put(e)
+            put(None)
+
+        if(filename is not None):
+            dirName = 'seed_points'
+            if not os.path.exists(dirName):
+                os.mkdir(dirName)
+                logging.info(f"Directory {dirName} created.")
+            path = f'{dirName}/{filename}'
+
+        producer = threading.Thread(target=produce, daemon=True)
+        producer.start()
+
+        list_of_info = []
+        list_of_fieldlines = []
+        list_of_status = []
+        list_of_owners = []
+        list_of_critical_points = []
+        list_of_representatives = []
+        number_of_chunks = 0
+        number_of_seeds = 0
+        number_of_critical_points = 0
+        try:
+            while True:
+                chunk = chunk_queue.get()
+                if(chunk is None):
+                    break
+                elif(isinstance(chunk, Exception)):
+                    raise chunk
+
+                info, fieldlines = self.__get_seed_point_info(chunk)
+                list_of_status.append(info['FieldlineStatus'].to_numpy(dtype=object))
+                list_of_owners.append(chunk.owners + number_of_critical_points)
+                list_of_critical_points.append(chunk.critical_points)
+
+                if(filename is None):
+                    list_of_info.append(info)
+                    list_of_fieldlines.append(fieldlines)
+                    list_of_representatives.append(chunk.representatives + number_of_seeds)
                 else:
-                    seed_side.append('null')
-                    seed_status.append('null')
-                    critical_point_location.append('null')
-                    logging.debug(f"Index {i} has length zero")
-
-        self.seedpoint_info['X'] = [s[0] for s in self.seedpoints]
-        self.seedpoint_info['Y'] = [s[1] for s in self.seedpoints]
-        self.seedpoint_info['Z'] = [s[2] for s in self.seedpoints]
-        self.seedpoint_info['EarthSide'] = seed_side
-        self.seedpoint_info['FieldlineStatus'] = seed_status
-        self.seedpoint_info['CriticalPoint'] = critical_point_location
-
-       
-
-    def __get_status_seedpoint(self, streamline_points: Tuple[float,float,float], critical_point: Tuple[float,float,float]) -> Tuple[EarthSide, FieldlineStatus]:
-        """ Gets the status of a certain streamline """
-    
-        ux, uy, uz = constants.UPPERBOUND
-        lx, ly, lz = constants.LOWERBOUND
-        rad = constants.BOUND_RADIUS
+                    info.to_csv(path, mode='w' if number_of_chunks == 0 else 'a', header=number_of_chunks == 0, index=False)
+
+                number_of_chunks += 1
+                number_of_seeds += len(chunk.seed_points)
+                number_of_critical_points += len(chunk.critical_points)
+                logging.info(f"Processed chunk {number_of_chunks} with {len(chunk.seed_points)} seedpoints")
+                del chunk, info, fieldlines
+        finally:
+            # Stop the producer and empty the queue, so it never blocks on a full queue
+            stop.set()
+            while producer.is_alive():
+                try:
+                    chunk_queue.get(timeout=constants.SEED_QUEUE_TIMEOUT)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+        if(number_of_chunks == 0):
+            warnings.warn("No seed chunks were given..")
+            return
+
+        owners = np.concatenate(list_of_owners)
+        critical_points = np.concatenate(list_of_critical_points)
+        seed_status = np.concatenate(list_of_status)
+
+        if(filename is None):
+            self.seedpoint_info = pd.concat(list_of_info, ignore_index=True)
+            self.fieldlines = Fieldlines.concatenate(list_of_fieldlines, np.cumsum([0] + [len(info) for info in list_of_info[:-1]]))
+            self.seed_critical_pair = SeedCriticalPair(self.seedpoint_info[['X', 'Y', 'Z']].to_numpy(dtype=float), owners, critical_points)
+            self.seed_critical_pair.representatives = np.concatenate(list_of_representatives)
+        else:
+            logging.info(f"Saved seedpoint information of {number_of_seeds} seedpoints to '{path}'")
+            self.seedpoint_info = pd.DataFrame(columns=['X', 'Y', 'Z', 'EarthSide', 'FieldlineStatus', 'CriticalPoint'])
+            self.fieldlines = Fieldlines.empty()
+            self.seed_critical_pair = SeedCriticalPair(np.empty((0, 3)), np.empty(0, dtype=np.int64), critical_points)
+        self.seedpoints = self.seed_critical_pair.seed_points
+        self.__update_number_of_invalid_seed_points(seed_status, owners, critical_points)
+        self.retrace_fraction = 1.0
+
+    def update_seed_point_info_incremental(self, previous_seed_critical_pair: SeedCriticalPair, previous_seedpoint_info: pd.DataFrame, tolerance:float = cp_constants.MATCH_TOLERANCE, sample_fraction:float = constants.TEMPORAL_SAMPLE_FRACTION, number_of_neighbours:int = constants.REFINEMENT_NEIGHBOURS, verify:bool = False) -> None:
+        """
+        Updates seedpoint information of a timestep from the previous timestep of a time series, like update_seed_point_info() but with fewer traces.
+        Critical points are matched to the closest previous critical point within the tolerance. Every seedpoint of a matched critical point
+        reuses the status of the previous seedpoint that is closest relative to the critical point, if it is within the tolerance.
+        A random sample of the reused seedpoints, with at least one seedpoint of every critical point, and the seedpoints on previous status boundaries are retraced first. Every critical point
+        where a retraced status changed is retraced completely, as are the critical points without a match.
+        The fraction of retraced seedpoints is stored in retrace_fraction. Only the retraced seedpoints have fieldlines.
+        :previous_seed_critical_pair: seed_critical_pair of the previous timestep
+        :previous_seedpoint_info: seedpoint_info of the previous timestep, one row per seedpoint of previous_seed_critical_pair
+        :tolerance: Largest distance between a critical point and its previous critical point, and between the relative positions of a seedpoint and its previous seedpoint
+        :sample_fraction: Fraction of the reused seedpoints that is retraced
+        :number_of_neighbours: Number of closest seedpoints of the same critical point that are checked for a status boundary
+        :verify: Also traces every seedpoint and stores the number of seedpoints with a different status in number_of_mismatched_seed_points
+        """
+        if(len(previous_seedpoint_info) != len(previous_seed_critical_pair.seed_points)):
+            raise ValueError(f"Got {len(previous_seedpoint_info)} rows of previous seedpoint info for {len(previous_seed_critical_pair.seed_points)} previous seedpoints.")
+
+        logging.info(f"Generating seedpoint information from the previous timestep..")
+
+        seed_critical_pair = self.seed_critical_pair
+        owners = seed_critical_pair.owners
+        number_of_seeds = len(seed_critical_pair.seed_points)
+
+        # Seedpoints of a matched critical point reuse the status of the previous seedpoint at the closest position relative to the critical point
+        matches = get_nearest_matches(seed_critical_pair.critical_points, previous_seed_critical_pair.critical_points, tolerance)
+        previous_seeds = helpers.get_nearest_relative_points(seed_critical_pair, previous_seed_critical_pair, matches, tolerance)
+        is_reused = previous_seeds >= 0
+        reused_status = np.full(number_of_seeds, None, dtype=object)
+        reused_status[is_reused] = previous_seedpoint_info['FieldlineStatus'].to_numpy(dtype=object)[previous_seeds[is_reused]]
+
+        # Retrace the unmatched seedpoints, a sample of the reused ones and the ones next to a seedpoint with another status.
+        # The sample has at least one seedpoint of every critical point, so a change in every critical point can be found.
+        random_keys = np.random.default_rng(constants.TEMPORAL_RANDOM_SEED).random(number_of_seeds)
+        is_retraced = ~is_reused | (random_keys < sample_fraction)
+        order = np.lexsort((random_keys, owners))
+        is_first_of_owner = np.concatenate([[True], np.diff(owners[order]) != 0]) if number_of_seeds > 0 else np.empty(0, dtype=bool)
+        is_retraced[order[is_first_of_owner]] = True
+        first, second = helpers.get_neighbour_pairs(seed_critical_pair.seed_points, owners, number_of_neighbours)
+        is_boundary = is_reused[first] & is_reused[second] & (reused_status[first] != reused_status[second])
+        is_retraced[first[is_boundary]] = True
+        is_retraced[second[is_boundary]] = True
+
+        seed_status, fieldlines = self.__get_status_of_seed_subset(seed_critical_pair, is_retraced)
+        list_of_fieldlines = [fieldlines]
+
+        # Widen to a full retrace of the critical points where the status changed
+        is_changed = is_retraced & is_reused & (seed_status != reused_status)
+        is_widened = np.isin(owners, owners[is_changed]) & ~is_retraced
+        if(np.any(is_widened)):
+            widened_status, fieldlines = self.__get_status_of_seed_subset(seed_critical_pair, is_widened)
+            seed_status[is_widened] = widened_status[is_widened]
+            list_of_fieldlines.append(fieldlines)
+            is_retraced |= is_widened
+
+        seed_status[~is_retraced] = reused_status[~is_retraced]
+
+        self.seedpoints = seed_critical_pair.seed_points
+        self.seedpoint_info = self.__get_seed_point_info_from_status(seed_critical_pair, seed_status)
+        self.fieldlines = Fieldlines.concatenate(list_of_fieldlines)
+        self.retrace_fraction = np.count_nonzero(is_retraced)/number_of_seeds if number_of_seeds > 0 else 0.0
+        self.__update_number_of_invalid_seed_points(self.seedpoint_info['FieldlineStatus'].to_numpy(dtype=object), self.seed_critical_pair.owners, self.seed_critical_pair.critical_points)
+
+        logging.info(f"Matched {np.count_nonzero(matches >= 0)} of {len(matches)} critical points, {np.count_nonzero(is_changed)} retraced seedpoints changed status in {len(np.unique(owners[is_changed]))} critical points. Retraced {100*self.retrace_fraction:.1f}% of the seedpoints.")
+
+        self.number_of_mismatched_seed_points = None
+        if(verify):
+            full_status, _ = self.__get_status_of_seed_subset(seed_critical_pair, np.ones(number_of_seeds, dtype=bool))
+            self.number_of_mismatched_seed_points = int(np.count_nonzero(full_status != seed_status))
+            if(self.number_of_mismatched_seed_points > 0):
+                warnings.warn(f"{self.number_of_mismatched_seed_points} of {number_of_seeds} seedpoints have another status than in a full recomputation.")
+            else:
+                logging.info("The incremental seedpoint information is the same as a full recomputation.")
 
-        hit_earth_top = False
-        hit_earth_bottom = False
+    def __update_number_of_invalid_seed_points(self, seed_status: np.ndarray, owners: np.ndarray, critical_points: np.ndarray) -> None:
+        """Counts the seedpoints outside the domain for every critical point"""
 
-        for sx,sy,sz in streamline_points:
+        is_invalid = np.asarray(seed_status, dtype=object) == 'invalid'
+        self.number_of_invalid_seed_points = np.bincount(owners[is_invalid], minlength=len(critical_points))
 
-            if(((sx-ux)**2+(sy-uy)**2+(sz-uz)**2 <= rad**2)):
-                hit_earth_top = True
-            elif(((sx-lx)**2+(sy-ly)**2+(sz-lz)**2 <= rad**2)):
-                hit_earth_bottom = True
+        if(np.any(is_invalid)):
+            logging.info(f"{np.count_nonzero(is_invalid)} seedpoints are outside the domain and were not traced")
+            for i in np.flatnonzero(self.number_of_invalid_seed_points):
+                logging.info(f"Critical point {critical_points[i].tolist()} has {self.number_of_invalid_seed_points[i]} invalid seedpoints")
 
-        # If the x value is less than certain threshhold. Then we regard it as nightside.
-        if(critical_point[0] < constants.DAYSIDE_NIGHTSIDE_THRESHOLD):
-            result_side = EarthSide.NIGHTSIDE.value
-        else:
-            result_side = EarthSide.DAYSIDE.value
-
-        if(not hit_earth_top and not hit_earth_bottom):
-            result_status = FieldlineStatus.IMF.value
-        elif(hit_earth_top and hit_earth_bottom):
-            result_status = FieldlineStatus.CLOSED.value
-        elif(hit_earth_top and not hit_earth_bottom):
-            result_status = FieldlineStatus.OPEN_NORTH.value
-        elif(not hit_earth_top and hit_earth_bottom):
-            result_status = FieldlineStatus.OPEN_SOUTH.value
-        else:
-            logging.info('SOMETHING WRONG HAPPENED')
-            raise ValueError()
+    def __get_seed_point_info(self, seed_critical_pair: SeedCriticalPair) -> Tuple[pd.DataFrame, Fieldlines]:
+        """Returns a dataframe with the status, side and critical point of every seedpoint in seed_critical_pair, and the traced fieldlines"""
 
-        return (result_side, result_status)
+        seed_status, fieldlines = self.__get_status_of_seed_subset(seed_critical_pair, np.ones(len(seed_critical_pair.seed_points), dtype=bool))
+        return self.__get_seed_point_info_from_status(seed_critical_pair, seed_status), fieldlines
 
-    def visualize(self, side:Optional[EarthSide] = None, status:Optional[FieldlineStatus] = None) -> None:
-        """Visualize the streamlines and starts the rendering"""
-        self.list_of_actors.clear()
+    def __get_status_of_seed_subset(self, seed_critical_pair: SeedCriticalPair, is_selected: np.ndarray) -> Tuple[np.ndarray, Fieldlines]:
+        """Traces the selected seedpoints of seed_critical_pair and returns the status of every seedpoint, None if it isn't selected, and the traced fieldlines"""
 
-        df = self.seedpoint_info
-        
-        # If we want a specific side or status
-        if(side and status):
-            df_side_status = df.loc[(df['EarthSide'] == side) & (df['FieldlineStatus'] == status)]
-            actor = self.__get_streamline_actor_from_dataframe(df_side_status)
-            self.list_of_actors.append(actor)
-            
-        elif(side and not status):
-            df_side = df.loc[(df['EarthSide'] == side)]
-            actor = self.__get_streamline_actor_from_dataframe(df_side)
-            self.list_of_actors.append(actor)
-        
-        elif(not side and status):
-            df_status = df.loc[(df['FieldlineStatus'] == status)]
-            actor = self.__get_streamline_actor_from_dataframe(df_status)
-            self.list_of_actors.append(actor)
-        else:
-            all_status = [FieldlineStatus.IMF.value,FieldlineStatus.CLOSED.value, FieldlineStatus.OPEN_NORTH.value, FieldlineStatus.OPEN_SOUTH.value]
-            #colors = [(0,0,0),(0,0,1),(1,1,1),(1,1,1)]
-            colors = [(200/255,200/255,200/255),(200/255,200/255,200/255),(200/255,200/255,200/255),(200/255,200/255,200/255)]
+        seedpoints = seed_critical_pair.seed_points
 
-            for color, status in zip(colors, all_status):
-                df_status = df.loc[(df['FieldlineStatus'] == status)]
-                actor = self.__get_streamline_actor_from_dataframe(df_status, color)
-                self.list_of_actors.append(actor)       
+        # All seeds are traced by one stream tracer, every seed is still integrated independently.
+        # Seeds that were thinned out share the status of their representative.
+        traced_indices = np.intersect1d(seed_critical_pair.get_traced_seed_indices(), seed_critical_pair.representatives[is_selected])
+        seed_status = np.full(len(seedpoints), None, dtype=object)
+        traced_status, fieldlines = self.__get_status_of_seed_points(seedpoints[traced_indices])
+        seed_status[traced_indices] = traced_status
+        fieldlines.seed_ids = traced_indices[fieldlines.seed_ids]
+        seed_status = np.where(is_selected, seed_status[seed_critical_pair.representatives], None)
 
-        earth = get_sphere_actor(radius=3, center=(0,0,0), opacity=0.4)
-        upperbound = get_sphere_actor(radius=0.5, center=(0,0,1), color=(1,1,1))
-        lowerbound = get_sphere_actor(radius=0.5, center=(0,0,-1), color=(1,1,1))
+        number_of_selected = np.count_nonzero(is_selected)
+        if(len(traced_indices) < number_of_selected):
+            logging.info(f"Traced {len(traced_indices)} of {number_of_selected} seedpoints, {number_of_selected-len(traced_indices)} share the status of a traced seedpoint.")
 
-        self.list_of_actors.append(earth) 
-        self.list_of_actors.append(upperbound)
-        self.list_of_actors.append(lowerbound)
+        return seed_status, fieldlines
 
+    def __get_seed_point_info_from_status(self, seed_critical_pair: SeedCriticalPair, seed_status: np.ndarray) -> pd.DataFrame:
+        """Returns a dataframe with the status, side and critical point of every seedpoint in seed_critical_pair"""
 
-        start_window(self.list_of_actors)
+        seedpoints = seed_critical_pair.seed_points
+        owners = seed_critical_pair.owners
+        seed_status = np.asarray(seed_status, dtype=object)
+
+        seed_side = self.__get_side_of_critical_points(seed_critical_pair.critical_points)[owners]
+        critical_point_location = list(seed_critical_pair.critical_points[owners])
 
+        is_null = np.isin(seed_status, _UNCLASSIFIED_STATUS)
+        seed_side[is_null] = 'null'
+        for i in np.flatnonzero(is_null):
+            critical_point_location[i] = 'null'
+        logging.debug(f"{np.count_nonzero(seed_status == 'null')} seedpoints have streamlines of length zero")
 
-    def __get_streamline_actor_from_dataframe(self, df:pd.DataFrame, color: Tuple[float,float,float]=(1,1,1)) -> vtkActor:
+        info = pd.DataFrame({
+            'X': seedpoints[:, 0],
+            'Y': seedpoints[:, 1],
+            'Z': seedpoints[:, 2],
+            'EarthSide': seed_side,
+            'FieldlineStatus': seed_status,
+            'CriticalPoint': critical_point_location
+        })
+        return info
 
-        seedpos = list(zip(df['X'],df['Y'],df['Z']))
+    def refine_seed_points(self, tolerance:float = constants.REFINEMENT_TOLERANCE, number_of_neighbours:int = constants.REFINEMENT_NEIGHBOURS, max_iterations:int = constants.REFINEMENT_MAX_ITERATIONS) -> None:
+        """
+        Adds seedpoints on the boundaries between different FieldlineStatus, i.e. close to the separatrices.
+        Neighbouring seedpoints of the same critical point with different status are bisected until they are closer than the tolerance.
+        Only the midpoints are traced. The end points of the refined pairs that were replaced by a midpoint are added once to the seedpoint info, with their fieldlines.
+        The thinning of seed_critical_pair is kept, every added seedpoint is its own representative.
+        Run update_seed_point_info() first, a coarse template is usually enough.
+        :tolerance: Distance between the two seedpoints of a pair when the bisection stops
+        :number_of_neighbours: Number of closest seedpoints of the same critical point that are regarded as neighbours
+        :max_iterations: Maximum number of bisections of every pair
+        """
+        if(len(self.seedpoint_info) == 0):
+            raise ValueError("Seedpoint info is empty.. Run update_seed_point_info() first")
+        if(len(self.seedpoint_info) != len(self.seed_critical_pair.seed_points)):
+            raise ValueError("Seedpoint info doesn't have one row per seedpoint of seed_critical_pair.. Run update_seed_point_info() again after filtering")
+
+        # Rows of the seedpoint info and fieldline seed ids are positions in seed_critical_pair
+        info = self.seedpoint_info.reset_index(drop=True)
+        seedpoints = info[['X', 'Y', 'Z']].to_numpy(dtype=float)
+        status = info['FieldlineStatus'].to_numpy(dtype=object)
+        owners = self.seed_critical_pair.owners
+
+        # Pairs of neighbouring seedpoints that ended up with different status
+        first, second = helpers.get_neighbour_pairs(seedpoints, owners, number_of_neighbours)
+        is_boundary = (status[first] != status[second]) & ~np.isin(status[first], _UNCLASSIFIED_STATUS) & ~np.isin(status[second], _UNCLASSIFIED_STATUS)
+        first, second = first[is_boundary], second[is_boundary]
+
+        point_a, point_b = seedpoints[first], seedpoints[second]
+        status_a, status_b = status[first], status[second]
+        pair_owners = owners[first]
+
+        # Id of the midpoint that replaced every end point, -1 while it is the original seedpoint
+        midpoint_a, midpoint_b = np.full(len(first), -1, dtype=np.int64), np.full(len(first), -1, dtype=np.int64)
+        list_of_midpoints, list_of_midpoint_status, list_of_midpoint_owners, list_of_fieldlines = [], [], [], []
+        list_of_refined_ids = []
+        number_of_traces = 0
+
+        for _ in range(max_iterations):
+            is_active = np.linalg.norm(point_a-point_b, axis=1) > tolerance
+            if(not np.any(is_active)):
+                break
+
+            midpoints = (point_a[is_active]+point_b[is_active])/2
+            midpoint_status, fieldlines = self.__get_status_of_seed_points(midpoints)
+            midpoint_ids = number_of_traces + np.arange(len(midpoints))
+            fieldlines.seed_ids = midpoint_ids[fieldlines.seed_ids]
+            list_of_midpoints.append(midpoints)
+            list_of_midpoint_status.append(midpoint_status)
+            list_of_midpoint_owners.append(pair_owners[is_active])
+            list_of_fieldlines.append(fieldlines)
+            number_of_traces += len(midpoints)
+
+            # Midpoints without a streamline can't be classified, stop refining those pairs and keep their end points
+            is_unclassified = np.isin(midpoint_status, _UNCLASSIFIED_STATUS)
+            is_stopped = np.zeros(len(point_a), dtype=bool)
+            is_stopped[np.flatnonzero(is_active)[is_unclassified]] = True
+            list_of_refined_ids += [midpoint_a[is_stopped], midpoint_b[is_stopped]]
+
+            # Move the end point that has the same status as the midpoint. If the midpoint has a third status the pair is kept on the (a, midpoint) side.
+            replace_a = np.zeros(len(point_a), dtype=bool)
+            replace_b = np.zeros(len(point_a), dtype=bool)
+            replace_a[is_active] = (midpoint_status == status_a[is_active]) & ~is_unclassified
+            replace_b[is_active] = (midpoint_status != status_a[is_active]) & ~is_unclassified
+            midpoint_index = np.zeros(len(point_a), dtype=np.int64)
+            midpoint_index[is_active] = np.arange(len(midpoints))
+
+            point_a[replace_a], status_a[replace_a], midpoint_a[replace_a] = midpoints[midpoint_index[replace_a]], midpoint_status[midpoint_index[replace_a]], midpoint_ids[midpoint_index[replace_a]]
+            point_b[replace_b], status_b[replace_b], midpoint_b[replace_b] = midpoints[midpoint_index[replace_b]], midpoint_status[midpoint_index[replace_b]], midpoint_ids[midpoint_index[replace_b]]
+
+            is_kept = ~is_stopped
+            point_a, point_b, status_a, status_b, pair_owners = point_a[is_kept], point_b[is_kept], status_a[is_kept], status_b[is_kept], pair_owners[is_kept]
+            midpoint_a, midpoint_b = midpoint_a[is_kept], midpoint_b[is_kept]
+
+        # Only end points that were replaced by a midpoint are new seedpoints, the others are already in the seedpoint info
+        refined_ids = np.concatenate(list_of_refined_ids + [midpoint_a, midpoint_b])
+        refined_ids = np.unique(refined_ids[refined_ids >= 0])
+
+        if(number_of_traces > 0):
+            all_midpoints = np.concatenate(list_of_midpoints)
+            all_midpoint_status = np.concatenate(list_of_midpoint_status)
+            all_midpoint_owners = np.concatenate(list_of_midpoint_owners)
+        else:
+            all_midpoints, all_midpoint_status, all_midpoint_owners = np.empty((0, 3)), np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
+
+        # Pairs that share a seedpoint can end up at the same midpoint
+        _, is_first = np.unique(all_midpoints[refined_ids], axis=0, return_index=True)
+        refined_ids = refined_ids[np.sort(is_first)]
+
+        refined_points = all_midpoints[refined_ids]
+        refined_owners = all_midpoint_owners[refined_ids]
+        critical_points = self.seed_critical_pair.critical_points
+
+        refined_info = pd.DataFrame({
+            'X': refined_points[:, 0],
+            'Y': refined_points[:, 1],
+            'Z': refined_points[:, 2],
+            'EarthSide': self.__get_side_of_critical_points(critical_points)[refined_owners],
+            'FieldlineStatus': all_midpoint_status[refined_ids],
+            'CriticalPoint': list(critical_points[refined_owners])
+        })
+
+        # Keep the seedpoint info grouped by critical point so that it stays aligned with seed_critical_pair
+        number_of_seeds = len(info)
+        all_owners = np.concatenate([owners, refined_owners])
+        order = np.argsort(all_owners, kind='stable')
+        new_rows = np.argsort(order)
+        self.seedpoint_info = pd.concat([info, refined_info], ignore_index=True).iloc[order].reset_index(drop=True)
+
+        # Move the fieldlines of the old rows and of the added midpoints to the new rows
+        midpoint_rows = np.full(number_of_traces, -1, dtype=np.int64)
+        midpoint_rows[refined_ids] = number_of_seeds + np.arange(len(refined_ids))
+        midpoint_fieldlines = Fieldlines.concatenate(list_of_fieldlines)
+        midpoint_fieldlines = midpoint_fieldlines.select(midpoint_rows[midpoint_fieldlines.seed_ids] >= 0)
+        midpoint_fieldlines.seed_ids = midpoint_rows[midpoint_fieldlines.seed_ids]
+        self.fieldlines = Fieldlines.concatenate([self.fieldlines, midpoint_fieldlines])
+        self.fieldlines.seed_ids = new_rows[self.fieldlines.seed_ids]
+
+        # The thinned seedpoints keep their representative, the added ones are traced themselves
+        representatives = np.concatenate([self.seed_critical_pair.representatives, number_of_seeds + np.arange(len(refined_ids))])
+        self.seedpoints = self.seedpoint_info[['X', 'Y', 'Z']].to_numpy(dtype=float)
+        self.seed_critical_pair = SeedCriticalPair(self.seedpoints, all_owners[order], critical_points)
+        self.seed_critical_pair.representatives = new_rows[representatives[order]]
+
+        logging.info(f"Refined {len(first)} seedpoint pairs across status boundaries using {number_of_traces} traces, added {len(refined_ids)} seedpoints.")
+
+    def __get_stream_tracer(self, seedpoints: np.ndarray) -> vtkStreamTracer:
+        """Returns an updated stream tracer that traces all given seedpoints"""
 
         seeds = vtkPoints()
-        for i, seed in enumerate(seedpos):
-            seeds.InsertNextPoint(seed)
-                
+        seeds.SetData(numpy_to_vtk(np.ascontiguousarray(seedpoints, dtype=float).reshape(-1, 3), deep=True))
+
         poly = vtkPolyData()
         poly.SetPoints(seeds)
 
         streamline = vtkStreamTracer()
         streamline.SetInputData(self.vectorfield)
         streamline.SetSourceData(poly)
-        streamline.SetMaximumPropagation(300)
-        streamline.SetInitialIntegrationStep(.2)
+        streamline.SetMaximumPropagation(constants.MAXIMUM_PROPAGATION)
+        streamline.SetInitialIntegrationStep(constants.INITIAL_INTEGRATION_STEP)
         streamline.SetIntegrationDirectionToBoth()
         streamline.SetInterpolatorTypeToCellLocator()
         streamline.SetIntegratorTypeToRungeKutta4()
-        streamline.SetMaximumError(1e-06)
-        streamline.SetTerminalSpeed(1e-12)
-        streamline.SetMaximumNumberOfSteps(2000)
-        streamline.SetIntegrationStepUnit(2)
+        streamline.SetMaximumError(constants.MAXIMUM_ERROR)
+        streamline.SetTerminalSpeed(constants.TERMINAL_SPEED)
+        streamline.SetMaximumNumberOfSteps(constants.MAXIMUM_NUMBER_OF_STEPS)
+        streamline.SetIntegrationStepUnit(constants.INTEGRATION_STEP_UNIT)
         streamline.Update()
 
-        streamline_mapper = vtkPolyDataMapper()
-        streamline_mapper.SetInputConnection(streamline.GetOutputPort())
-        streamline_actor = vtkActor()
-        streamline_actor.SetMapper(streamline_mapper)
-        streamline_actor.VisibilityOn()
-        streamline_actor.GetProperty().SetColor(color)
-        return streamline_actor
+        return streamline
 
-    def __split_dataframe(self, chunk_size = 10000): 
+    def __get_valid_seed_point_mask(self, seedpoints: np.ndarray) -> np.ndarray:
+        """Returns True for the seedpoints that are inside a cell of the vectorfield"""
 
-        df = self.seedpoint_info
-        chunks = list()
-        num_chunks = len(df) // chunk_size + 1
-        for i in range(num_chunks):
-            chunks.append(df[i*chunk_size:(i+1)*chunk_size])
-        return chunks
+        x_min, x_max, y_min, y_max, z_min, z_max = self.vectorfield.GetBounds()
+        is_valid = np.all((seedpoints >= (x_min, y_min, z_min)) & (seedpoints <= (x_max, y_max, z_max)), axis=1)
 
-    def openspace_seeding(self, z_spacing=0, p=0, filename='seedpoints_openspace.txt') -> None:  
+        if(not np.any(is_valid)):
+            return is_valid
 
-        #Get pairs of 4
-        seedgroups = self.__split_dataframe(5)
-        indices_without_one_of_each = []
+        # The bounding box doesn't cover holes in the grid, so locate the remaining seedpoints in the cells
+        points = vtkPoints()
+        points.SetData(numpy_to_vtk(np.ascontiguousarray(seedpoints[is_valid], dtype=float), deep=True))
+        poly = vtkPolyData()
+        poly.SetPoints(points)
 
-        final_seed_groups = []
-        for index, seedgroup in enumerate(seedgroups):
-            seedgroup = seedgroup.drop_duplicates(subset='FieldlineStatus')
+        probe = vtkProbeFilter()
+        probe.SetInputData(poly)
+        probe.SetSourceData(self.vectorfield)
+        probe.SetCellLocatorPrototype(vtkStaticCellLocator())
+        probe.Update()
 
-            if(len(seedgroup) != 4):
-                indices_without_one_of_each.append(index)
-            else:
-                seedgroup = seedgroup.sort_values("FieldlineStatus")
-                seedgroup = seedgroup.reset_index(drop=True)
-                seedgroup = seedgroup.reindex([1, 0, 2, 3])
-                final_seed_groups.append(seedgroup)
+        is_valid[is_valid] = vtk_to_numpy(probe.GetOutput().GetPointData().GetArray(probe.GetValidPointMaskArrayName())).astype(bool)
+        return is_valid
+
+    def __get_status_of_seed_points(self, seedpoints: np.ndarray) -> Tuple[np.ndarray, Fieldlines]:
+        """
+        Traces the seedpoints and returns the FieldlineStatus of every seedpoint, 'null' if the streamline is empty, and the traced fieldlines.
+        Seedpoints outside the domain are not traced and get the status 'invalid'.
+        """
+
+        number_of_seeds = len(seedpoints)
+        if(number_of_seeds == 0):
+            return np.empty(0, dtype=object), Fieldlines.empty()
+
+        # Seedpoints outside the domain would only give empty streamlines, so they are never traced
+        is_valid = self.__get_valid_seed_point_mask(seedpoints)
+        valid_indices = np.flatnonzero(is_valid)
 
+        hit_earth_top = np.zeros(number_of_seeds, dtype=bool)
+        hit_earth_bottom = np.zeros(number_of_seeds, dtype=bool)
+        is_traced = np.zeros(number_of_seeds, dtype=bool)
 
-        df_final = pd.concat(final_seed_groups)
-        data = list(zip(df_final['X'].tolist(),df_final['Y'].tolist(),df_final['Z'].tolist()))
+        output = self.__get_stream_tracer(seedpoints[valid_indices]).GetOutput() if len(valid_indices) > 0 else vtkPolyData()
+        fieldlines = Fieldlines.from_streamlines(output, valid_indices)
+        if(output.GetNumberOfCells() > 0):
+            streamline_points, point_seed_ids = helpers.get_streamline_points_and_seed_ids(output)
+            point_seed_ids = valid_indices[point_seed_ids]
 
-        # Increase z-axis
-        res = []
-        curr_ind = 0
+            is_top = np.sum((streamline_points-constants.UPPERBOUND)**2, axis=1) <= constants.BOUND_RADIUS**2
+            is_bottom = np.sum((streamline_points-constants.LOWERBOUND)**2, axis=1) <= constants.BOUND_RADIUS**2
 
-        for ind, (x,y,z) in enumerate(data):
-            
-            if(curr_ind == 4):
-                curr_ind = 0
+            is_traced[point_seed_ids] = True
+            hit_earth_top[point_seed_ids[is_top]] = True
+            hit_earth_bottom[point_seed_ids[~is_top & is_bottom]] = True
 
-            if(ind < len(data)-1):
+        status = np.full(number_of_seeds, FieldlineStatus.IMF.value, dtype=object)
+        status[hit_earth_top & hit_earth_bottom] = FieldlineStatus.CLOSED.value
+        status[hit_earth_top & ~hit_earth_bottom] = FieldlineStatus.OPEN_NORTH.value
+        status[~hit_earth_top & hit_earth_bottom] = FieldlineStatus.OPEN_SOUTH.value
+        status[~is_traced] = 'null'
+        status[~is_valid] = 'invalid'
 
-                if(curr_ind == 2):
-                    if(z < data[ind+1][2]):
-                        z_down = z-z_spacing
-                        z_up = data[ind+1][2]+z_spacing
-                    else:
-                        z_up = z+z_spacing
-                        z_down = data[ind+1][2]-z_spacing
+        return status, fieldlines
 
-                    res.append([x-(x*p),y-(y*p),z_up])
-                    res.append([x-(x*p),y-(y*p),z_down])
+    def __get_side_of_critical_points(self, critical_points: np.ndarray) -> np.ndarray:
+        """Returns the EarthSide of every critical point"""
 
-                elif(curr_ind == 0 or curr_ind == 1):
-                    res.append([x,y,z])
+        # If the x value is less than certain threshhold. Then we regard it as nightside.
+        is_nightside = np.asarray(critical_points, dtype=float).reshape(-1, 3)[:, 0] < constants.DAYSIDE_NIGHTSIDE_THRESHOLD
+        return np.where(is_nightside, EarthSide.NIGHTSIDE.value, EarthSide.DAYSIDE.value).astype(object)
 
-                curr_ind +=1
-            
-        np.savetxt(filename, res)
+    def visualize(self, side:Optional[EarthSide] = None, status:Optional[FieldlineStatus] = None) -> None:
+        """Visualize the streamlines and starts the rendering. Does nothing in headless mode."""
+        self.list_of_actors.clear()
+        if(is_headless()):
+            return
+
+        self.list_of_actors.append(self.get_fieldlines_actor(side, status))
+        self.list_of_actors.extend(self.__get_earth_actors())
+
+        start_window(self.list_of_actors)
+
+    def get_fieldlines_polydata(self) -> vtkPolyData:
+        """
+        Returns the fieldlines of the seedpoints in seedpoint_info as one vtkPolyData.
+        The cell data has the 'FieldlineStatus' and 'EarthSide' as indices in the enums, and the 'CriticalPointId' of every fieldline.
+        """
+        if(len(self.fieldlines) == 0 and len(self.seedpoint_info) > 0):
+            # The seedpoints have not been traced by this processor, trace them now
+            output = self.__get_stream_tracer(self.seedpoint_info[['X', 'Y', 'Z']].to_numpy(dtype=float)).GetOutput()
+            self.fieldlines = Fieldlines.from_streamlines(output, self.seedpoint_info.index.to_numpy())
+
+        fieldlines = self.fieldlines.select_seed_ids(self.seedpoint_info.index.to_numpy())
+        poly = fieldlines.to_polydata()
+
+        info = self.seedpoint_info.loc[fieldlines.seed_ids]
+        status = helpers.get_enum_indices(info['FieldlineStatus'].to_numpy(), FieldlineStatus)
+        side = helpers.get_enum_indices(info['EarthSide'].to_numpy(), EarthSide)
+        critical_point_ids = self.seed_critical_pair.owners[fieldlines.seed_ids] if self.seed_critical_pair is not None else np.full(len(fieldlines), -1)
+
+        for name, values in [('FieldlineStatus', status), ('EarthSide', side), ('CriticalPointId', critical_point_ids)]:
+            array = numpy_to_vtk(np.asarray(values, dtype=np.int64), deep=True)
+            array.SetName(name)
+            poly.GetCellData().AddArray(array)
+
+        return poly
+
+    def get_fieldlines_actor(self, side:Optional[EarthSide] = None, status:Optional[FieldlineStatus] = None) -> 'vtkActor':
+        """
+        Returns one actor with all fieldlines, colored by FieldlineStatus with FIELDLINE_STATUS_COLORS.
+        The side and status filters are thresholds on the cell data, the geometry is not rebuilt.
+        :side: Only show this side (optional)
+        :status: Only show this status (optional)
+        """
+        filtered = vtkPassThrough()
+        filtered.SetInputData(self.get_fieldlines_polydata())
+
+        for name, value, enum in [('EarthSide', side, EarthSide), ('FieldlineStatus', status, FieldlineStatus)]:
+            if(value):
+                index = helpers.get_enum_indices([value], enum)[0]
+                threshold = vtkThreshold()
+                threshold.SetInputConnection(filtered.GetOutputPort())
+                threshold.SetInputArrayToProcess(0, 0, 0, vtkDataObject.FIELD_ASSOCIATION_CELLS, name)
+                threshold.SetLowerThreshold(index)
+                threshold.SetUpperThreshold(index)
+                threshold.SetThresholdFunction(vtkThreshold.THRESHOLD_BETWEEN)
+                filtered = threshold
+
+        return self.__get_fieldlines_actor_from_algorithm(filtered)
+
+    def add_to_viewer(self, viewer: 'ViewerSession') -> None:
+        """
+        Adds the fieldlines to a ViewerSession as one layer per FieldlineStatus, and Earth and the bounds as the layer 'earth'.
+        The fieldlines are traced at most once. The 'earth_side' threshold filters every fieldline layer, and the keys in
+        FIELDLINE_STATUS_KEYS, EARTH_SIDE_KEYS and EARTH_LAYER_KEY toggle the layers and switch the side.
+        :viewer: The ViewerSession
+        """
+        side_threshold = viewer.add_threshold('earth_side', self.get_fieldlines_polydata(), 'EarthSide', (0, len(EarthSide)-1))
+
+        for index, fieldline_status in enumerate(FieldlineStatus):
+            name = f"fieldlines_{fieldline_status.value.lower()}"
+            status_threshold = viewer.add_threshold(name, side_threshold, 'FieldlineStatus', (index, index))
+            viewer.add_layer(name, self.__get_fieldlines_actor_from_algorithm(status_threshold), key=constants.FIELDLINE_STATUS_KEYS[fieldline_status.value])
+
+        viewer.add_layer('earth', self.__get_earth_actors(), key=constants.EARTH_LAYER_KEY)
+
+        for side, key in constants.EARTH_SIDE_KEYS.items():
+            side_range = (0, len(EarthSide)-1) if side is None else (helpers.get_enum_indices([side], EarthSide)[0],)*2
+            viewer.bind_key(key, lambda side_range=side_range: viewer.set_threshold_range('earth_side', *side_range), f"Show {side or 'both sides'}")
+
+    def __get_fieldlines_actor_from_algorithm(self, algorithm: 'vtkAlgorithm') -> 'vtkActor':
+        """Returns the actor of the fieldlines in the output of the algorithm, colored by FieldlineStatus"""
+        rendering = load_rendering_modules()
+
+        lookup_table = vtkLookupTable()
+        lookup_table.SetNumberOfTableValues(len(FieldlineStatus))
+        for index, fieldline_status in enumerate(FieldlineStatus):
+            lookup_table.SetTableValue(index, *constants.FIELDLINE_STATUS_COLORS[fieldline_status.value], 1)
+        lookup_table.Build()
+
+        streamline_mapper = rendering.vtkDataSetMapper()
+        streamline_mapper.SetInputConnection(algorithm.GetOutputPort())
+        streamline_mapper.SetScalarModeToUseCellFieldData()
+        streamline_mapper.SelectColorArray('FieldlineStatus')
+        streamline_mapper.SetLookupTable(lookup_table)
+        streamline_mapper.SetScalarRange(0, len(FieldlineStatus)-1)
+        streamline_mapper.ScalarVisibilityOn()
+
+        streamline_actor = rendering.vtkActor()
+        streamline_actor.SetMapper(streamline_mapper)
+        streamline_actor.VisibilityOn()
+        return streamline_actor
+
+    def __get_earth_actors(self) -> List['vtkActor']:
+        """Returns the actors of Earth and the upper and lower bounds"""
+        earth = get_sphere_actor(radius=3, center=(0,0,0), opacity=0.4)
+        upperbound = get_sphere_actor(radius=constants.BOUND_RADIUS, center=constants.UPPERBOUND, color=(1,1,1))
+        lowerbound = get_sphere_actor(radius=constants.BOUND_RADIUS, center=constants.LOWERBOUND, color=(1,1,1))
+
+        return [earth, upperbound, lowerbound]
+
+    def openspace_seeding(self, z_spacing=0, p=0, filename='seedpoints_openspace.txt') -> None:
+        """
+        Saves seedpoints for OpenSpace. The seedpoints are taken in groups of 5 rows, and only groups with exactly 4 different FieldlineStatus are used.
+        Every group gives the first two seedpoints in status order, and the third one moved to above and below the fourth.
+        :z_spacing: Extra distance added above and below
+        :p: Fraction that x and y of the moved seedpoints are pulled towards the origin
+        :filename: Output filename. A '.npy' extension saves a binary file.
+        """
+
+        # Integer group id of every row and the status code, codes are in the sort order of the status.
+        # A missing status, e.g. 'null' read back from a csv file, is its own status and sorts last like in sort_values().
+        status_code, status_names = pd.factorize(self.seedpoint_info['FieldlineStatus'], sort=True)
+        status_code[status_code < 0] = len(status_names)
+        number_of_codes = len(status_names)+1
+        seedpoints = self.seedpoint_info[['X', 'Y', 'Z']].to_numpy(dtype=float)
+        group = np.arange(len(status_code)) // constants.OPENSPACE_GROUP_SIZE
+
+        # First row of every status in every group, sorted by group and then status
+        _, first_rows = np.unique(group*number_of_codes+status_code, return_index=True)
+        number_of_statuses = np.bincount(group[first_rows], minlength=group[-1]+1 if len(group) > 0 else 0)
+        first_rows = first_rows[number_of_statuses[group[first_rows]] == 4]
+
+        groups = seedpoints[first_rows].reshape(-1, 4, 3)[:, [1, 0, 2, 3]]
+        if(len(groups) == 0):
+            warnings.warn("No group of seedpoints has 4 different FieldlineStatus..")
+
+        moved = groups[:, 2].copy()
+        moved[:, :2] -= moved[:, :2]*p
+        z_up, z_down = moved.copy(), moved.copy()
+        z_up[:, 2] = np.maximum(groups[:, 2, 2], groups[:, 3, 2]) + z_spacing
+        z_down[:, 2] = np.minimum(groups[:, 2, 2], groups[:, 3, 2]) - z_spacing
+
+        res = np.stack([groups[:, 0], groups[:, 1], z_up, z_down], axis=1).reshape(-1, 3)
+
+        if(filename.endswith('.npy')):
+            np.save(filename, res)
+        else:
+            np.savetxt(filename, res)
         logging.info(f'Saved openspace seedpoints to: "{filename}"')
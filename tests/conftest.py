@@ -0,0 +1,92 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The packages are imported from the repository root, like in main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vtkmodules.vtkCommonDataModel import vtkImageData, vtkUnstructuredGrid
+from vtkmodules.vtkFiltersCore import vtkAppendFilter
+from vtkmodules.vtkIOXML import vtkXMLUnstructuredGridWriter
+from vtkmodules.util.numpy_support import numpy_to_vtk
+
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+from vectorfieldtopology.vectorfieldtopology import VectorFieldTopology
+
+
+def get_dipole_grid(n: int = 21, spacing: float = 1.5, imf: float = -5.0) -> vtkUnstructuredGrid:
+    """Returns a dipole magnetic field with a southward IMF, with the same arrays as the simulation files
+    :n: Number of grid points along every axis
+    :spacing: Distance between the grid points
+    :imf: Constant B_z [nT] added to the dipole
+    """
+    image = vtkImageData()
+    image.SetDimensions(n, n, n)
+    image.SetOrigin(*3*[-(n-1)/2*spacing])
+    image.SetSpacing(spacing, spacing, spacing)
+
+    axis = image.GetOrigin()[0] + spacing*np.arange(n)
+    z, y, x = np.meshgrid(axis, axis, axis, indexing='ij')
+    points = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1)
+    r = np.maximum(np.linalg.norm(points, axis=1), 1.0)[:, None]
+
+    moment = np.array([0., 0., -3e4])
+    magnetic_field = 3*points*(points @ moment)[:, None]/r**5 - moment/r**3
+    magnetic_field[:, 2] += imf
+
+    arrays = {'B_x [nT]': magnetic_field[:, 0], 'B_y [nT]': magnetic_field[:, 1], 'B_z [nT]': magnetic_field[:, 2], 'P [nPa]': np.exp(-r[:, 0]/10)}
+    for name, values in arrays.items():
+        array = numpy_to_vtk(np.ascontiguousarray(values), deep=True)
+        array.SetName(name)
+        image.GetPointData().AddArray(array)
+
+    append = vtkAppendFilter()
+    append.AddInputData(image)
+    append.Update()
+    grid = vtkUnstructuredGrid()
+    grid.ShallowCopy(append.GetOutput())
+    return grid
+
+
+def write_dipole_grid(filename: str, imf: float = -5.0) -> str:
+    """Writes the dipole field to a .vtu file, which VectorFieldTopology.read_file() reads like a simulation file. Returns the filename."""
+    writer = vtkXMLUnstructuredGridWriter()
+    writer.SetFileName(filename)
+    writer.SetInputData(get_dipole_grid(imf=imf))
+    writer.Write()
+    return filename
+
+
+def get_dipole_topology(imf: float = -5.0) -> VectorFieldTopology:
+    """Returns the topology of the dipole field, without the critical points close to the earth"""
+    vft = VectorFieldTopology()
+    vft.data_object.ShallowCopy(get_dipole_grid(imf=imf))
+    vft.update_vectorfield_from_scalars('B_x [nT]', 'B_y [nT]', 'B_z [nT]')
+    vft.update_topology_object()
+    vft.update_critical_points()
+    vft.remove_critical_points_in_sphere(radius=3, center=(0, 0, 0))
+    return vft
+
+
+@pytest.fixture(scope='session')
+def dipole_topology() -> VectorFieldTopology:
+    """Topology of the dipole field, shared by all tests. Tests must not modify it."""
+    return get_dipole_topology()
+
+
+@pytest.fixture(scope='session')
+def traced_seedpoint_processor(dipole_topology) -> SeedpointProcessor:
+    """SeedpointProcessor with the traced spherical template seedpoints of the dipole field. Tests must not modify it."""
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+    sp_generator.set_template(Template.SPHERICAL)
+    sp_generator.update_seed_points()
+
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_seed_critical_pair(sp_generator.seed_critical_pair)
+    sp_processor.set_vector_field_domain(dipole_topology.vectorfield)
+    sp_processor.update_seed_point_info()
+    return sp_processor
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from conftest import write_dipole_grid
+from pipeline import batch, constants
+from pipeline.helpers import get_merged_parameters
+
+
+@pytest.fixture(scope='module')
+def timestep_files(tmp_path_factory):
+    """Two timesteps of the dipole field with a slightly different IMF, and a file that can't be read"""
+    directory = tmp_path_factory.mktemp('data')
+    filenames = [write_dipole_grid(str(directory / f'dipole_{i}.vtu'), imf=imf) for i, imf in enumerate([-5.0, -5.01])]
+    (directory / 'dipole_2.vtu').write_text("not a vtu file")
+    return filenames + [str(directory / 'dipole_2.vtu')]
+
+
+def get_parameters():
+    return get_merged_parameters(constants.PARAMETERS, {'read': {'rename_xyz': False}})
+
+
+@pytest.mark.parametrize('number_of_chunks', [1, 2, 3, 10])
+def test_get_chunks(number_of_chunks):
+    """The files are split into contiguous ranges whose sizes differ by at most one"""
+    filenames = [f'{i}.dat' for i in range(7)]
+
+    chunks = batch.get_chunks(filenames, number_of_chunks)
+
+    assert sum(chunks, []) == filenames
+    assert len(chunks) == min(number_of_chunks, 7)
+    assert max(map(len, chunks)) - min(map(len, chunks)) <= 1
+
+
+def test_run_batch(tmp_path, timestep_files):
+    """Every timestep is processed in the pool and saved in its own directory. A broken file fails only its own timestep."""
+    output_directory = str(tmp_path / 'results')
+
+    summary_table = batch.run_batch(timestep_files, get_parameters(), output_directory, str(tmp_path / 'cache'), workers=2)
+
+    assert list(summary_table['timestep']) == ['dipole_0', 'dipole_1', 'dipole_2']
+    assert list(summary_table['status']) == ['done', 'done', 'failed']
+    assert summary_table['number_of_critical_points'][0] > 0
+    assert os.path.isfile(os.path.join(output_directory, 'dipole_0', 'seed_points', 'seedpoint_status.csv'))
+    saved_table = pd.read_csv(os.path.join(output_directory, constants.BATCH_SUMMARY_FILENAME))
+    pd.testing.assert_frame_equal(saved_table[['timestep', 'status', 'number_of_seed_points']], summary_table[['timestep', 'status', 'number_of_seed_points']], check_dtype=False)
+
+
+def test_main_incremental_with_tracks(tmp_path, timestep_files):
+    """The command line runs the incremental trace on consecutive timesteps, seeding only around the tracked critical points.
+    The disc template has enough seedpoints per critical point for the incremental trace to skip some of them."""
+    output_directory = str(tmp_path / 'results')
+    parameters_filename = str(tmp_path / 'parameters.json')
+    with open(parameters_filename, 'w') as file:
+        json.dump({'read': {'rename_xyz': False}, 'seed': {'template': 'TRIPPLE_EIGEN_PLANE'}}, file)
+
+    batch.main(timestep_files[:2] + ['--parameters', parameters_filename, '--output-directory', output_directory, '--cache-directory', str(tmp_path / 'cache'), '--workers', '1', '--incremental', '--verify', '--min-track-length', '2'])
+
+    summary_table = pd.read_csv(os.path.join(output_directory, constants.BATCH_SUMMARY_FILENAME))
+    assert list(summary_table['status']) == ['done', 'done']
+    assert summary_table['retrace_fraction'][0] == 1.0
+    assert summary_table['retrace_fraction'][1] < 1.0
+    assert summary_table['number_of_mismatched_seed_points'][1] == 0
+    assert os.path.isfile(os.path.join(output_directory, constants.BATCH_TRACK_TABLE_FILENAME))
+
+
+def test_no_matching_files_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        batch.get_filenames([str(tmp_path / '*.dat')])
@@ -0,0 +1,100 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import get_dipole_topology
+from criticalpoint_processor.tracking import CriticalPointTracker
+from pipeline.stages import filter_critical_points
+
+
+def get_info(points, types):
+    """Returns a minimal critical point info with the given positions and types"""
+    return [{'X': x, 'Y': y, 'Z': z, 'Type_text': t} for (x, y, z), t in zip(points, types)]
+
+
+def test_links_nearest_point_of_same_type():
+    tracker = CriticalPointTracker(tolerance=0.5)
+    first = tracker.add_timestep(get_info([(0, 0, 0), (5, 0, 0), (10, 0, 0)], ['SADDLE_1_3D', 'SADDLE_2_3D', 'SADDLE_1_3D']), 't0')
+    np.testing.assert_array_equal(first, [0, 1, 2])
+
+    # Shuffled and moved within the tolerance, the point near (5,0,0) changed type and a new point appears
+    second = tracker.add_timestep(get_info([(10.2, 0, 0), (5.1, 0, 0), (0.1, 0.1, 0), (20, 0, 0)], ['SADDLE_1_3D', 'SADDLE_1_3D', 'SADDLE_1_3D', 'SADDLE_2_3D']), 't1')
+    np.testing.assert_array_equal(second, [2, 3, 0, 4])
+    assert tracker.number_of_tracks == 5
+    assert tracker.get_track_lengths().to_dict() == {0: 2, 1: 1, 2: 2, 3: 1, 4: 1}
+
+
+def test_closest_pair_is_linked_first():
+    tracker = CriticalPointTracker(tolerance=1.0)
+    tracker.add_timestep(get_info([(0, 0, 0)], ['SADDLE_1_3D']))
+    # Both points are within the tolerance, only the closer one continues the track
+    track_ids = tracker.add_timestep(get_info([(0.8, 0, 0), (0.2, 0, 0)], ['SADDLE_1_3D']*2))
+    np.testing.assert_array_equal(track_ids, [1, 0])
+
+
+def test_empty_timestep_ends_tracks():
+    tracker = CriticalPointTracker(tolerance=0.5)
+    tracker.add_timestep(get_info([(0, 0, 0)], ['SADDLE_1_3D']))
+    assert len(tracker.add_timestep([])) == 0
+    np.testing.assert_array_equal(tracker.add_timestep(get_info([(0, 0, 0)], ['SADDLE_1_3D'])), [1])
+    assert tracker.timesteps == [0, 1, 2]
+
+
+def test_duplicate_timestep_raises():
+    tracker = CriticalPointTracker()
+    tracker.add_timestep([], 't0')
+    with pytest.raises(ValueError, match="already been added"):
+        tracker.add_timestep([], 't0')
+    with pytest.raises(ValueError, match="Unknown timestep"):
+        tracker.get_long_lived_indices('t1')
+
+
+def test_long_lived_indices_and_summary(tmp_path):
+    tracker = CriticalPointTracker(tolerance=0.5)
+    types = ['SADDLE_1_3D', 'SADDLE_2_3D']
+    for i, timestep in enumerate(['t0', 't1', 't2']):
+        # The second point only exists in the last timestep, the first one moves 0.1 per timestep
+        points = [(20, 0, 0), (0.1*i, 0, 0)] if i == 2 else [(0.1*i, 0, 0)]
+        tracker.add_timestep(get_info(points, types[::-1] if i == 2 else types[:1]), timestep)
+
+    # Positions in the info of the timestep, not track ids
+    assert tracker.get_long_lived_indices('t2', min_length=3) == [1]
+    assert tracker.get_long_lived_indices('t2', min_length=1) == [0, 1]
+    assert tracker.get_long_lived_indices('t0', min_length=3) == [0]
+    info = get_info([(20, 0, 0), (0.2, 0, 0)], types[::-1])
+    assert tracker.filter_long_lived(info, 't2', min_length=3) == [info[1]]
+
+    summary = tracker.get_track_summary().set_index('TrackId')
+    assert summary.loc[0, 'Length'] == 3
+    assert summary.loc[0, 'FirstTimestep'] == 't0' and summary.loc[0, 'LastTimestep'] == 't2'
+    assert summary.loc[0, 'Distance'] == pytest.approx(0.2)
+    assert summary.loc[1, 'Type_text'] == 'SADDLE_2_3D'
+
+    filename = str(tmp_path / 'tracks' / 'tracks.csv')
+    tracker.save_track_table_to_file(filename)
+    assert len(pd.read_csv(filename)) == 4
+
+
+def test_dipole_timesteps_form_persistent_tracks():
+    tracker = CriticalPointTracker()
+    infos = {imf: get_dipole_topology(imf).critical_points_info for imf in [-5.0, -5.01, -5.02]}
+    for imf, info in infos.items():
+        tracker.add_timestep(info, imf)
+
+    assert tracker.number_of_tracks == len(infos[-5.0])
+    assert (tracker.get_track_lengths() == 3).all()
+    assert tracker.get_long_lived_indices(-5.02, min_length=3) == list(range(len(infos[-5.02])))
+
+
+def test_filter_stage_keeps_indices():
+    info = get_dipole_topology().critical_points_info
+    parameters = {'types': ['SADDLE_2_3D', 'SADDLE_1_3D'], 'indices': None}
+    filtered = filter_critical_points(parameters, copy.deepcopy(info))
+
+    parameters['indices'] = [0, 2]
+    kept = filter_critical_points(parameters, copy.deepcopy(info))
+    assert len(kept) == 2
+    for cp, expected in zip(kept, [filtered[0], filtered[2]]):
+        assert (cp['X'], cp['Y'], cp['Z'], cp['Type_text']) == (expected['X'], expected['Y'], expected['Z'], expected['Type_text'])
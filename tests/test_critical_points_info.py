@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from criticalpoint_processor.criticalpoint_processor import CriticalPointProcessor
+from vectorfieldtopology.helpers import load_critical_points_info, save_critical_points_info
+
+
+def get_critical_points_info():
+    """Returns critical point info like VectorFieldTopology.update_critical_points() makes it"""
+    rng = np.random.default_rng(26)
+    return [{
+        'X': float(x), 'Y': float(y), 'Z': float(z),
+        'Gradient': rng.normal(size=9)/7,
+        'Type': 2,
+        'Type_text': 'SADDLE_2_3D',
+        'Detailed_type': 5,
+    } for x, y, z in rng.normal(size=(4, 3))]
+
+
+@pytest.mark.parametrize('filename', ['critical_points_info.npz', 'critical_points_info.csv'])
+def test_critical_points_info_round_trip(tmp_path, filename):
+    """Saved critical point info reads back with the same values and float gradients, in binary and csv format"""
+    critical_points_info = get_critical_points_info()
+    path = str(tmp_path / filename)
+
+    save_critical_points_info(path, critical_points_info)
+    loaded = load_critical_points_info(path)
+
+    assert len(loaded) == len(critical_points_info)
+    for row, expected in zip(loaded, critical_points_info):
+        assert np.asarray(row['Gradient']).dtype == float
+        np.testing.assert_array_equal(row['Gradient'], expected['Gradient'])
+        assert (row['X'], row['Y'], row['Z']) == (expected['X'], expected['Y'], expected['Z'])
+        assert row['Type_text'] == expected['Type_text']
+
+
+def test_load_critical_points_info_detects_binary_file(tmp_path):
+    """A binary file is detected by its content, not its extension"""
+    path = str(tmp_path / 'critical_points_info.npz')
+    save_critical_points_info(path, get_critical_points_info())
+    renamed = tmp_path / 'critical_points_info.dat'
+    (tmp_path / 'critical_points_info.npz').rename(renamed)
+
+    cp_processor = CriticalPointProcessor()
+    cp_processor.load_critical_points_info(str(renamed))
+
+    assert len(cp_processor.critical_points_info) == 4
+    assert len(cp_processor.critical_points) == 4
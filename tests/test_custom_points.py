@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator
+from vectorfieldtopology import sampling
+
+
+def write_points(path, points, columns) -> str:
+    pd.DataFrame(points, columns=columns).assign(Normals=1.0).to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.fixture
+def points() -> np.ndarray:
+    return np.random.default_rng(32).uniform(-10, 10, size=(1000, 3))
+
+
+@pytest.mark.parametrize('columns', [['X', 'Y', 'Z'], ['Points:0', 'Points:1', 'Points:2']])
+@pytest.mark.parametrize('chunksize', [7, 100, 5000])
+def test_load_custom_points_every_nth(tmp_path, points, columns, chunksize):
+    """Reading in chunks keeps the same rows as slicing the whole file"""
+    filename = write_points(tmp_path / 'points.csv', points, columns)
+
+    sp_generator = SeedpointGenerator()
+    sp_generator.load_custom_points(filename, every_nth=3, chunksize=chunksize)
+
+    np.testing.assert_allclose(sp_generator.critical_points, points[::3])
+
+
+@pytest.mark.parametrize('chunksize', [7, 100, 5000])
+def test_load_custom_points_voxel_size(tmp_path, points, chunksize):
+    """Voxel subsampling over chunks keeps the first point of every voxel, like subsampling all points at once"""
+    filename = write_points(tmp_path / 'points.csv', points, ['X', 'Y', 'Z'])
+
+    sp_generator = SeedpointGenerator()
+    sp_generator.load_custom_points(filename, voxel_size=4.0, chunksize=chunksize)
+
+    loaded = pd.read_csv(filename)[['X', 'Y', 'Z']].to_numpy()
+    kept, _ = sampling.get_voxel_representatives(loaded, 4.0)
+    np.testing.assert_array_equal(sp_generator.critical_points, loaded[kept])
+    assert len(np.unique(sampling.get_voxel_keys(sp_generator.critical_points, 4.0))) == len(kept)
+
+
+def test_load_custom_points_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SeedpointGenerator().load_custom_points(str(tmp_path / 'missing.csv'))
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from vtkmodules.vtkCommonDataModel import vtkPolyData
+from vtkmodules.util.numpy_support import numpy_to_vtk
+
+from vectorfieldtopology.derived_fields import DerivedFieldRegistry
+
+
+def get_data_object() -> vtkPolyData:
+    """Returns a data object with point data arrays 'a' and 'b'"""
+    data_object = vtkPolyData()
+    for name, values in [('a', np.arange(10.)), ('b', 2*np.ones(10))]:
+        array = numpy_to_vtk(values, deep=True)
+        array.SetName(name)
+        data_object.GetPointData().AddArray(array)
+    return data_object
+
+
+def get_counting_registry(data_object, max_bytes: int = 1 << 20):
+    """Returns a registry with 'sum' = a+b and 'scaled' = 10*sum, and the number of calls of every function"""
+    calls = {'sum': 0, 'scaled': 0}
+
+    def get_sum(a, b):
+        calls['sum'] += 1
+        return a + b
+
+    def get_scaled(field):
+        calls['scaled'] += 1
+        return 10*field
+
+    registry = DerivedFieldRegistry(data_object, max_bytes)
+    registry.register('sum', get_sum, ['a', 'b'])
+    registry.register('scaled', get_scaled, ['sum'])
+    return registry, calls
+
+
+def test_derived_fields_are_computed_once():
+    """Derived fields are computed from arrays and other derived fields, the first time they are requested"""
+    registry, calls = get_counting_registry(get_data_object())
+
+    np.testing.assert_array_equal(registry.get('scaled'), 10*(np.arange(10.)+2))
+    np.testing.assert_array_equal(registry.get('sum'), np.arange(10.)+2)
+    registry.get('scaled')
+
+    assert calls == {'sum': 1, 'scaled': 1}
+    assert not registry.get('sum').flags.writeable
+
+
+def test_modified_data_object_clears_cache():
+    data_object = get_data_object()
+    registry, calls = get_counting_registry(data_object)
+    registry.get('scaled')
+
+    data_object.Modified()
+    registry.get('scaled')
+
+    assert calls == {'sum': 2, 'scaled': 2}
+
+
+def test_least_recently_used_field_is_evicted():
+    """The cache never grows larger than max_bytes, the least recently used field is evicted first"""
+    registry, calls = get_counting_registry(get_data_object(), max_bytes=160)
+    registry.get('sum')
+    registry.get('scaled')
+    registry.get('sum')
+
+    assert registry.get_cache_size() <= 160
+    assert calls == {'sum': 1, 'scaled': 1}
+    registry.register('other', lambda a: -a, ['a'])
+    registry.get('other')
+    registry.get('sum')
+    assert calls['sum'] == 1
+    registry.get('scaled')
+    assert calls == {'sum': 1, 'scaled': 2}
+
+
+def test_get_dataset_leaves_data_object_unchanged():
+    data_object = get_data_object()
+    registry, _ = get_counting_registry(data_object)
+
+    dataset = registry.get_dataset(['sum', 'scaled'])
+
+    assert data_object.GetPointData().GetNumberOfArrays() == 2
+    assert dataset.GetPointData().GetArray('scaled').GetValue(3) == 50.
+
+
+def test_unknown_field_raises():
+    registry, _ = get_counting_registry(get_data_object())
+
+    with pytest.raises(ValueError):
+        registry.get('missing')
@@ -0,0 +1,36 @@
+import os
+
+from vtkmodules.vtkCommonDataModel import vtkCompositeDataSet
+from vtkmodules.vtkIOXML import vtkXMLMultiBlockDataReader
+
+from vectorfieldtopology.helpers import get_sphere_actor
+from vtk_visualization.helpers import export_scene
+
+
+def test_export_scene(tmp_path, traced_seedpoint_processor):
+    """Every stage is a named block with the datasets of its actors and polydata, written in a directory next to the .vtm file"""
+    filename = str(tmp_path / 'scene' / 'scene.vtm')
+    fieldlines = traced_seedpoint_processor.get_fieldlines_polydata()
+
+    export_scene({
+        'fieldlines': fieldlines,
+        'earth': [get_sphere_actor(radius=3, center=(0, 0, 0)), get_sphere_actor(radius=1, center=(0, 0, 4))],
+        'empty': [],
+    }, filename)
+
+    assert os.path.isfile(filename)
+    assert os.path.isdir(str(tmp_path / 'scene' / 'scene'))
+
+    reader = vtkXMLMultiBlockDataReader()
+    reader.SetFileName(filename)
+    reader.Update()
+    scene = reader.GetOutput()
+
+    names = [scene.GetMetaData(i).Get(vtkCompositeDataSet.NAME()) for i in range(scene.GetNumberOfBlocks())]
+    assert names == ['fieldlines', 'earth', 'empty']
+    assert [scene.GetBlock(i).GetNumberOfBlocks() for i in range(3)] == [1, 2, 0]
+
+    saved_fieldlines = scene.GetBlock(0).GetBlock(0)
+    assert saved_fieldlines.GetNumberOfCells() == fieldlines.GetNumberOfCells()
+    assert saved_fieldlines.GetCellData().GetArray('FieldlineStatus') is not None
+    assert scene.GetBlock(1).GetBlock(0).GetNumberOfPoints() > 0
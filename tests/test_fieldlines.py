@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+from vtkmodules.vtkIOXML import vtkXMLPolyDataReader, vtkXMLPolyDataWriter
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from seedpoint_processor import helpers
+from seedpoint_processor.fieldlines import Fieldlines
+
+
+def get_douglas_peucker_indices(points: np.ndarray, tolerance: float) -> list:
+    """Recursive Douglas-Peucker of one polyline, the reference for the vectorized mask"""
+    if(len(points) < 3):
+        return list(range(len(points)))
+
+    a, b = points[0], points[-1]
+    ab = b-a
+    t = np.clip((points[1:-1]-a) @ ab/max(ab @ ab, 1e-300), 0, 1)
+    distance = np.linalg.norm(points[1:-1]-(a+t[:, None]*ab), axis=1)
+    split = int(np.argmax(distance)) + 1
+    if(distance[split-1] <= tolerance):
+        return [0, len(points)-1]
+
+    left = get_douglas_peucker_indices(points[:split+1], tolerance)
+    right = get_douglas_peucker_indices(points[split:], tolerance)
+    return left[:-1] + [split + i for i in right]
+
+
+def get_fieldlines(number_of_lines: int = 20) -> Fieldlines:
+    """Returns random walks with 0 to 60 points"""
+    rng = np.random.default_rng(39)
+    lengths = rng.integers(0, 60, size=number_of_lines)
+    points = np.cumsum(rng.normal(size=(lengths.sum(), 3)), axis=0)
+    return Fieldlines(points, np.concatenate([[0], np.cumsum(lengths)]), np.arange(number_of_lines))
+
+
+@pytest.mark.parametrize('tolerance', [0.0, 0.5, 2.0, 100.0])
+def test_douglas_peucker_mask_equals_recursive(tolerance):
+    """All polylines simplified at once keep the same points as simplifying them one at a time"""
+    fieldlines = get_fieldlines()
+
+    keep = helpers.get_douglas_peucker_mask(fieldlines.points, fieldlines.offsets, tolerance)
+
+    for start, end in zip(fieldlines.offsets[:-1], fieldlines.offsets[1:]):
+        expected = start + np.array(get_douglas_peucker_indices(fieldlines.points[start:end], tolerance), dtype=np.int64)
+        np.testing.assert_array_equal(np.flatnonzero(keep[start:end]) + start, expected)
+
+
+def test_decimate_keeps_line_ends():
+    fieldlines = get_fieldlines()
+
+    decimated = fieldlines.decimate(2.0)
+
+    assert len(decimated) == len(fieldlines)
+    assert decimated.get_number_of_points() < fieldlines.get_number_of_points()
+    np.testing.assert_array_equal(decimated.seed_ids, fieldlines.seed_ids)
+    has_points = np.diff(fieldlines.offsets) > 0
+    np.testing.assert_array_equal(decimated.points[decimated.offsets[:-1][has_points]], fieldlines.points[fieldlines.offsets[:-1][has_points]])
+    np.testing.assert_array_equal(decimated.points[decimated.offsets[1:][has_points]-1], fieldlines.points[fieldlines.offsets[1:][has_points]-1])
+
+
+def test_select_and_concatenate():
+    """Selecting lines and concatenating the parts gives back the same lines"""
+    fieldlines = get_fieldlines()
+    is_selected = fieldlines.seed_ids % 3 == 0
+
+    selected = fieldlines.select_seed_ids(fieldlines.seed_ids[is_selected])
+    others = fieldlines.select(~is_selected)
+    concatenated = Fieldlines.concatenate([selected, others], [0, 100])
+
+    assert len(concatenated) == len(fieldlines)
+    np.testing.assert_array_equal(concatenated.seed_ids, np.concatenate([fieldlines.seed_ids[is_selected], fieldlines.seed_ids[~is_selected] + 100]))
+    for i, seed_id in enumerate(fieldlines.seed_ids[is_selected]):
+        np.testing.assert_array_equal(concatenated.points[concatenated.offsets[i]:concatenated.offsets[i+1]], fieldlines.points[fieldlines.offsets[seed_id]:fieldlines.offsets[seed_id+1]])
+
+
+def test_polydata_round_trip(tmp_path):
+    """The lines written as vtp read back as the same lines"""
+    fieldlines = get_fieldlines()
+    writer = vtkXMLPolyDataWriter()
+    writer.SetFileName(str(tmp_path / 'fieldlines.vtp'))
+    writer.SetInputData(fieldlines.to_polydata())
+    writer.Write()
+
+    reader = vtkXMLPolyDataReader()
+    reader.SetFileName(str(tmp_path / 'fieldlines.vtp'))
+    reader.Update()
+    poly = reader.GetOutput()
+
+    np.testing.assert_allclose(vtk_to_numpy(poly.GetPoints().GetData()), fieldlines.points)
+    np.testing.assert_array_equal(vtk_to_numpy(poly.GetLines().GetOffsetsArray()), fieldlines.offsets)
+    np.testing.assert_array_equal(vtk_to_numpy(poly.GetCellData().GetArray('SeedIds')), fieldlines.seed_ids)
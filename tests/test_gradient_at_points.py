@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from vtkmodules.vtkCommonDataModel import vtkImageData
+from vtkmodules.util.numpy_support import numpy_to_vtk
+
+from vectorfieldtopology.vectorfieldtopology import VectorFieldTopology
+
+JACOBIAN = np.array([[1., 2., 3.], [-4., 5., 0.5], [0., -1., 2.]])
+
+
+def get_linear_vectorfield_topology() -> VectorFieldTopology:
+    """Returns a VectorFieldTopology of the linear vectorfield v(x) = JACOBIAN @ x, whose gradient is JACOBIAN everywhere"""
+    image = vtkImageData()
+    image.SetDimensions(6, 6, 6)
+    image.SetOrigin(-2.5, -2.5, -2.5)
+    points = np.array([image.GetPoint(i) for i in range(image.GetNumberOfPoints())])
+
+    vectors = numpy_to_vtk(np.ascontiguousarray(points @ JACOBIAN.T), deep=True)
+    vectors.SetName('B')
+    image.GetPointData().SetVectors(vectors)
+
+    vft = VectorFieldTopology()
+    vft.update_vectorfield_from_vectors(image)
+    return vft
+
+
+def test_gradient_at_points():
+    """The gradient is the row major jacobian, the same layout as the 'Gradient' of the critical point info"""
+    vft = get_linear_vectorfield_topology()
+    points = np.random.default_rng(35).uniform(-2, 2, size=(20, 3))
+
+    gradient = vft.get_gradient_at_points(points)
+
+    assert gradient.shape == (20, 9)
+    np.testing.assert_allclose(gradient, np.tile(JACOBIAN.ravel(), (20, 1)), atol=1e-9)
+
+
+def test_gradient_field_is_cached():
+    """The gradient of the whole vectorfield is only computed again when the vectorfield changes"""
+    vft = get_linear_vectorfield_topology()
+    vft.get_gradient_at_points([(0., 0., 0.)])
+    gradient_field = vft.gradient_field
+
+    vft.get_gradient_at_points([(1., 1., 1.)])
+    assert vft.gradient_field is gradient_field
+
+    vft.vectorfield.Modified()
+    vft.get_gradient_at_points([(1., 1., 1.)])
+    assert vft.gradient_field is not gradient_field
+
+
+def test_gradient_outside_vectorfield_warns():
+    vft = get_linear_vectorfield_topology()
+
+    with pytest.warns(UserWarning, match="outside the vectorfield"):
+        gradient = vft.get_gradient_at_points([(0., 0., 0.), (10., 0., 0.)])
+
+    np.testing.assert_array_equal(gradient[1], 0)
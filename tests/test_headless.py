@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from vtk_visualization.helpers import is_headless, load_rendering_modules, set_headless
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs the seeding and tracing of main.py with visualize() calls, and prints the imported vtkRendering modules
+HEADLESS_SCRIPT = """
+import sys
+sys.path.insert(0, 'tests')
+from vtk_visualization.helpers import set_headless
+set_headless(True)
+from conftest import get_dipole_topology
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+
+vft = get_dipole_topology()
+vft.update_list_of_actors(show_critical_points=True, show_separator=False, show_vectorfield=True)
+vft.visualize()
+sp_generator = SeedpointGenerator()
+sp_generator.set_critical_point_info(vft.critical_points_info)
+sp_generator.set_template(Template.SMART)
+sp_generator.update_seed_points()
+sp_generator.visualize()
+sp_processor = SeedpointProcessor()
+sp_processor.set_seed_critical_pair(sp_generator.seed_critical_pair)
+sp_processor.set_vector_field_domain(vft.vectorfield)
+sp_processor.update_seed_point_info()
+sp_processor.visualize()
+print(len(vft.list_of_actors), len(sp_generator.list_of_actors), len(sp_processor.list_of_actors), len(sp_processor.seedpoint_info))
+print(sorted(name for name in sys.modules if name.startswith('vtkmodules.vtkRendering')))
+"""
+
+
+def test_headless_never_imports_rendering():
+    """In headless mode the whole pipeline runs, no actors are built and the vtkRendering modules are never imported"""
+    result = subprocess.run([sys.executable, '-c', HEADLESS_SCRIPT], cwd=REPOSITORY_DIRECTORY, capture_output=True, text=True, timeout=300)
+
+    assert result.returncode == 0, result.stderr
+    actors, rendering_modules = result.stdout.strip().splitlines()[-2:]
+    number_of_actors = [int(number) for number in actors.split()]
+    assert number_of_actors[:3] == [0, 0, 0]
+    assert number_of_actors[3] > 0
+    assert rendering_modules == '[]'
+
+
+def test_load_rendering_modules_in_headless_mode_raises():
+    set_headless(True)
+    try:
+        assert is_headless()
+        with pytest.raises(RuntimeError, match="headless"):
+            load_rendering_modules()
+    finally:
+        set_headless(False)
+
+    assert load_rendering_modules().vtkActor is not None
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from conftest import get_dipole_topology
+from criticalpoint_processor import constants as cp_constants
+from criticalpoint_processor.helpers import get_nearest_matches
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor import constants, helpers
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+
+
+def get_seedpoint_processor(vft) -> SeedpointProcessor:
+    """Returns a SeedpointProcessor with the disc template seedpoints of the topology, not traced yet"""
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(vft.critical_points_info)
+    sp_generator.set_template(Template.TRIPPLE_EIGEN_PLANE)
+    sp_generator.update_seed_points()
+
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_seed_critical_pair(sp_generator.seed_critical_pair)
+    sp_processor.set_vector_field_domain(vft.vectorfield)
+    return sp_processor
+
+
+@pytest.fixture(scope='module')
+def previous_timestep(dipole_topology) -> SeedpointProcessor:
+    sp_processor = get_seedpoint_processor(dipole_topology)
+    sp_processor.update_seed_point_info()
+    return sp_processor
+
+
+@pytest.mark.parametrize('imf', [-5.01, -5.05])
+def test_incremental_equals_full_recomputation(previous_timestep, imf):
+    """After the field is perturbed, the incremental statuses are the same as tracing every seedpoint again, with fewer traces"""
+    vft = get_dipole_topology(imf=imf)
+    incremental = get_seedpoint_processor(vft)
+    incremental.update_seed_point_info_incremental(previous_timestep.seed_critical_pair, previous_timestep.seedpoint_info, verify=True)
+
+    full = get_seedpoint_processor(vft)
+    full.update_seed_point_info()
+
+    assert incremental.number_of_mismatched_seed_points == 0
+    np.testing.assert_array_equal(incremental.seedpoint_info['FieldlineStatus'], full.seedpoint_info['FieldlineStatus'])
+    np.testing.assert_array_equal(incremental.number_of_invalid_seed_points, full.number_of_invalid_seed_points)
+    assert incremental.retrace_fraction < 1.0
+    assert np.all(np.isin(incremental.fieldlines.seed_ids, full.fieldlines.seed_ids))
+
+
+def test_unmatched_critical_points_are_retraced(previous_timestep, dipole_topology):
+    """Critical points without a previous critical point within the tolerance are traced completely"""
+    incremental = get_seedpoint_processor(dipole_topology)
+    pair = previous_timestep.seed_critical_pair
+    shifted = SeedCriticalPair(pair.seed_points + 10, pair.owners, pair.critical_points + 10)
+
+    incremental.update_seed_point_info_incremental(shifted, previous_timestep.seedpoint_info)
+
+    assert incremental.retrace_fraction == 1.0
+    np.testing.assert_array_equal(incremental.seedpoint_info['FieldlineStatus'], previous_timestep.seedpoint_info['FieldlineStatus'])
+
+
+def test_nearest_relative_points_kd_tree_equals_dense(previous_timestep, monkeypatch):
+    """The kd-tree search matches the same previous seedpoints as the distance matrix"""
+    pair = get_seedpoint_processor(get_dipole_topology(imf=-5.01)).seed_critical_pair
+    previous_pair = previous_timestep.seed_critical_pair
+    matches = get_nearest_matches(pair.critical_points, previous_pair.critical_points, cp_constants.MATCH_TOLERANCE)
+
+    dense = helpers.get_nearest_relative_points(pair, previous_pair, matches, cp_constants.MATCH_TOLERANCE)
+    monkeypatch.setattr(constants, 'DENSE_DISTANCE_LIMIT', 0)
+    kd_tree = helpers.get_nearest_relative_points(pair, previous_pair, matches, cp_constants.MATCH_TOLERANCE)
+
+    assert np.count_nonzero(dense >= 0) > 0
+    np.testing.assert_array_equal(kd_tree, dense)
+
+
+def test_mismatched_previous_info_raises(previous_timestep):
+    sp_processor = SeedpointProcessor()
+
+    with pytest.raises(ValueError):
+        sp_processor.update_seed_point_info_incremental(previous_timestep.seed_critical_pair, previous_timestep.seedpoint_info.iloc[:-1])
@@ -0,0 +1,26 @@
+import numpy as np
+
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+from seedpoint_processor.seedpoint_processor import FieldlineStatus, SeedpointProcessor
+
+
+def test_seed_points_outside_domain_are_invalid(dipole_topology):
+    """Seedpoints outside the domain get the status 'invalid', are counted per critical point and are never traced.
+    Seedpoints close to the earth are inside the domain and are traced."""
+    pair = SeedCriticalPair.from_pairs([
+        ((10., 0., 0.), [(10., 0., 1.), (100., 0., 0.), (0., 0., 1.5)]),
+        ((-10., 0., 0.), [(-10., 0., 1.), (0., -50., 0.)]),
+        ((0., 10., 0.), [(0., 10., 1.)]),
+    ])
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_seed_critical_pair(pair)
+    sp_processor.set_vector_field_domain(dipole_topology.vectorfield)
+    sp_processor.update_seed_point_info()
+
+    status = sp_processor.seedpoint_info['FieldlineStatus'].to_numpy()
+    is_invalid = np.array([False, True, False, False, True, False])
+    np.testing.assert_array_equal(status == 'invalid', is_invalid)
+    np.testing.assert_array_equal(sp_processor.seedpoint_info['EarthSide'][is_invalid], 'null')
+    np.testing.assert_array_equal(sp_processor.number_of_invalid_seed_points, [1, 1, 0])
+    np.testing.assert_array_equal(np.unique(sp_processor.fieldlines.seed_ids), np.flatnonzero(~is_invalid))
+    assert status[2] in [fieldline_status.value for fieldline_status in FieldlineStatus]
@@ -0,0 +1,44 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+
+DATA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# The expected seedpoints were saved by openspace_seeding() before it was vectorized
+CASES = [
+    ('default', {}),
+    ('spacing', {'z_spacing': 0.5, 'p': 0.25}),
+]
+
+
+def get_seedpoint_processor() -> SeedpointProcessor:
+    """Returns a SeedpointProcessor with the seedpoint info fixture"""
+    sp_processor = SeedpointProcessor()
+    sp_processor.seedpoint_info = pd.read_csv(os.path.join(DATA_DIRECTORY, 'openspace_seedpoint_info.csv'))
+    return sp_processor
+
+
+@pytest.mark.parametrize('name, kwargs', CASES)
+def test_openspace_seeding_text(tmp_path, name, kwargs):
+    """The text output matches the original implementation row for row"""
+    expected = np.loadtxt(os.path.join(DATA_DIRECTORY, f'openspace_seedpoints_{name}.txt'))
+    filename = str(tmp_path / 'seedpoints_openspace.txt')
+
+    get_seedpoint_processor().openspace_seeding(filename=filename, **kwargs)
+
+    np.testing.assert_array_equal(np.loadtxt(filename), expected)
+
+
+@pytest.mark.parametrize('name, kwargs', CASES)
+def test_openspace_seeding_binary(tmp_path, name, kwargs):
+    """The binary output matches the original implementation row for row"""
+    expected = np.loadtxt(os.path.join(DATA_DIRECTORY, f'openspace_seedpoints_{name}.txt'))
+    filename = str(tmp_path / 'seedpoints_openspace.npy')
+
+    get_seedpoint_processor().openspace_seeding(filename=filename, **kwargs)
+
+    np.testing.assert_array_equal(np.load(filename), expected)
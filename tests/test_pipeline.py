@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import write_dipole_grid
+from pipeline import constants
+from pipeline.cache import StageCache
+from pipeline.helpers import get_merged_parameters
+from pipeline.pipeline import Pipeline, Stage, get_pipeline
+
+
+def get_counting_pipeline(cache_directory: str, calls: dict, source_modules=(), input_files=()) -> Pipeline:
+    """Returns the pipeline a -> b -> c, every stage counts its calls"""
+    def run(name):
+        def function(parameters, *inputs):
+            calls[name] = calls.get(name, 0) + 1
+            return sum(inputs) + parameters['value']
+        return function
+
+    pipeline = Pipeline(cache_directory)
+    pipeline.add_stage(Stage('a', run('a'), {'value': 1}, input_files=input_files))
+    pipeline.add_stage(Stage('b', run('b'), {'value': 10}, upstream=['a'], source_modules=source_modules))
+    pipeline.add_stage(Stage('c', run('c'), {'value': 100}, upstream=['b']))
+    return pipeline
+
+
+def test_cached_stages_are_loaded(tmp_path):
+    """A second run loads the target from the cache and doesn't run its upstream stages"""
+    calls = {}
+    assert get_counting_pipeline(str(tmp_path), calls).run() == {'c': 111}
+
+    pipeline = get_counting_pipeline(str(tmp_path), calls)
+    assert pipeline.run() == {'c': 111}
+
+    assert calls == {'a': 1, 'b': 1, 'c': 1}
+    assert pipeline.cache_hits == {'c': True}
+
+
+def test_changed_parameters_rerun_downstream_stages(tmp_path):
+    """Changing the parameters of a stage reruns it and the stages after it, the stages before it are loaded"""
+    calls = {}
+    get_counting_pipeline(str(tmp_path), calls).run()
+
+    pipeline = get_counting_pipeline(str(tmp_path), calls)
+    pipeline.set_parameters('b', {'value': 20})
+
+    assert pipeline.run() == {'c': 121}
+    assert calls == {'a': 1, 'b': 2, 'c': 2}
+    assert pipeline.cache_hits == {'a': True, 'b': False, 'c': False}
+
+
+def test_changed_source_and_input_files_change_the_key(tmp_path, monkeypatch):
+    """Editing a source module of a stage or touching its input file changes the keys of the stage and of the stages after it"""
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / 'stage_source.py').write_text("VALUE = 1\n")
+    (tmp_path / 'input.txt').write_text("1\n")
+    pipeline = get_counting_pipeline(str(tmp_path / 'cache'), {}, source_modules=['stage_source'], input_files=[str(tmp_path / 'input.txt')])
+    keys = {name: pipeline.get_key(name) for name in 'abc'}
+
+    (tmp_path / 'stage_source.py').write_text("VALUE = 2\n")
+    source_keys = {name: pipeline.get_key(name) for name in 'abc'}
+    assert source_keys['a'] == keys['a']
+    assert source_keys['b'] != keys['b'] and source_keys['c'] != keys['c']
+
+    (tmp_path / 'input.txt').write_text("12\n")
+    assert pipeline.get_key('a') != keys['a']
+
+
+def test_unknown_upstream_stage_raises(tmp_path):
+    pipeline = Pipeline(str(tmp_path))
+
+    with pytest.raises(ValueError):
+        pipeline.add_stage(Stage('b', lambda parameters, a: a, upstream=['a']))
+
+
+def test_stage_cache_evicts_least_recently_used(tmp_path):
+    cache = StageCache(str(tmp_path), max_bytes=2500)
+    cache.set('first', np.zeros(100))
+    cache.set('second', np.zeros(100))
+    os.utime(str(tmp_path / 'first.pkl'), ns=(0, 0))
+    cache.set('third', np.zeros(100))
+
+    assert cache.get('first') == (False, None)
+    assert cache.get('second')[0] and cache.get('third')[0]
+    assert cache.get_cache_size() <= 2500
+
+
+def test_broken_cache_file_is_a_miss(tmp_path):
+    cache = StageCache(str(tmp_path))
+    (tmp_path / 'broken.pkl').write_bytes(b'not a pickle')
+
+    assert cache.get('broken') == (False, None)
+    assert not (tmp_path / 'broken.pkl').exists()
+
+
+def test_get_pipeline_cache_hits(tmp_path):
+    """A second run of the main.py pipeline loads every target from the cache without reading the file, with the same outputs"""
+    parameters = get_merged_parameters(constants.PARAMETERS, {'read': {'filename': write_dipole_grid(str(tmp_path / 'dipole.vtu')), 'rename_xyz': False}})
+    targets = ['topology', 'filter', 'seed', 'trace']
+
+    first = get_pipeline(parameters, str(tmp_path / 'cache'))
+    outputs = first.run(targets)
+    assert not any(first.cache_hits.values())
+    assert len(outputs['filter']) > 0
+
+    second = get_pipeline(parameters, str(tmp_path / 'cache'))
+    cached_outputs = second.run(targets)
+    assert second.cache_hits == {name: True for name in targets}
+    assert 'read' not in second.outputs
+    pd.testing.assert_frame_equal(cached_outputs['trace']['seedpoint_info'], outputs['trace']['seedpoint_info'])
+    np.testing.assert_array_equal(cached_outputs['seed'].seed_points, outputs['seed'].seed_points)
+
+    third = get_pipeline(get_merged_parameters(parameters, {'seed': {'template': 'TRIPPLE_EIGEN_PLANE'}}), str(tmp_path / 'cache'))
+    third.run(targets)
+    assert third.cache_hits == {'read': False, 'topology': True, 'filter': True, 'seed': False, 'trace': False}
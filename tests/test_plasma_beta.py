@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from conftest import get_dipole_grid
+from vectorfieldtopology import constants, derived_fields
+from vectorfieldtopology.vectorfieldtopology import VectorFieldTopology
+
+
+def test_plasma_beta():
+    """The plasma beta of every component is P/(B_i^2/(2*MU_0)), zero components give inf"""
+    plasma_beta = derived_fields.get_plasma_beta([2., 1.], [(1., 2., 0.), (4., -1., 1.)])
+
+    np.testing.assert_allclose(plasma_beta, [[4*constants.MU_0, constants.MU_0, np.inf], [constants.MU_0/8, 2*constants.MU_0, 2*constants.MU_0]])
+    np.testing.assert_allclose(derived_fields.get_log_plasma_beta([2.], [(1., 2., 3.)]), np.log(derived_fields.get_plasma_beta([2.], [(1., 2., 3.)])))
+
+
+@pytest.fixture(scope='module')
+def dipole_grid():
+    return get_dipole_grid()
+
+
+def test_points_of_interest_threshold(dipole_grid):
+    """All contour points are kept with a low threshold, and a higher threshold keeps a subset of them"""
+    number_of_arrays = dipole_grid.GetPointData().GetNumberOfArrays()
+    log_plasma_beta = derived_fields.get_log_plasma_beta(vtk_to_numpy(dipole_grid.GetPointData().GetArray(constants.PRESSURE_ARRAY_NAME)), derived_fields.get_magnetic_field(dipole_grid))
+    finite = log_plasma_beta[np.isfinite(log_plasma_beta)]
+
+    all_points = derived_fields.get_plasma_beta_points_of_interest(dipole_grid, threshold=-np.inf)
+    points = derived_fields.get_plasma_beta_points_of_interest(dipole_grid, threshold=np.median(finite))
+
+    assert 0 < len(points) < len(all_points)
+    assert len(np.unique(np.concatenate([all_points, points]), axis=0)) == len(np.unique(all_points, axis=0))
+    assert dipole_grid.GetPointData().GetNumberOfArrays() == number_of_arrays
+
+
+def test_points_of_interest_from_vectorfieldtopology(dipole_grid):
+    """VectorFieldTopology gives the same points of interest, computed from its derived fields"""
+    vft = VectorFieldTopology()
+    vft.data_object.ShallowCopy(dipole_grid)
+
+    expected = derived_fields.get_plasma_beta_points_of_interest(dipole_grid, threshold=-20)
+    np.testing.assert_allclose(vft.get_plasma_beta_points_of_interest(threshold=-20), expected)
+    np.testing.assert_allclose(vft.get_plasma_beta_points_of_interest(threshold=-20, every_nth=3), expected[::3])
+
+
+def test_points_of_interest_missing_pressure(dipole_grid):
+    grid = dipole_grid.NewInstance()
+    grid.ShallowCopy(dipole_grid)
+    grid.GetPointData().RemoveArray(constants.PRESSURE_ARRAY_NAME)
+
+    with pytest.raises(ValueError, match="not found"):
+        derived_fields.get_plasma_beta_points_of_interest(grid)
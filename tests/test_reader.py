@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from conftest import write_dipole_grid
+from vectorfieldtopology import helpers
+from vectorfieldtopology.reader import PrefetchingReader
+from vectorfieldtopology.vectorfieldtopology import VectorFieldTopology
+
+
+@pytest.fixture(scope='module')
+def timestep_files(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('data')
+    return [write_dipole_grid(str(directory / f'dipole_{i}.vtu'), imf=-5.0-0.01*i) for i in range(4)]
+
+
+def assert_same_grid(grid, expected) -> None:
+    """Asserts that two unstructured grids have the same points, cells and point data"""
+    np.testing.assert_array_equal(vtk_to_numpy(grid.GetPoints().GetData()), vtk_to_numpy(expected.GetPoints().GetData()))
+    np.testing.assert_array_equal(vtk_to_numpy(grid.GetCells().GetConnectivityArray()), vtk_to_numpy(expected.GetCells().GetConnectivityArray()))
+    np.testing.assert_array_equal(vtk_to_numpy(grid.GetCellTypesArray()), vtk_to_numpy(expected.GetCellTypesArray()))
+
+    point_data, expected_point_data = grid.GetPointData(), expected.GetPointData()
+    assert point_data.GetNumberOfArrays() == expected_point_data.GetNumberOfArrays()
+    for i in range(expected_point_data.GetNumberOfArrays()):
+        name = expected_point_data.GetArrayName(i)
+        np.testing.assert_array_equal(vtk_to_numpy(point_data.GetArray(name)), vtk_to_numpy(expected_point_data.GetArray(i)))
+
+
+def test_arrays_round_trip(timestep_files):
+    """The grid sent back from the background process as numpy arrays is the same grid"""
+    grid = helpers.read_data_object(timestep_files[0])
+
+    assert_same_grid(helpers.get_unstructured_grid_from_arrays(helpers.get_unstructured_grid_arrays(grid)), grid)
+
+
+def test_prefetched_files_equal_direct_reads(timestep_files):
+    """Files read in order come from the background process and are the same as reading them directly"""
+    with PrefetchingReader(timestep_files, depth=2) as reader:
+        for filename in timestep_files:
+            vft = VectorFieldTopology()
+            vft.read_file(filename, reader=reader)
+            assert_same_grid(vft.data_object, helpers.read_data_object(filename))
+
+        assert reader.number_of_prefetched_files == len(timestep_files)
+
+
+def test_skipped_and_unknown_files(timestep_files):
+    """Skipped files are dropped, a file that wasn't prefetched is read directly, and the files after it are prefetched"""
+    with PrefetchingReader(timestep_files[:3], depth=1) as reader:
+        for filename in [timestep_files[1], timestep_files[2], timestep_files[3]]:
+            assert_same_grid(reader.read_file(filename), helpers.read_data_object(filename))
+
+        assert reader.number_of_prefetched_files == 1
+
+
+def test_invalid_depth_raises(timestep_files):
+    with pytest.raises(ValueError):
+        PrefetchingReader(timestep_files, depth=0)
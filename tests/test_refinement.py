@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor import constants, helpers
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+
+
+@pytest.fixture(scope='module')
+def refined_processor(dipole_topology):
+    """SeedpointProcessor with the spherical template seeds of the dipole field, traced and refined"""
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+    sp_generator.set_template(Template.SPHERICAL)
+    sp_generator.update_seed_points()
+
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_seed_critical_pair(sp_generator.seed_critical_pair)
+    sp_processor.set_vector_field_domain(dipole_topology.vectorfield)
+    sp_processor.update_seed_point_info()
+    original_info = sp_processor.seedpoint_info.copy()
+    sp_processor.refine_seed_points()
+    return sp_processor, original_info
+
+
+def test_refinement_adds_unique_seedpoints(refined_processor):
+    """The original seedpoints are kept, and the refinement adds new seedpoints only once"""
+    sp_processor, original_info = refined_processor
+    points = sp_processor.seedpoint_info[['X', 'Y', 'Z']].to_numpy()
+    original_points = original_info[['X', 'Y', 'Z']].to_numpy()
+
+    assert len(points) > len(original_points)
+    assert len(np.unique(points, axis=0)) == len(points)
+    assert len(np.unique(np.concatenate([points, original_points]), axis=0)) == len(points)
+
+
+def test_refinement_keeps_the_csr_mapping(refined_processor):
+    """The seedpoint info rows line up with the seed_critical_pair, and every row has its fieldlines"""
+    sp_processor, _ = refined_processor
+    pair = sp_processor.seed_critical_pair
+
+    np.testing.assert_array_equal(sp_processor.seedpoint_info[['X', 'Y', 'Z']].to_numpy(), pair.seed_points)
+    assert np.all(np.diff(pair.owners) >= 0)
+    assert np.all(np.isin(pair.get_traced_seed_indices(), sp_processor.fieldlines.seed_ids))
+
+
+def test_refined_status_equals_tracing(refined_processor, dipole_topology):
+    """The status of the refined seedpoints is the same as tracing all of them from scratch"""
+    sp_processor, _ = refined_processor
+
+    traced = SeedpointProcessor()
+    traced.set_seed_critical_pair(SeedCriticalPair(sp_processor.seed_critical_pair.seed_points, sp_processor.seed_critical_pair.owners, sp_processor.seed_critical_pair.critical_points))
+    traced.set_vector_field_domain(dipole_topology.vectorfield)
+    traced.update_seed_point_info()
+
+    np.testing.assert_array_equal(traced.seedpoint_info['FieldlineStatus'], sp_processor.seedpoint_info['FieldlineStatus'])
+
+
+def test_neighbour_pairs_kd_tree_equals_dense(monkeypatch):
+    """The kd-tree search finds the same neighbour pairs as the distance matrix"""
+    rng = np.random.default_rng(29)
+    points = rng.normal(size=(300, 3))
+    owners = rng.integers(0, 3, size=300)
+
+    dense = helpers.get_neighbour_pairs(points, owners, 4)
+    monkeypatch.setattr(constants, 'DENSE_DISTANCE_LIMIT', 0)
+    kd_tree = helpers.get_neighbour_pairs(points, owners, 4)
+
+    np.testing.assert_array_equal(dense[0], kd_tree[0])
+    np.testing.assert_array_equal(dense[1], kd_tree[1])
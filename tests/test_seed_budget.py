@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from seedpoint_generator import template_engine
+from seedpoint_generator.seedpoint_generator import BudgetWeight, SeedpointGenerator, Template
+
+
+@pytest.mark.parametrize('weights, seed_budget', [([1., 1., 1.], 100), ([3., 0., 1., 2.], 7), ([0., 0.], 5), ([np.nan, 2.], 9)])
+def test_seed_budget_allocation_sums_to_budget(weights, seed_budget):
+    """The counts sum up to the budget and never differ from the proportional share by one or more"""
+    counts = template_engine.get_seed_budget_allocation(weights, seed_budget)
+
+    weights = np.nan_to_num(np.asarray(weights))
+    weights = weights if weights.sum() > 0 else np.ones_like(weights)
+    assert counts.sum() == seed_budget
+    assert np.all(np.abs(counts - seed_budget*weights/weights.sum()) < 1)
+
+
+@pytest.mark.parametrize('number_of_seeds', [5, 6, 40, 101])
+def test_sphere_resolution_fits_in_number_of_seeds(number_of_seeds):
+    theta, phi = template_engine.get_sphere_resolution_from_number_of_seeds([number_of_seeds])
+    template = template_engine.get_unit_sphere_template(int(theta[0]), int(phi[0]), 0.5)
+
+    assert len(template) <= number_of_seeds
+
+
+def get_seedpoint_generator(dipole_topology, template: Template) -> SeedpointGenerator:
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+    sp_generator.set_template(template)
+    return sp_generator
+
+
+@pytest.mark.parametrize('template', [Template.SPHERICAL, Template.TRIPPLE_EIGEN_PLANE, Template.SMART])
+@pytest.mark.parametrize('budget_weight', list(BudgetWeight))
+def test_seed_budget_is_upper_bound(dipole_topology, template, budget_weight):
+    """Every critical point gets at most its share of the budget"""
+    seed_budget = 400
+    sp_generator = get_seedpoint_generator(dipole_topology, template)
+    sp_generator.update_seed_points(seed_budget=seed_budget, budget_weight=budget_weight)
+
+    number_of_seeds = sp_generator.seed_critical_pair.get_number_of_seed_points()
+    assert 0 < len(sp_generator.seed_points) <= seed_budget
+    assert len(number_of_seeds) == len(dipole_topology.critical_points_info)
+    assert number_of_seeds.sum() == len(sp_generator.seed_points)
+
+
+def test_seed_budget_without_template_raises(dipole_topology):
+    """A missing template is reported before the budget is split"""
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+
+    with pytest.raises(ValueError, match="No template"):
+        sp_generator.update_seed_points(seed_budget=100)
+
+
+def test_seed_budget_with_user_choice_raises(dipole_topology):
+    sp_generator = get_seedpoint_generator(dipole_topology, Template.USER_CHOICE)
+
+    with pytest.raises(ValueError, match="USER_CHOICE"):
+        sp_generator.update_seed_points(seed_budget=100)
@@ -0,0 +1,109 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+
+
+def get_seedpoint_generator(dipole_topology, template: Template) -> SeedpointGenerator:
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+    sp_generator.set_template(template)
+    return sp_generator
+
+
+def get_seedpoint_processor(dipole_topology) -> SeedpointProcessor:
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_vector_field_domain(dipole_topology.vectorfield)
+    return sp_processor
+
+
+def get_number_of_points_per_seed(fieldlines) -> np.ndarray:
+    return np.bincount(fieldlines.seed_ids, np.diff(fieldlines.offsets))
+
+
+@pytest.mark.parametrize('template', [Template.SPHERICAL, Template.TRIPPLE_EIGEN_PLANE])
+def test_chunks_equal_full_run(dipole_topology, template):
+    """Tracing the seedpoints chunk by chunk gives the same seedpoint info as tracing all of them at once"""
+    sp_generator = get_seedpoint_generator(dipole_topology, template)
+    sp_generator.update_seed_points()
+    full = get_seedpoint_processor(dipole_topology)
+    full.set_seed_critical_pair(sp_generator.seed_critical_pair)
+    full.update_seed_point_info()
+
+    chunked = get_seedpoint_processor(dipole_topology)
+    chunked.update_seed_point_info_from_chunks(sp_generator.iter_seed_chunks(20))
+
+    pd.testing.assert_frame_equal(chunked.seedpoint_info.astype(str), full.seedpoint_info.astype(str))
+    np.testing.assert_array_equal(chunked.seed_critical_pair.owners, full.seed_critical_pair.owners)
+    # Both directions are traced per chunk, so only the order of the lines differs
+    np.testing.assert_array_equal(np.sort(chunked.fieldlines.seed_ids), np.sort(full.fieldlines.seed_ids))
+    np.testing.assert_array_equal(get_number_of_points_per_seed(chunked.fieldlines), get_number_of_points_per_seed(full.fieldlines))
+    np.testing.assert_array_equal(chunked.number_of_invalid_seed_points, full.number_of_invalid_seed_points)
+
+
+def test_chunks_to_file(dipole_topology, tmp_path, monkeypatch):
+    """With a filename the seedpoint info is written to the file instead of being kept"""
+    monkeypatch.chdir(tmp_path)
+    sp_generator = get_seedpoint_generator(dipole_topology, Template.SPHERICAL)
+    sp_generator.update_seed_points()
+    full = get_seedpoint_processor(dipole_topology)
+    full.set_seed_critical_pair(sp_generator.seed_critical_pair)
+    full.update_seed_point_info()
+
+    chunked = get_seedpoint_processor(dipole_topology)
+    chunked.update_seed_point_info_from_chunks(sp_generator.iter_seed_chunks(50), filename='chunked.csv')
+
+    saved = pd.read_csv(tmp_path / 'seed_points' / 'chunked.csv')
+    assert len(chunked.seedpoint_info) == 0
+    np.testing.assert_array_equal(saved['FieldlineStatus'], full.seedpoint_info['FieldlineStatus'].astype(str))
+
+
+def test_consumer_error_stops_producer(dipole_topology):
+    """An error while tracing a chunk is raised, and the background thread stops generating chunks"""
+    sp_generator = get_seedpoint_generator(dipole_topology, Template.SPHERICAL)
+    chunk = next(sp_generator.iter_seed_chunks(10))
+    number_of_produced_chunks = []
+
+    def seed_chunks():
+        for _ in range(1000):
+            number_of_produced_chunks.append(1)
+            yield chunk
+
+    def fail(seed_critical_pair):
+        raise RuntimeError("Tracing failed")
+
+    sp_processor = get_seedpoint_processor(dipole_topology)
+    sp_processor._SeedpointProcessor__get_seed_point_info = fail
+    number_of_threads = threading.active_count()
+
+    with pytest.raises(RuntimeError, match="Tracing failed"):
+        sp_processor.update_seed_point_info_from_chunks(seed_chunks(), queue_size=1)
+
+    assert threading.active_count() == number_of_threads
+    assert len(number_of_produced_chunks) < 1000
+
+
+def test_producer_error_is_raised(dipole_topology):
+    """An error while generating the chunks is raised in the calling thread"""
+    chunk = next(get_seedpoint_generator(dipole_topology, Template.SPHERICAL).iter_seed_chunks(10))
+
+    def seed_chunks():
+        yield chunk
+        raise ValueError("Generating failed")
+
+    with pytest.raises(ValueError, match="Generating failed"):
+        get_seedpoint_processor(dipole_topology).update_seed_point_info_from_chunks(seed_chunks())
+
+
+def test_no_template_raises(dipole_topology):
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+
+    with pytest.raises(ValueError, match="No template"):
+        sp_generator.update_seed_points()
+    with pytest.raises(ValueError, match="No template"):
+        next(sp_generator.iter_seed_chunks())
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from seedpoint_generator.seed_critical_pair import SeedCriticalPair
+
+
+def get_pair() -> SeedCriticalPair:
+    """Returns a mapping with 3 critical points, the second one without seed points"""
+    return SeedCriticalPair.from_pairs([
+        ((0., 0., 0.), [(0., 0., 1.), (0., 0., -1.)]),
+        ((5., 0., 0.), []),
+        ((9., 0., 0.), [(9., 1., 0.), (9., -1., 0.), (9., 0., 1.)]),
+    ])
+
+
+def test_from_pairs_offsets():
+    """The offsets point at the seed points of every critical point"""
+    pair = get_pair()
+
+    np.testing.assert_array_equal(pair.offsets, [0, 2, 2, 5])
+    np.testing.assert_array_equal(pair.get_number_of_seed_points(), [2, 0, 3])
+    np.testing.assert_array_equal(pair.get_seed_points(2), [(9., 1., 0.), (9., -1., 0.), (9., 0., 1.)])
+    assert len(pair.get_seed_points(1)) == 0
+    assert [len(seeds) for _, seeds in pair] == [2, 0, 3]
+
+
+def test_unsorted_owners_are_grouped():
+    """Seed points given in any owner order are grouped by owner, keeping their relative order"""
+    pair = SeedCriticalPair([(1., 0., 0.), (0., 0., 0.), (2., 0., 0.)], [1, 0, 1], [(0., 0., 0.), (1., 0., 0.)])
+
+    np.testing.assert_array_equal(pair.owners, [0, 1, 1])
+    np.testing.assert_array_equal(pair.get_seed_points(1), [(1., 0., 0.), (2., 0., 0.)])
+
+
+def test_mismatched_owners_raise():
+    with pytest.raises(ValueError):
+        SeedCriticalPair(np.zeros((3, 3)), [0, 0], [(0., 0., 0.)])
+
+
+def test_concatenate_shifts_owners_and_representatives():
+    """Concatenated mappings keep pointing at their own critical points and representatives"""
+    first, second = get_pair(), get_pair()
+    second.representatives = np.array([0, 0, 2, 2, 2])
+
+    pair = SeedCriticalPair.concatenate([first, second])
+
+    assert len(pair) == 6
+    np.testing.assert_array_equal(pair.offsets, [0, 2, 2, 5, 7, 7, 10])
+    np.testing.assert_array_equal(pair.representatives, [0, 1, 2, 3, 4, 5, 5, 7, 7, 7])
+    np.testing.assert_array_equal(pair.get_traced_seed_indices(), [0, 1, 2, 3, 4, 5, 7])
+    np.testing.assert_array_equal(pair.get_seed_points(5), second.get_seed_points(2))
+
+
+def test_to_polydata():
+    """The polydata has one vertex per seed point and the owner of every seed point"""
+    poly = get_pair().to_polydata()
+
+    assert poly.GetNumberOfPoints() == 5
+    assert poly.GetNumberOfVerts() == 5
+    np.testing.assert_array_equal(vtk_to_numpy(poly.GetPointData().GetArray('CriticalPointId')), [0, 0, 2, 2, 2])
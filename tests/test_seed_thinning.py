@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from seedpoint_generator.seedpoint_generator import SeedpointGenerator, Template
+from seedpoint_processor.seedpoint_processor import SeedpointProcessor
+from vectorfieldtopology import sampling
+
+
+@pytest.mark.parametrize('min_spacing', [0.05, 0.3, 1.0])
+def test_minimum_spacing_representatives(min_spacing):
+    """Every point is closer than min_spacing to its representative, and the representatives are at least min_spacing apart"""
+    points = np.random.default_rng(31).uniform(-2, 2, size=(2000, 3))
+
+    representatives = sampling.get_minimum_spacing_representatives(points, min_spacing)
+
+    kept = np.unique(representatives)
+    np.testing.assert_array_equal(representatives[kept], kept)
+    assert np.all(np.linalg.norm(points - points[representatives], axis=1) < min_spacing)
+    distances = np.linalg.norm(points[kept][:, None, :] - points[kept][None, :, :], axis=2)
+    np.fill_diagonal(distances, np.inf)
+    assert distances.min() >= min_spacing
+
+
+def test_thinned_seedpoints_share_status(dipole_topology):
+    """Only the representatives are traced, the other seedpoints get the status of their representative"""
+    sp_generator = SeedpointGenerator()
+    sp_generator.set_critical_point_info(dipole_topology.critical_points_info)
+    sp_generator.set_template(Template.SMART)
+    sp_generator.update_seed_points()
+    sp_generator.thin_seed_points(0.5)
+
+    pair = sp_generator.seed_critical_pair
+    assert len(pair.get_traced_seed_indices()) < len(pair.seed_points)
+
+    sp_processor = SeedpointProcessor()
+    sp_processor.set_seed_critical_pair(pair)
+    sp_processor.set_vector_field_domain(dipole_topology.vectorfield)
+    sp_processor.update_seed_point_info()
+
+    status = sp_processor.seedpoint_info['FieldlineStatus'].to_numpy()
+    assert len(status) == len(pair.seed_points)
+    np.testing.assert_array_equal(status, status[pair.representatives])
+    np.testing.assert_array_equal(np.unique(sp_processor.fieldlines.seed_ids), pair.get_traced_seed_indices())
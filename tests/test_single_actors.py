@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from seedpoint_generator import helpers as sg_helpers
+from seedpoint_processor import helpers
+from seedpoint_processor.seedpoint_processor import FieldlineStatus
+
+
+def test_fieldlines_polydata(traced_seedpoint_processor):
+    """All fieldlines are one polydata, with the status and critical point of their seedpoint as cell data"""
+    poly = traced_seedpoint_processor.get_fieldlines_polydata()
+
+    seed_ids = vtk_to_numpy(poly.GetCellData().GetArray('SeedIds'))
+    status = vtk_to_numpy(poly.GetCellData().GetArray('FieldlineStatus'))
+    assert poly.GetNumberOfCells() == len(traced_seedpoint_processor.fieldlines)
+    np.testing.assert_array_equal(status, helpers.get_enum_indices(traced_seedpoint_processor.seedpoint_info['FieldlineStatus'].to_numpy()[seed_ids], FieldlineStatus))
+    np.testing.assert_array_equal(vtk_to_numpy(poly.GetCellData().GetArray('CriticalPointId')), traced_seedpoint_processor.seed_critical_pair.owners[seed_ids])
+
+
+@pytest.mark.parametrize('fieldline_status', list(FieldlineStatus))
+def test_fieldlines_actor_status_filter(traced_seedpoint_processor, fieldline_status):
+    """The status filter of the single fieldline actor only keeps the fieldlines with that status"""
+    actor = traced_seedpoint_processor.get_fieldlines_actor(status=fieldline_status.value)
+    algorithm = actor.GetMapper().GetInputAlgorithm()
+    algorithm.Update()
+    output = algorithm.GetOutputDataObject(0)
+
+    status = traced_seedpoint_processor.seedpoint_info['FieldlineStatus'].to_numpy()[traced_seedpoint_processor.fieldlines.seed_ids]
+    assert output.GetNumberOfCells() == np.count_nonzero(status == fieldline_status.value)
+    if(output.GetNumberOfCells() > 0):
+        np.testing.assert_array_equal(vtk_to_numpy(output.GetCellData().GetArray('FieldlineStatus')), helpers.get_enum_indices([fieldline_status.value], FieldlineStatus)[0])
+
+
+def test_discs_actor():
+    """One actor holds every disc, each in the plane perpendicular to its normal"""
+    normals = np.array([[0., 0., 1.], [1., 0., 0.], [0., 1., 1.]])
+    centers = np.array([[0., 0., 0.], [5., 0., 0.], [0., 5., 5.]])
+
+    actor = sg_helpers.get_discs_actor(normals, centers, owners=[0, 0, 1])
+    poly = actor.GetMapper().GetInput()
+
+    points = vtk_to_numpy(poly.GetPoints().GetData()).reshape(3, -1, 3)
+    for disc_points, normal, center in zip(points, normals, centers):
+        np.testing.assert_allclose((disc_points - center) @ normal, 0, atol=1e-6)
+    critical_point_ids = vtk_to_numpy(poly.GetCellData().GetArray('CriticalPointId'))
+    np.testing.assert_array_equal(np.unique(critical_point_ids, return_counts=True)[1], [2*poly.GetNumberOfCells()//3, poly.GetNumberOfCells()//3])
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+from vtkmodules.vtkIOImage import vtkPNGReader
+
+from vectorfieldtopology.helpers import get_sphere_actor
+from vtk_visualization import constants
+from vtk_visualization.helpers import set_offscreen_rendering, start_window
+
+
+@pytest.fixture
+def snapshot_directory(tmp_path):
+    directory = str(tmp_path / 'snapshots')
+    set_offscreen_rendering(True, directory=directory, prefix='test')
+    yield directory
+    set_offscreen_rendering(False)
+
+
+def test_start_window_saves_every_view(snapshot_directory):
+    """With offscreen rendering every visualize() writes one PNG of the window size per camera view, numbered by a counter"""
+    actor = get_sphere_actor(radius=3, center=(0, 0, 0))
+
+    start_window([actor])
+    start_window([actor])
+
+    expected = [f"test_{counter:04d}_{view}.png" for counter in range(2) for view in constants.CAMERA_VIEWS]
+    assert sorted(os.listdir(snapshot_directory)) == sorted(expected)
+
+    reader = vtkPNGReader()
+    reader.SetFileName(os.path.join(snapshot_directory, expected[0]))
+    reader.Update()
+    assert reader.GetOutput().GetDimensions()[:2] == constants.WINDOW_SIZE
+
+
+def test_unknown_view_raises():
+    with pytest.raises(ValueError, match="Unknown camera view"):
+        set_offscreen_rendering(True, views=['top'])
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from vtkmodules.vtkFiltersSources import vtkDiskSource, vtkSphereSource
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from seedpoint_generator import template_engine
+
+
+@pytest.mark.parametrize('theta_resolution, phi_resolution', [(3, 3), (8, 5)])
+def test_unit_sphere_template_matches_vtk(theta_resolution, phi_resolution):
+    """The sphere template has the same points, in the same order, as vtkSphereSource"""
+    sphere = vtkSphereSource()
+    sphere.SetThetaResolution(theta_resolution)
+    sphere.SetPhiResolution(phi_resolution)
+    sphere.SetRadius(0.5)
+    sphere.Update()
+
+    template = template_engine.get_unit_sphere_template(theta_resolution, phi_resolution, 0.5)
+
+    np.testing.assert_allclose(template, vtk_to_numpy(sphere.GetOutput().GetPoints().GetData()), atol=1e-6)
+
+
+def test_unit_disc_template_matches_vtk():
+    """The disc template has the same points as vtkDiskSource"""
+    disc = vtkDiskSource()
+    disc.SetInnerRadius(0.01)
+    disc.SetOuterRadius(0.5)
+    disc.SetRadialResolution(2)
+    disc.SetCircumferentialResolution(12)
+    disc.Update()
+
+    template = template_engine.get_unit_disc_template(0.01, 0.5, 2, 12)
+
+    np.testing.assert_allclose(template, vtk_to_numpy(disc.GetOutput().GetPoints().GetData()), atol=1e-6)
+
+
+def test_place_template_owners():
+    """Every center gets a copy of the template, and the seeds are owned by their center"""
+    centers = np.array([[0., 0., 0.], [10., 0., 0.]])
+    template = template_engine.get_unit_sphere_template(3, 3, 0.5)
+
+    seeds, owners = template_engine.place_template(centers, template)
+
+    assert seeds.shape == (2*len(template), 3)
+    np.testing.assert_array_equal(owners, np.repeat([0, 1], len(template)))
+    np.testing.assert_allclose(np.linalg.norm(seeds - centers[owners], axis=1), 0.5)
+
+
+def test_eigen_plane_normals_are_eigen_vectors():
+    """The plane normals are the eigen vectors of the gradients, not the rows of the eigen vector matrix"""
+    gradients = np.random.default_rng(27).normal(size=(5, 3, 3))
+    gradients = gradients + np.transpose(gradients, (0, 2, 1))
+
+    normals = template_engine.get_eigen_plane_normals(gradients.reshape(-1, 9)).reshape(-1, 3, 3)
+
+    for gradient, vectors in zip(gradients, normals):
+        eig_val = np.linalg.eigvals(gradient)
+        for vector in vectors:
+            rayleigh = vector @ gradient @ vector
+            np.testing.assert_allclose(gradient @ vector, rayleigh*vector, atol=1e-9)
+            assert np.min(np.abs(eig_val - rayleigh)) < 1e-9
+
+
+def test_tripple_eigen_plane_discs_are_perpendicular_to_normals():
+    """Every disc of the TRIPPLE_EIGEN_PLANE template lies in the plane perpendicular to its eigen vector"""
+    gradient = np.diag([1., 2., 3.]).reshape(1, 9)
+    center = np.array([[1., 2., 3.]])
+
+    seeds, owners = template_engine.get_tripple_eigen_plane_seed_points(center, gradient)
+
+    np.testing.assert_array_equal(owners, 0)
+    normals = template_engine.get_eigen_plane_normals(gradient)
+    for disc, normal in zip(np.split(seeds - center, 3), normals):
+        np.testing.assert_allclose(disc @ normal, 0, atol=1e-12)
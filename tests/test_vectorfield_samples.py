@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from vtkmodules.vtkCommonDataModel import vtkImageData
+from vtkmodules.util.numpy_support import vtk_to_numpy
+
+from vectorfieldtopology import helpers, sampling
+from vectorfieldtopology.vectorfieldtopology import VectorFieldTopology
+
+
+def test_voxel_representatives():
+    """The first point of every voxel is kept, and every point is mapped to the kept point of its voxel"""
+    points = np.random.default_rng(44).uniform(-5, 5, size=(500, 3))
+
+    kept, representatives = sampling.get_voxel_representatives(points, 2.0)
+
+    voxels = np.floor(points/2.0)
+    assert len(kept) == len(np.unique(voxels, axis=0))
+    np.testing.assert_array_equal(voxels[representatives], voxels)
+    assert np.all(representatives <= np.arange(len(points)))
+    np.testing.assert_array_equal(np.unique(representatives), kept)
+
+
+def test_image_data_points():
+    image = vtkImageData()
+    image.SetDimensions(4, 3, 2)
+    image.SetOrigin(1., 2., 3.)
+    image.SetSpacing(0.5, 1., 2.)
+
+    np.testing.assert_array_equal(helpers.get_dataset_points(image), [image.GetPoint(i) for i in range(image.GetNumberOfPoints())])
+
+
+def test_vector_field_samples(dipole_topology):
+    """Every level of detail is a subset of the vectorfield points with their vectors, with fewer points than the level before"""
+    vectorfield = dipole_topology.vectorfield
+    points = vtk_to_numpy(vectorfield.GetPoints().GetData())
+    vectors = vtk_to_numpy(vectorfield.GetPointData().GetVectors())
+
+    list_of_samples = helpers.get_vector_field_samples(vectorfield, (1000, 250, 60))
+
+    numbers_of_points = [samples.GetNumberOfPoints() for samples in list_of_samples]
+    assert numbers_of_points == sorted(numbers_of_points, reverse=True)
+    assert 250 <= numbers_of_points[0] <= 4000
+    for samples in list_of_samples:
+        sampled_points = vtk_to_numpy(samples.GetPoints().GetData())
+        indices = np.array([np.flatnonzero(np.all(points == point, axis=1))[0] for point in sampled_points])
+        np.testing.assert_array_equal(vtk_to_numpy(samples.GetPointData().GetVectors()), vectors[indices])
+
+
+def test_vector_field_samples_are_cached(dipole_topology):
+    """The samples are only computed again when the vectorfield changes"""
+    vft = VectorFieldTopology()
+    vectorfield = dipole_topology.vectorfield.NewInstance()
+    vectorfield.DeepCopy(dipole_topology.vectorfield)
+    vft.update_vectorfield_from_vectors(vectorfield)
+
+    list_of_samples = vft.get_vectorfield_samples()
+    assert vft.get_vectorfield_samples() is list_of_samples
+
+    vectorfield.Modified()
+    assert vft.get_vectorfield_samples() is not list_of_samples
+
+
+def test_vector_field_actor_levels(dipole_topology):
+    """The most detailed samples are the mapper of the LOD actor, the others are LOD mappers"""
+    list_of_samples = helpers.get_vector_field_samples(dipole_topology.vectorfield, (1000, 250, 60))
+
+    actor = helpers.get_vector_field_actor(list_of_samples)
+
+    assert actor.GetLODMappers().GetNumberOfItems() == 2
+    assert actor.GetMapper().GetInputAlgorithm().GetInputDataObject(0, 0) is list_of_samples[0]
+
+
+def test_vector_field_without_vectors_raises():
+    with pytest.raises(ValueError, match="no vectors"):
+        helpers.get_vector_field_samples(vtkImageData())
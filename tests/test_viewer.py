@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from seedpoint_processor import constants
+from seedpoint_processor.seedpoint_processor import FieldlineStatus
+from vtk_visualization.viewer import ViewerSession
+
+
+@pytest.fixture
+def viewer(traced_seedpoint_processor) -> ViewerSession:
+    viewer = ViewerSession()
+    traced_seedpoint_processor.add_to_viewer(viewer)
+    return viewer
+
+
+def press(viewer: ViewerSession, key: str) -> None:
+    """Runs the callback of a key binding, like a key press in the window"""
+    viewer.key_bindings[key][1]()
+
+
+def get_number_of_fieldlines(viewer: ViewerSession, fieldline_status: FieldlineStatus) -> int:
+    threshold = viewer.thresholds[f"fieldlines_{fieldline_status.value.lower()}"]
+    threshold.Update()
+    return threshold.GetOutput().GetNumberOfCells()
+
+
+def test_layers_and_keys(viewer):
+    """Every FieldlineStatus is a layer that its key toggles"""
+    assert list(viewer.layers) == [f"fieldlines_{fieldline_status.value.lower()}" for fieldline_status in FieldlineStatus] + ['earth']
+
+    press(viewer, constants.FIELDLINE_STATUS_KEYS['CLOSED'])
+    assert not viewer.is_layer_visible('fieldlines_closed')
+    assert viewer.is_layer_visible('fieldlines_imf')
+
+    press(viewer, constants.FIELDLINE_STATUS_KEYS['CLOSED'])
+    assert viewer.is_layer_visible('fieldlines_closed')
+
+
+def test_side_keys_change_the_threshold(viewer, traced_seedpoint_processor):
+    """The side keys only change the shared threshold, the fieldlines of every layer are filtered without tracing again"""
+    info = traced_seedpoint_processor.seedpoint_info.loc[traced_seedpoint_processor.fieldlines.seed_ids]
+
+    for side, key in constants.EARTH_SIDE_KEYS.items():
+        press(viewer, key)
+        for fieldline_status in FieldlineStatus:
+            is_shown = (info['FieldlineStatus'] == fieldline_status.value) & ((info['EarthSide'] == side) if side is not None else True)
+            assert get_number_of_fieldlines(viewer, fieldline_status) == np.count_nonzero(is_shown)
+
+
+def test_replaced_layer_is_removed(viewer):
+    actors = viewer.layers['earth']
+    viewer.add_layer('earth', actors[:1])
+
+    assert viewer.renderer.GetViewProps().IsItemPresent(actors[1]) == 0
+    assert viewer.layers['earth'] == actors[:1]
+
+
+def test_reserved_and_unknown_names_raise(viewer):
+    with pytest.raises(ValueError):
+        viewer.bind_key('q', lambda: None)
+    with pytest.raises(ValueError):
+        viewer.toggle_layer('missing')
+    with pytest.raises(ValueError):
+        viewer.set_threshold_range('missing', 0, 1)
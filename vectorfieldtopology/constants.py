@@ -27,3 +27,24 @@ DETAILED_TYPES = dict([
      (8,'CENTER_DETAILED_3D')
 ]) 
 
+
+# Name of the gradient array of the vectorfield. Used in get_gradient_at_points()
+GRADIENT_ARRAY_NAME = 'Gradient'
+
+# Plasma beta points of interest. Used in derived_fields.py
+MU_0 = 1.25663706e-6
+PRESSURE_ARRAY_NAME = 'P [nPa]'
+MAGNETIC_FIELD_ARRAY_NAMES = ('B_x [nT]', 'B_y [nT]', 'B_z [nT]')
+PLASMA_BETA_ARRAY_NAME = 'plasmabeta'
+PLASMA_BETA_THRESHOLD = -12
+
+# Derived fields. Used in DerivedFieldRegistry
+VECTORFIELD_ARRAY_NAME = 'Vectorfield'
+MAGNETIC_FIELD_MAGNITUDE_ARRAY_NAME = '|B|'
+DERIVED_FIELD_CACHE_SIZE = 1024**3
+
+# Approximate number of vector glyphs of every level of detail, most detailed first. Used in get_vectorfield_samples()
+VECTORFIELD_LOD_NUMBER_OF_POINTS = (1000, 250, 60)
+
+# Number of files read ahead in the background. Used in PrefetchingReader
+PREFETCH_DEPTH = 1
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from vtkmodules.vtkCommonCore import vtkDataArray
+from vtkmodules.vtkCommonDataModel import vtkDataObject, vtkDataSet
+from vtkmodules.vtkFiltersCore import vtkContourFilter
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from vectorfieldtopology import constants
+
+
+def get_plasma_beta(pressure: np.ndarray, magnetic_field: np.ndarray) -> np.ndarray:
+    """Returns the (N,3) plasma beta of every magnetic field component, P/(B_i^2/(2*MU_0)). Zero components give inf.
+    :pressure: (N,) pressure
+    :magnetic_field: (N,3) magnetic field
+    """
+    pressure = np.asarray(pressure, dtype=float).reshape(-1, 1)
+    magnetic_field = np.asarray(magnetic_field, dtype=float).reshape(-1, 3)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pressure/(magnetic_field**2/(2*constants.MU_0))
+
+
+def get_log_plasma_beta(pressure: np.ndarray, magnetic_field: np.ndarray) -> np.ndarray:
+    """Returns the natural logarithm of get_plasma_beta()"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(get_plasma_beta(pressure, magnetic_field))
+
+
+def get_magnetic_field(data_object: vtkDataSet, scalar_names: Tuple[str, str, str] = constants.MAGNETIC_FIELD_ARRAY_NAMES) -> np.ndarray:
+    """Returns the (N,3) magnetic field from the three scalar arrays of the data object"""
+    point_data = data_object.GetPointData()
+    for name in scalar_names:
+        if(point_data.GetArray(name) is None):
+            raise ValueError(f"Array '{name}' not found in the data object")
+
+    return np.column_stack([vtk_to_numpy(point_data.GetArray(name)) for name in scalar_names])
+
+
+def get_plasma_beta_points_of_interest(data_object: vtkDataSet, threshold: float = constants.PLASMA_BETA_THRESHOLD, pressure_name: str = constants.PRESSURE_ARRAY_NAME, scalar_names: Tuple[str, str, str] = constants.MAGNETIC_FIELD_ARRAY_NAMES, log_plasma_beta: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Returns the (N,3) points of interest of the plasma beta pipeline. Same as alternate_pipeline/plasmabeta_poi_extraction.py, without ParaView.
+    The B_z = 0 surface is contoured and the points where any component of ln(plasma beta) is at least threshold are kept.
+    :data_object: Dataset with pressure and magnetic field arrays
+    :threshold: Threshold of ln(plasma beta)
+    :log_plasma_beta: Already computed (N,3) ln(plasma beta) of the data object (optional), e.g. from a DerivedFieldRegistry
+    """
+    if(log_plasma_beta is None):
+        point_data = data_object.GetPointData()
+        if(point_data.GetArray(pressure_name) is None):
+            raise ValueError(f"Array '{pressure_name}' not found in the data object")
+
+        pressure = vtk_to_numpy(point_data.GetArray(pressure_name))
+        log_plasma_beta = get_log_plasma_beta(pressure, get_magnetic_field(data_object, scalar_names))
+
+    # Shallow copy so the plasma beta array is not added to the given data object
+    dataset = data_object.NewInstance()
+    dataset.ShallowCopy(data_object)
+    log_plasma_beta_array = numpy_to_vtk(np.ascontiguousarray(log_plasma_beta), deep=False)
+    log_plasma_beta_array.SetName(constants.PLASMA_BETA_ARRAY_NAME)
+    dataset.GetPointData().AddArray(log_plasma_beta_array)
+
+    contour = vtkContourFilter()
+    contour.SetInputData(dataset)
+    contour.SetInputArrayToProcess(0, 0, 0, vtkDataObject.FIELD_ASSOCIATION_POINTS, scalar_names[2])
+    contour.SetValue(0, 0.0)
+    contour.SetComputeScalars(False)
+    contour.Update()
+
+    output = contour.GetOutput()
+    if(output.GetNumberOfPoints() == 0):
+        logging.info("The B_z = 0 contour is empty, no points of interest found.")
+        return np.empty((0, 3))
+
+    points = vtk_to_numpy(output.GetPoints().GetData())
+    contour_log_plasma_beta = vtk_to_numpy(output.GetPointData().GetArray(constants.PLASMA_BETA_ARRAY_NAME)).reshape(-1, 3)
+    is_selected = np.any(contour_log_plasma_beta >= threshold, axis=1)
+
+    logging.info(f"Found {np.count_nonzero(is_selected)} points of interest of {len(points)} contour points.")
+    return points[is_selected].astype(float)
+
+
+class DerivedFieldRegistry():
+    """
+    Fields derived from the point data arrays of a data object. A field is a function of loaded arrays or other derived fields,
+    computed the first time it is requested and cached until the data object is modified. The least recently used fields
+    are evicted when the cache grows larger than max_bytes.
+    """
+
+    def __init__(self, data_object: vtkDataSet, max_bytes: int = constants.DERIVED_FIELD_CACHE_SIZE):
+        self.data_object = data_object
+        self.max_bytes = max_bytes
+        self.definitions: Dict[str, Tuple[Callable[..., np.ndarray], Tuple[str, ...]]] = {}
+        self.__cache: OrderedDict = OrderedDict()
+        self.__cache_mtime = None
+
+    def register(self, name: str, function: Callable[..., np.ndarray], dependencies: List[str]) -> None:
+        """Defines a derived field. Replaces an existing definition with the same name.
+        :name: Name of the field, also used as the name of the VTK array
+        :function: NumPy function that gets the dependencies as arrays, in order, and returns the field
+        :dependencies: Names of point data arrays or other derived fields
+        """
+        self.definitions[name] = (function, tuple(dependencies))
+        self.__cache.pop(name, None)
+
+    def get(self, name: str) -> np.ndarray:
+        """Returns the field as a numpy array. Derived fields are computed if they aren't cached, loaded arrays are returned without copying"""
+        if(self.__cache_mtime != self.data_object.GetMTime()):
+            self.clear()
+            self.__cache_mtime = self.data_object.GetMTime()
+
+        if(name in self.__cache):
+            self.__cache.move_to_end(name)
+            return self.__cache[name]
+
+        if(name not in self.definitions):
+            array = self.data_object.GetPointData().GetArray(name)
+            if(array is None):
+                raise ValueError(f"'{name}' is neither a derived field nor an array of the data object")
+            return vtk_to_numpy(array)
+
+        function, dependencies = self.definitions[name]
+        field = np.ascontiguousarray(function(*[self.get(dependency) for dependency in dependencies]))
+        field.flags.writeable = False
+        self.__add_to_cache(name, field)
+        return field
+
+    def get_vtk_array(self, name: str) -> vtkDataArray:
+        """Returns the field as a VTK array that shares the memory of the cached numpy array"""
+        array = numpy_to_vtk(self.get(name), deep=False)
+        array.SetName(name)
+        return array
+
+    def get_dataset(self, names: List[str]) -> vtkDataSet:
+        """Returns a shallow copy of the data object with the given fields added as point data arrays. The data object itself is not changed."""
+        dataset = self.data_object.NewInstance()
+        dataset.ShallowCopy(self.data_object)
+        for name in names:
+            dataset.GetPointData().AddArray(self.get_vtk_array(name))
+        return dataset
+
+    def get_cache_size(self) -> int:
+        """Returns the number of bytes of the cached fields"""
+        return sum(field.nbytes for field in self.__cache.values())
+
+    def clear(self) -> None:
+        """Empties the cache"""
+        self.__cache.clear()
+
+    def __add_to_cache(self, name: str, field: np.ndarray) -> None:
+        if(field.nbytes > self.max_bytes):
+            logging.info(f"Derived field '{name}' is larger than the cache and is not cached.")
+            return
+
+        self.__cache[name] = field
+        while(self.get_cache_size() > self.max_bytes):
+            evicted, _ = self.__cache.popitem(last=False)
+            logging.debug(f"Evicted derived field '{evicted}' from the cache.")
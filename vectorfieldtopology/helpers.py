@@ -1,19 +1,120 @@
 import logging
-from typing import Tuple
-from vtkmodules.vtkRenderingCore import (
-    vtkActor,
-    vtkPolyDataMapper
-)
-from vtk import vtkVectorFieldTopology, vtkMaskPoints, vtkDataSetMapper, vtkGlyph3D, vtkArrowSource, vtkSphereSource, vtkNamedColors
+import os
+import zipfile
+from typing import TYPE_CHECKING, Dict, List, Tuple
 
+import numpy as np
+import pandas as pd
+from vtkmodules.vtkCommonColor import vtkNamedColors
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkCellArray, vtkDataSet, vtkImageData, vtkPolyData, vtkUnstructuredGrid
+from vtkmodules.vtkFiltersCore import vtkGlyph3D
+from vtkmodules.vtkFiltersFlowPaths import vtkVectorFieldTopology
+from vtkmodules.vtkFiltersSources import vtkArrowSource, vtkSphereSource
+from vtkmodules.vtkIOGeometry import vtkTecplotReader
+from vtkmodules.vtkIOXML import vtkXMLUnstructuredGridReader
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
+from vectorfieldtopology import constants, sampling
+from vtk_visualization.helpers import load_rendering_modules
+
+if TYPE_CHECKING:
+    from vtkmodules.vtkRenderingCore import vtkActor
+    from vtkmodules.vtkRenderingLOD import vtkLODActor
+
+
+def read_data_object(filename: str, rename_xyz: bool = False) -> vtkUnstructuredGrid:
+    """Reads a .dat or .vtu file and returns the data as an unstructured grid
+    :filename: Path to file
+    :rename_xyz: Renames 'X [R]', 'Y [R]' and 'Z [R]' in the header of a .dat file to X, Y and Z
+    """
+    # Write this if statement to rename the file header before opening it with vtk, since vtk needs X,Y,Z variables.
+    if(rename_xyz):
+        a_file = open(filename, "r")
+        list_of_lines = a_file.readlines()
+        a_file.close()
+        header = list_of_lines[1].replace("X [R]", "X").replace("Y [R]", "Y").replace("Z [R]", "Z")
+
+        # Only rewritten when the header changes, so the file stat stays the same for the pipeline cache
+        if(header != list_of_lines[1]):
+            list_of_lines[1] = header
+            a_file = open(filename, "w")
+            a_file.writelines(list_of_lines)
+            a_file.close()
+
+    if(not os.path.exists(filename)):
+        raise FileNotFoundError()
+
+    data_object = vtkUnstructuredGrid()
+    if(filename.endswith('.dat')):
+        reader = vtkTecplotReader()
+        reader.SetFileName(filename)
+        reader.Update()
+        data_object.ShallowCopy(reader.GetOutput().GetBlock(0))
+
+    elif(filename.endswith('.vtu')):
+        reader = vtkXMLUnstructuredGridReader()
+        reader.SetFileName(filename)
+        reader.Update()
+        data_object.ShallowCopy(reader.GetOutput())
+
+    else:
+        raise ValueError(f"Can't read '{filename}'. Only .dat and .vtu files are supported")
+
+    logging.info("Read file done.")
+    return data_object
+
+
+def get_unstructured_grid_arrays(data_object: vtkUnstructuredGrid) -> Dict[str, object]:
+    """Returns the points, cells and point and cell data of an unstructured grid as numpy arrays, e.g. to send it to another process"""
+    arrays = {
+        'points': vtk_to_numpy(data_object.GetPoints().GetData()) if data_object.GetPoints() is not None else np.empty((0, 3)),
+        'offsets': vtk_to_numpy(data_object.GetCells().GetOffsetsArray()),
+        'connectivity': vtk_to_numpy(data_object.GetCells().GetConnectivityArray()),
+        'cell_types': vtk_to_numpy(data_object.GetCellTypesArray()) if data_object.GetCellTypesArray() is not None else np.empty(0, dtype=np.uint8),
+    }
+
+    for association, data in [('point_data', data_object.GetPointData()), ('cell_data', data_object.GetCellData())]:
+        arrays[association] = {data.GetArrayName(i): vtk_to_numpy(data.GetArray(i)) for i in range(data.GetNumberOfArrays()) if data.GetArray(i) is not None}
+
+    return arrays
+
+
+def get_unstructured_grid_from_arrays(arrays: Dict[str, object]) -> vtkUnstructuredGrid:
+    """Returns the unstructured grid of get_unstructured_grid_arrays(). The arrays are copied into the grid."""
+    data_object = vtkUnstructuredGrid()
+
+    points = vtkPoints()
+    points.SetData(numpy_to_vtk(np.ascontiguousarray(arrays['points']), deep=True))
+    data_object.SetPoints(points)
+
+    if(len(arrays['cell_types']) > 0):
+        cells = vtkCellArray()
+        cells.SetData(numpy_to_vtk(arrays['offsets'], deep=True), numpy_to_vtk(arrays['connectivity'], deep=True))
+        data_object.SetCells(numpy_to_vtk(arrays['cell_types'], deep=True), cells)
+
+    for association, data in [('point_data', data_object.GetPointData()), ('cell_data', data_object.GetCellData())]:
+        for name, values in arrays[association].items():
+            array = numpy_to_vtk(np.ascontiguousarray(values), deep=True)
+            array.SetName(name)
+            data.AddArray(array)
+
+    return data_object
+
+
+def read_data_object_arrays(filename: str, rename_xyz: bool = False) -> Dict[str, object]:
+    """Same as read_data_object(), but returns the arrays of get_unstructured_grid_arrays(). Used by PrefetchingReader in its background process."""
+    return get_unstructured_grid_arrays(read_data_object(filename, rename_xyz))
+
+
+def get_critical_point_actor(vft: vtkVectorFieldTopology) -> 'vtkActor':
+    rendering = load_rendering_modules()
 
-def get_critical_point_actor(vft: vtkVectorFieldTopology) -> vtkActor:
     # The critical points
     colors = vtkNamedColors()
-    pointMapper = vtkDataSetMapper()
+    pointMapper = rendering.vtkDataSetMapper()
     pointMapper.SetInputConnection(vft.GetOutputPort(0))
 
-    pointActor = vtkActor()
+    pointActor = rendering.vtkActor()
     pointActor.SetMapper(pointMapper)
     pointActor.GetProperty().SetColor(colors.GetColor3d("Red"))
     pointActor.GetProperty().SetPointSize(5.)
@@ -21,74 +122,202 @@ def get_critical_point_actor(vft: vtkVectorFieldTopology) -> vtkActor:
     return pointActor
 
 
-def get_separator_actor(vft: vtkVectorFieldTopology) -> vtkActor:
+def get_critical_point_actor_from_points(critical_points: List[Tuple[float, float, float]]) -> 'vtkActor':
+    """Same as get_critical_point_actor(), but from a list of critical points, e.g. a critical point info loaded from the pipeline cache"""
+    rendering = load_rendering_modules()
+
+    points = vtkPoints()
+    points.SetData(numpy_to_vtk(np.asarray(critical_points, dtype=float).reshape(-1, 3), deep=True))
+    vertices = vtkCellArray()
+    vertices.SetData(numpy_to_vtk(np.arange(points.GetNumberOfPoints()+1, dtype=np.int64), deep=True), numpy_to_vtk(np.arange(points.GetNumberOfPoints(), dtype=np.int64), deep=True))
+    polydata = vtkPolyData()
+    polydata.SetPoints(points)
+    polydata.SetVerts(vertices)
+
+    colors = vtkNamedColors()
+    pointMapper = rendering.vtkDataSetMapper()
+    pointMapper.SetInputData(polydata)
+
+    pointActor = rendering.vtkActor()
+    pointActor.SetMapper(pointMapper)
+    pointActor.GetProperty().SetColor(colors.GetColor3d("Red"))
+    pointActor.GetProperty().SetPointSize(5.)
+    pointActor.GetProperty().SetRenderPointsAsSpheres(True)
+    return pointActor
+
+
+def get_separator_actor(vft: vtkVectorFieldTopology) -> 'vtkActor':
+    rendering = load_rendering_modules()
+
     # The separating lines
-    lineMapper = vtkDataSetMapper()
+    lineMapper = rendering.vtkDataSetMapper()
     lineMapper.SetInputConnection(vft.GetOutputPort(1))
 
-    lineActor = vtkActor()
+    lineActor = rendering.vtkActor()
     lineActor.SetMapper(lineMapper)
     lineActor.GetProperty().SetColor(0.2, 0.2, 0.2)
     lineActor.GetProperty().SetLineWidth(5.)
     lineActor.GetProperty().SetRenderLinesAsTubes(True)
     return lineActor
 
-def get_separatrix_surface(vft: vtkVectorFieldTopology) -> vtkActor:
-    surfaceMapper = vtkDataSetMapper()
+def get_separatrix_surface(vft: vtkVectorFieldTopology) -> 'vtkActor':
+    rendering = load_rendering_modules()
+
+    surfaceMapper = rendering.vtkDataSetMapper()
     surfaceMapper.SetInputConnection(vft.GetOutputPort(2))
 
-    surfaceActor = vtkActor()
+    surfaceActor = rendering.vtkActor()
     surfaceActor.SetMapper(surfaceMapper)
     surfaceActor.GetProperty().SetColor(0.1, 0.1, 0.1)
     surfaceActor.GetProperty().SetRepresentationToWireframe()
     return surfaceActor
 
-def get_vector_field_actor(vectorfield) -> vtkActor:
+def get_dataset_points(dataset: vtkDataSet) -> np.ndarray:
+    """Returns the (N,3) points of a point set or image data"""
+    if(isinstance(dataset, vtkImageData)):
+        dimensions, origin, spacing = dataset.GetDimensions(), dataset.GetOrigin(), dataset.GetSpacing()
+        axes = [origin[i] + spacing[i]*np.arange(dimensions[i]) for i in range(3)]
+        # x is the fastest changing index of image data
+        z, y, x = np.meshgrid(axes[2], axes[1], axes[0], indexing='ij')
+        return np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+
+    if(dataset.GetNumberOfPoints() == 0):
+        return np.empty((0, 3))
+
+    return vtk_to_numpy(dataset.GetPoints().GetData()).reshape(-1, 3)
+
+
+def get_vector_field_samples(vectorfield: vtkDataSet, numbers_of_points: Tuple[int, ...] = constants.VECTORFIELD_LOD_NUMBER_OF_POINTS) -> List[vtkPolyData]:
+    """
+    Returns spatially stratified samples of the vectorfield, one vtkPolyData with vectors for every level of detail.
+    The bounding box is split into voxels and the first point of every voxel is kept, so the samples are reproducible.
+    :vectorfield: Dataset with vectors
+    :numbers_of_points: Approximate number of points of every level, the number of voxels in the bounding box
+    """
+    vectors = vectorfield.GetPointData().GetVectors()
+    if(vectors is None):
+        raise ValueError("The vectorfield has no vectors. Update the vectorfield first")
+
+    points = get_dataset_points(vectorfield)
+    vectors = vtk_to_numpy(vectors).reshape(-1, 3)
+
+    bounds = np.asarray(vectorfield.GetBounds(), dtype=float).reshape(3, 2)
+    extent = bounds[:, 1] - bounds[:, 0]
+    extent = extent[extent > 0]
+
+    list_of_samples = []
+    for number_of_points in numbers_of_points:
+        voxel_size = (np.prod(extent)/number_of_points)**(1/len(extent)) if len(extent) > 0 else 1.0
+        kept, _ = sampling.get_voxel_representatives(points, voxel_size)
+
+        vtk_points = vtkPoints()
+        vtk_points.SetData(numpy_to_vtk(points[kept], deep=True))
+        vtk_vectors = numpy_to_vtk(vectors[kept], deep=True)
+        vtk_vectors.SetName(constants.VECTORFIELD_ARRAY_NAME)
+
+        samples = vtkPolyData()
+        samples.SetPoints(vtk_points)
+        samples.GetPointData().SetVectors(vtk_vectors)
+        list_of_samples.append(samples)
+
+        logging.info(f"Sampled {len(kept)} of {len(points)} vectorfield points with voxel size {voxel_size:.3f}.")
+
+    return list_of_samples
+
+
+def get_vector_field_actor(list_of_samples: List[vtkPolyData]) -> 'vtkLODActor':
+    """Returns a level of detail actor with arrow glyphs. The first samples are rendered when there is time, the others while interacting.
+    :list_of_samples: Samples from get_vector_field_samples(), most detailed first
+    """
+    rendering = load_rendering_modules()
+
     # Create the glyphs source
     arrowSource = vtkArrowSource()
 
-    # Create the mask (not wanting every single value)
-    ptMask = vtkMaskPoints()
-    ptMask.SetInputData(vectorfield)
-    ptMask.RandomModeOn()
-    ptMask.SetMaximumNumberOfPoints(1000)
-
-    # Create 3D Glyphs
-    glyph3D = vtkGlyph3D()
-    glyph3D.SetSourceConnection(arrowSource.GetOutputPort())
-    glyph3D.SetInputConnection(ptMask.GetOutputPort())
-    glyph3D.SetVectorModeToUseVector()
-    glyph3D.SetScaleModeToDataScalingOff()
-    
-    glyph3D.SetScaleFactor(1.5)
-    glyph3D.Update()
-
-    # Visualize
-    mapper = vtkPolyDataMapper()
-    mapper.SetInputConnection(glyph3D.GetOutputPort())
-
-    actor = vtkActor()
-    actor.SetMapper(mapper)
+    list_of_mappers = []
+    for samples in list_of_samples:
+        # Create 3D Glyphs
+        glyph3D = vtkGlyph3D()
+        glyph3D.SetSourceConnection(arrowSource.GetOutputPort())
+        glyph3D.SetInputData(samples)
+        glyph3D.SetVectorModeToUseVector()
+        glyph3D.SetScaleModeToDataScalingOff()
+        glyph3D.SetScaleFactor(1.5)
+
+        mapper = rendering.vtkPolyDataMapper()
+        mapper.SetInputConnection(glyph3D.GetOutputPort())
+        list_of_mappers.append(mapper)
+
+    # Visualize. With LOD mappers the actor doesn't build its own random point clouds.
+    actor = rendering.vtkLODActor()
+    actor.SetMapper(list_of_mappers[0])
+    for mapper in list_of_mappers[1:]:
+        actor.AddLODMapper(mapper)
+
     actor.GetProperty().SetColor(0,1,1)
     actor.GetProperty().SetOpacity(0.5)
 
     return actor
 
-def get_sphere_actor(radius: float, center: Tuple[float, float, float], color: Tuple[float, float, float] = (0.,0.,1.), opacity: float = 1) -> vtkActor:
+def get_sphere_actor(radius: float, center: Tuple[float, float, float], color: Tuple[float, float, float] = (0.,0.,1.), opacity: float = 1) -> 'vtkActor':
+    rendering = load_rendering_modules()
+
     source = vtkSphereSource()
     source.SetCenter(center)
     source.SetRadius(radius)
      
     # mapper
-    mapper = vtkPolyDataMapper()
+    mapper = rendering.vtkPolyDataMapper()
     mapper.SetInputConnection(source.GetOutputPort())
      
     # actor
-    actor = vtkActor()
+    actor = rendering.vtkActor()
     actor.SetMapper(mapper)
     actor.GetProperty().SetColor(color[0],color[1],color[2])
     actor.GetProperty().SetOpacity(opacity)
     return actor
 
 
-    
\ No newline at end of file
+def save_critical_points_info(filename: str, critical_points_info: List[Dict]) -> None:
+    """Writes the critical point info to file. The format is picked from the extension.
+    '.npz' stores every key as a column and keeps 'Gradient' as a (N,9) float array, anything else is written as csv.
+    :filename: Path to the output file (String)
+    :critical_points_info: List of critical point info dictionaries
+    """
+    df = pd.DataFrame(critical_points_info)
+
+    if(filename.endswith('.npz')):
+        columns = {}
+        for key in df.columns:
+            if(key == 'Gradient'):
+                columns[key] = np.array([np.asarray(g, dtype=float).reshape(9) for g in df[key]], dtype=float).reshape(-1, 9)
+            else:
+                columns[key] = df[key].to_numpy()
+                if(columns[key].dtype == object):
+                    columns[key] = columns[key].astype(str)
+        np.savez(filename, **columns)
+    else:
+        # repr() of a float is the shortest string that reads back to the same float, str() of an array rounds to 8 digits
+        if('Gradient' in df.columns):
+            df['Gradient'] = ['[' + ' '.join(repr(value) for value in np.asarray(g, dtype=float).reshape(-1).tolist()) + ']' for g in df['Gradient']]
+        df.to_csv(filename, index=False)
+
+
+def load_critical_points_info(filename: str) -> List[Dict]:
+    """Reads critical point info written by save_critical_points_info(). Detects .npz and csv files automatically.
+    A stringified 'Gradient' column in a csv file is parsed back to float arrays.
+    :filename: Path to the .npz or .csv file (String)
+    """
+    if(zipfile.is_zipfile(filename)):
+        with np.load(filename, allow_pickle=False) as data:
+            columns = {key: data[key] for key in data.files}
+
+        num_rows = len(next(iter(columns.values()))) if len(columns) > 0 else 0
+        return [{key: value[i] for key, value in columns.items()} for i in range(num_rows)]
+
+    # The default float parser of read_csv can be off in the last digit
+    df = pd.read_csv(filename, float_precision='round_trip')
+    if('Gradient' in df.columns and not pd.api.types.is_numeric_dtype(df['Gradient'])):
+        df['Gradient'] = [np.array(g.strip('[]').split(), dtype=float) for g in df['Gradient']]
+
+    return df.to_dict('records')
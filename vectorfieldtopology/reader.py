@@ -0,0 +1,85 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import logging
+import multiprocessing
+from typing import Deque, List, Tuple
+
+from vectorfieldtopology import constants, helpers
+from vtkmodules.vtkCommonDataModel import vtkUnstructuredGrid
+
+
+class PrefetchingReader():
+    """
+    Reads the next files of a list in a background process while the current one is processed.
+    The files are read in a process, not a thread, since the vtk readers hold the GIL. They are sent back as numpy arrays.
+    At most depth files are read ahead, which caps the memory to depth+1 timesteps.
+
+        with PrefetchingReader(filenames) as reader:
+            for filename in filenames:
+                vft = VectorFieldTopology()
+                vft.read_file(filename, reader=reader)
+    """
+
+    def __init__(self, filenames: List[str], rename_xyz: bool = False, depth: int = constants.PREFETCH_DEPTH):
+        """
+        :filenames: Files in the order they are read
+        :rename_xyz: Renames the X, Y and Z header of the prefetched .dat files, see read_file()
+        :depth: Number of files read ahead
+        """
+        if(depth < 1):
+            raise ValueError(f"Prefetch depth must be at least 1, got {depth}")
+
+        self.filenames = list(filenames)
+        self.rename_xyz = rename_xyz
+        self.depth = depth
+        self.number_of_prefetched_files = 0
+
+        self.__next_index = 0
+        self.__pending: Deque[Tuple[str, bool, Future]] = deque()
+        # Spawned, since a forked process would copy the vtk state of this one
+        self.__executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        self.__prefetch()
+
+    def read_file(self, filename: str, rename_xyz: bool = False) -> vtkUnstructuredGrid:
+        """
+        Returns the data of a .dat or .vtu file, like VectorFieldTopology.read_file().
+        The file is taken from the background process if it was prefetched, otherwise it's read here.
+        The files after it in filenames are then prefetched.
+        """
+        # Files before the requested one are skipped
+        while(len(self.__pending) > 0 and self.__pending[0][0] != filename):
+            self.__pending.popleft()[2].cancel()
+
+        if(len(self.__pending) > 0 and self.__pending[0][1] == rename_xyz):
+            _, _, future = self.__pending.popleft()
+            data_object = helpers.get_unstructured_grid_from_arrays(future.result())
+            self.number_of_prefetched_files += 1
+            logging.info(f"Read '{filename}' from the prefetched files.")
+        else:
+            self.__pending.clear()
+            data_object = helpers.read_data_object(filename, rename_xyz)
+
+        if(filename in self.filenames):
+            self.__next_index = max(self.__next_index, self.filenames.index(filename)+1+len(self.__pending))
+        self.__prefetch()
+
+        return data_object
+
+    def close(self) -> None:
+        """Stops the background process. Files that are still being read are dropped."""
+        for _, _, future in self.__pending:
+            future.cancel()
+        self.__pending.clear()
+        self.__executor.shutdown(wait=True)
+
+    def __prefetch(self) -> None:
+        while(len(self.__pending) < self.depth and self.__next_index < len(self.filenames)):
+            filename = self.filenames[self.__next_index]
+            self.__pending.append((filename, self.rename_xyz, self.__executor.submit(helpers.read_data_object_arrays, filename, self.rename_xyz)))
+            self.__next_index += 1
+
+    def __enter__(self) -> 'PrefetchingReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,85 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Voxel indices are packed into one int64 key, 21 bits per axis.
+_KEY_BITS = 21
+_KEY_OFFSET = 1 << (_KEY_BITS-1)
+
+# Offsets of a voxel and its 26 neighbours
+_NEIGHBOUR_OFFSETS = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+
+def get_voxel_keys(points, voxel_size: float) -> np.ndarray:
+    """Returns a hash key of the voxel every point lies in.
+    :points: (N,3) array of points
+    :voxel_size: Edge length of the voxels
+    """
+    cells = np.floor(np.asarray(points, dtype=float).reshape(-1, 3)/voxel_size).astype(np.int64) + _KEY_OFFSET
+
+    if(len(cells) > 0 and (cells.min() < 0 or cells.max() >= (1 << _KEY_BITS))):
+        raise ValueError(f"Voxel size {voxel_size} is too small for the extent of the points.")
+
+    return (cells[:, 0] << (2*_KEY_BITS)) | (cells[:, 1] << _KEY_BITS) | cells[:, 2]
+
+
+def get_voxel_representatives(points, voxel_size: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Keeps the first point of every voxel.
+    :points: (N,3) array of points
+    :voxel_size: Edge length of the voxels
+    :return: Indices of the kept points, and for every point the index of the kept point in its voxel
+    """
+    keys = get_voxel_keys(points, voxel_size)
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+    return np.sort(first), first[inverse.reshape(-1)]
+
+
+def get_minimum_spacing_representatives(points, min_spacing: float) -> np.ndarray:
+    """Returns for every point the index of the point that represents it. Every point is closer than min_spacing to its
+    representative, and the representatives are at least min_spacing apart. The points are visited in order, and a point is
+    kept as a representative if no kept point in the 27 neighbouring voxels of edge min_spacing is closer than min_spacing.
+    :points: (N,3) array of points
+    :min_spacing: Smallest distance between two representatives
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    representatives = np.arange(len(points))
+    cells = np.floor(points/min_spacing).astype(np.int64)
+
+    kept = {}
+    for i, (x, y, z) in enumerate(cells.tolist()):
+        candidates = [j for dx, dy, dz in _NEIGHBOUR_OFFSETS for j in kept.get((x+dx, y+dy, z+dz), ())]
+        if(len(candidates) > 0):
+            distances = np.sum((points[candidates]-points[i])**2, axis=1)
+            nearest = np.argmin(distances)
+            if(distances[nearest] < min_spacing**2):
+                representatives[i] = candidates[nearest]
+                continue
+
+        kept.setdefault((x, y, z), []).append(i)
+
+    return representatives
+
+
+def get_voxel_subsampled_points_from_chunks(chunks, voxel_size: Optional[float] = None) -> np.ndarray:
+    """Keeps the first point of every voxel over a stream of point chunks, so only one chunk has to be in memory.
+    :chunks: Iterable of (N,3) arrays of points
+    :voxel_size: Edge length of the voxels. No subsampling if None.
+    """
+    kept_chunks = [np.empty((0, 3))]
+    seen_keys = np.empty(0, dtype=np.int64)
+
+    for points in chunks:
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if(voxel_size is None):
+            kept_chunks.append(points)
+            continue
+
+        keys = get_voxel_keys(points, voxel_size)
+        unique_keys, first = np.unique(keys, return_index=True)
+        is_new = ~np.isin(unique_keys, seen_keys, assume_unique=True)
+
+        kept_chunks.append(points[np.sort(first[is_new])])
+        seen_keys = np.union1d(seen_keys, unique_keys[is_new])
+
+    return np.concatenate(kept_chunks)
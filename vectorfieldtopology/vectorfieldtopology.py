@@ -1,17 +1,22 @@
-import csv
 import logging
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from enum import Enum, auto
 
-import pandas as pd
-from vectorfieldtopology import constants, helpers
-from vtk import vtkUnstructuredGrid, vtkTecplotReader, vtkVectorFieldTopology, vtkImageData, vtkArrayCalculator, vtkActor, vtkXMLUnstructuredGridReader
-from vtkmodules.util.numpy_support import vtk_to_numpy
+from vectorfieldtopology import constants, derived_fields, helpers
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkCommonDataModel import vtkDataObject, vtkImageData, vtkPolyData, vtkStaticCellLocator, vtkUnstructuredGrid
+from vtkmodules.vtkFiltersCore import vtkProbeFilter
+from vtkmodules.vtkFiltersFlowPaths import vtkVectorFieldTopology
+from vtkmodules.vtkFiltersGeneral import vtkGradientFilter
+from vtkmodules.util.numpy_support import numpy_to_vtk, vtk_to_numpy
 import os
 import numpy as np
 from vtk_visualization import helpers as vtk_helper
 import warnings
 
+if TYPE_CHECKING:
+    from vectorfieldtopology.reader import PrefetchingReader
+
 logging.basicConfig(level=logging.INFO)
 
 class CriticalPoint(Enum):
@@ -41,7 +46,13 @@ class VectorFieldTopology():
         self.vectorfield = vtkImageData()
         self.topology_object = vtkVectorFieldTopology()
         self.is_debug = False
-        self.sphere_removed_actor = vtkActor()
+        self.removed_sphere = None
+        self.gradient_field = None
+        self.__gradient_field_source = None
+        self.vectorfield_samples = None
+        self.__vectorfield_samples_source = None
+        self.derived_fields = derived_fields.DerivedFieldRegistry(self.data_object)
+        self.__register_default_derived_fields()
 
     def set_debug(self, value:bool) -> None:
         """Sets the debug status of the class.
@@ -49,39 +60,16 @@ class VectorFieldTopology():
         """
         self.is_debug = value
 
-    def read_file(self, filename:str, rename_xyz:bool = False) -> None:
+    def read_file(self, filename:str, rename_xyz:bool = False, reader:Optional['PrefetchingReader'] = None) -> None:
         """
         Reads file and creates vectorfield from given scalars. Able to process .dat and .vtu files.
         :filename: Path to file (String)
+        :reader: PrefetchingReader that already read the file in the background (optional)
         """
-        # Write this if statement to rename the file header before opening it with vtk, since vtk needs X,Y,Z variables.
-        if(rename_xyz):
-            a_file = open(filename, "r")
-            list_of_lines = a_file.readlines()
-            list_of_lines[1] = list_of_lines[1].replace("X [R]", "X").replace("Y [R]", "Y").replace("Z [R]", "Z")
-
-            a_file = open(filename, "w")
-            a_file.writelines(list_of_lines)
-            a_file.close()
-        
-        if(os.path.exists(filename)):
-        
-            if(filename.endswith('.dat')):
-                reader = vtkTecplotReader()
-                reader.SetFileName(filename)
-                reader.Update()
-                self.data_object.ShallowCopy(reader.GetOutput().GetBlock(0))
-                logging.info("Read file done.") 
-
-            elif(filename.endswith('.vtu')):
-                reader = vtkXMLUnstructuredGridReader()
-                reader.SetFileName(filename)
-                reader.Update()
-                self.data_object.ShallowCopy(reader.GetOutput())
-                logging.info("Read file done.") 
-
+        if(reader is not None):
+            self.data_object.ShallowCopy(reader.read_file(filename, rename_xyz))
         else:
-            raise FileNotFoundError()
+            self.data_object.ShallowCopy(helpers.read_data_object(filename, rename_xyz))
 
     def update_vectorfield_from_scalars(self, scalar_name_x:str, scalar_name_y:str, scalar_name_z:str, noise_factor:float=0.0) -> None:
         """Returns vectorfield data
@@ -90,31 +78,14 @@ class VectorFieldTopology():
         :scalar_name_z: Name of z component (String)
         """
 
-        # Create new vectorfield from scalars
-        vecFieldCalc = vtkArrayCalculator()
-        vecFieldCalc.SetInputData(self.data_object)
-        vecFieldCalc.AddScalarArrayName(scalar_name_x)
-        vecFieldCalc.AddScalarArrayName(scalar_name_y)
-        vecFieldCalc.AddScalarArrayName(scalar_name_z)
-        
-        # TODO: Remove or not??
-        #noise_string = f"(sqrt({scalar_name_x}^2+{scalar_name_y}^2+{scalar_name_z}^2)*{noise_factor})" # delta b = mag*noise_percent
-        #bx_string = f"({scalar_name_x}+{noise_string}/{scalar_name_x})*iHat"
-        #by_string = f"({scalar_name_y}+{noise_string}/{scalar_name_y})*jHat"
-        #bz_string = f"({scalar_name_z}+{noise_string}/{scalar_name_z})*kHat"
-
-        if((' ' in scalar_name_x) == True):
-            scalar_name_x = f'"{scalar_name_x}"'
-        if((' ' in scalar_name_y) == True):
-            scalar_name_y = f'"{scalar_name_y}"'
-        if((' ' in scalar_name_z) == True):
-            scalar_name_z = f'"{scalar_name_z}"'
-        
-        vecFieldCalc.SetFunction(f'{scalar_name_x}*iHat+{scalar_name_y}*jHat+{scalar_name_z}*kHat')
-        vecFieldCalc.SetResultArrayName("Vectorfield")
-        vecFieldCalc.Update()
+        # The vectorfield is a derived field on a shallow copy of the data, so the data itself isn't copied
+        self.derived_fields.register(constants.VECTORFIELD_ARRAY_NAME, lambda x, y, z: np.column_stack([x, y, z]).astype(float, copy=False), [scalar_name_x, scalar_name_y, scalar_name_z])
+
+        vectorfield = self.data_object.NewInstance()
+        vectorfield.ShallowCopy(self.data_object)
+        vectorfield.GetPointData().SetVectors(self.derived_fields.get_vtk_array(constants.VECTORFIELD_ARRAY_NAME))
 
-        self.vectorfield = vecFieldCalc.GetOutput()
+        self.vectorfield = vectorfield
 
     def update_vectorfield_from_vectors(self, vectorfield: vtkImageData) -> None:
         """Returns vectorfield data
@@ -122,6 +93,87 @@ class VectorFieldTopology():
         """
         self.vectorfield = vectorfield
 
+    def get_plasma_beta_points_of_interest(self, threshold:float = constants.PLASMA_BETA_THRESHOLD, every_nth:int = 1) -> np.ndarray:
+        """
+        Returns the (N,3) points of interest of the plasma beta pipeline: points on the B_z = 0 surface where ln(plasma beta) is at least threshold.
+        Runs in-process on the loaded data, can be given directly to SeedpointGenerator.set_custom_points().
+        :threshold: Threshold of ln(plasma beta)
+        :every_nth: Keeps every nth point
+        """
+        log_plasma_beta = self.derived_fields.get(constants.PLASMA_BETA_ARRAY_NAME)
+        points = derived_fields.get_plasma_beta_points_of_interest(self.data_object, threshold, log_plasma_beta=log_plasma_beta)
+        return points[::every_nth]
+
+    def __register_default_derived_fields(self) -> None:
+        """Registers the derived fields of the magnetic field and plasma beta"""
+        b_x, b_y, b_z = constants.MAGNETIC_FIELD_ARRAY_NAMES
+
+        self.derived_fields.register(constants.MAGNETIC_FIELD_MAGNITUDE_ARRAY_NAME, lambda x, y, z: np.sqrt(x.astype(float)**2+y**2+z**2), [b_x, b_y, b_z])
+        self.derived_fields.register(constants.PLASMA_BETA_ARRAY_NAME, lambda p, x, y, z: derived_fields.get_log_plasma_beta(p, np.column_stack([x, y, z])), [constants.PRESSURE_ARRAY_NAME, b_x, b_y, b_z])
+
+    def get_gradient_at_points(self, points: List[Tuple[float, float, float]]) -> np.ndarray:
+        """
+        Returns the (N,9) gradient of the vectorfield at the given points, in the same layout as the 'Gradient' of the critical point info.
+        The gradient of the whole vectorfield is computed once and cached, every call is a single probe.
+        :points: List of points with x,y,z coordinates
+        """
+        points = np.ascontiguousarray(points, dtype=float).reshape(-1, 3)
+        if(len(points) == 0):
+            return np.empty((0, 9))
+
+        vtk_points = vtkPoints()
+        vtk_points.SetData(numpy_to_vtk(points, deep=True))
+        poly = vtkPolyData()
+        poly.SetPoints(vtk_points)
+
+        probe = vtkProbeFilter()
+        probe.SetInputData(poly)
+        probe.SetSourceData(self.__get_gradient_field())
+        probe.SetCellLocatorPrototype(vtkStaticCellLocator())
+        probe.Update()
+
+        point_data = probe.GetOutput().GetPointData()
+        gradient = vtk_to_numpy(point_data.GetArray(constants.GRADIENT_ARRAY_NAME)).reshape(-1, 9).copy()
+
+        is_valid = vtk_to_numpy(point_data.GetArray(probe.GetValidPointMaskArrayName())).astype(bool)
+        if(not np.all(is_valid)):
+            warnings.warn(f"{np.count_nonzero(~is_valid)} points are outside the vectorfield, their gradient is zero")
+
+        return gradient
+
+    def __get_gradient_field(self):
+        """Returns the vectorfield with its gradient. Only recomputed when the vectorfield has changed."""
+
+        source = (self.vectorfield, self.vectorfield.GetMTime())
+        if(self.gradient_field is None or self.__gradient_field_source != source):
+            vectors = self.vectorfield.GetPointData().GetVectors()
+            if(vectors is None):
+                raise ValueError("The vectorfield has no vectors. Update the vectorfield first")
+
+            gradient_filter = vtkGradientFilter()
+            gradient_filter.SetInputData(self.vectorfield)
+            gradient_filter.SetInputArrayToProcess(0, 0, 0, vtkDataObject.FIELD_ASSOCIATION_POINTS, vectors.GetName())
+            gradient_filter.SetResultArrayName(constants.GRADIENT_ARRAY_NAME)
+            gradient_filter.Update()
+
+            self.gradient_field = gradient_filter.GetOutput()
+            self.__gradient_field_source = source
+            logging.info("Updated gradient of the vectorfield.")
+
+        return self.gradient_field
+
+    def get_vectorfield_samples(self) -> List[vtkPolyData]:
+        """
+        Returns the voxel sampled vectorfield at every level of detail in VECTORFIELD_LOD_NUMBER_OF_POINTS, used for the vectorfield glyphs.
+        Only recomputed when the vectorfield has changed.
+        """
+        source = (self.vectorfield, self.vectorfield.GetMTime())
+        if(self.vectorfield_samples is None or self.__vectorfield_samples_source != source):
+            self.vectorfield_samples = helpers.get_vector_field_samples(self.vectorfield)
+            self.__vectorfield_samples_source = source
+
+        return self.vectorfield_samples
+
     def update_topology_object(self) -> None:
         """Updates vector field topology object. Contains only critical points now.
         """
@@ -138,6 +190,13 @@ class VectorFieldTopology():
 
         logging.info("Updated topology object.") 
 
+    def set_critical_points_info(self, critical_points_info: List[CriticalPointInfo]) -> None:
+        """Sets the critical point info and the critical points, e.g. from the pipeline cache instead of update_critical_points()
+        :critical_points_info: List of critical point info
+        """
+        self.critical_points_info = list(critical_points_info)
+        self.critical_points = [(x['X'], x['Y'], x['Z']) for x in self.critical_points_info]
+
     def update_critical_points(self) -> None:
         """ Set the critical points property self.critical_points
         """
@@ -189,18 +248,18 @@ class VectorFieldTopology():
         self.critical_points = [self.critical_points[x] for x in list_of_indices_to_keep]
         self.critical_points_info = [self.critical_points_info[x] for x in list_of_indices_to_keep]
 
-        # Update sphere removed actor 
+        # The sphere actor is only built in update_list_of_actors()
         if(radius > 0):
-            self.sphere_removed_actor = helpers.get_sphere_actor(radius=radius, center=center)
+            self.removed_sphere = (radius, center)
 
         logging.info(f"Removed {initial_size-len(self.critical_points)} critical points.")
         
 
     def save_critical_points_to_file(self, critical_point_filename='critical_points.txt', critical_point_info_filename='critical_points_info.csv') -> None:
         """
-        Creates processed_critical_points directory with critical points as txt file and critical point information as a csv file
+        Creates processed_critical_points directory with critical points as txt file and critical point information as a csv or npz file
         :critical_point_filename: critical point filename
-        :critical_point_info_filename: critical point info filename
+        :critical_point_info_filename: critical point info filename. A '.npz' extension saves a binary file that keeps the gradients as float arrays.
         """
         dirName = 'critical_points'
 
@@ -210,20 +269,9 @@ class VectorFieldTopology():
         else:    
             logging.info(f"Directory {dirName} already exists.")
 
-        keys = self.critical_points_info[0].keys()
-
         try:
-            with open(f'{dirName}/{critical_point_info_filename}', mode='w',encoding='utf8', newline='') as output_to_csv:
-                dict_csv_writer = csv.DictWriter(output_to_csv, fieldnames=keys, dialect='excel')
-                dict_csv_writer.writeheader()
-                dict_csv_writer.writerows(self.critical_points_info)
-
-            # TODO: Remove this, is for debugging in paraview.
-            df = pd.read_csv(f'{dirName}/{critical_point_info_filename}')
-            df.drop('Gradient', inplace=True, axis=1)
-            df.to_csv(f'{dirName}/critical_point_info_no_gradient.csv', index=False)
-            # ===========================================================
-            
+            helpers.save_critical_points_info(f'{dirName}/{critical_point_info_filename}', self.critical_points_info)
+
             np.savetxt(f"{dirName}/{critical_point_filename}", self.critical_points, fmt='%1.5f')
             logging.info(f"Saved critical point files, '{dirName}/{critical_point_filename}', and '{dirName}/{critical_point_info_filename}'")
         except IOError as io:
@@ -235,12 +283,19 @@ class VectorFieldTopology():
         :show_critical_points: Boolean on wether to show critical points or not.
         :show_saperator: Boolean on wether to show separator or not.
         :show_vectorfield: Boolean on wether to show vectorfield or not.
+        Does nothing in headless mode.
         """
 
         self.list_of_actors.clear()
+        if(vtk_helper.is_headless()):
+            return
 
         if(show_critical_points):
-            critical_point_actor = helpers.get_critical_point_actor(self.topology_object)
+            # Without a topology object, e.g. when the critical points were set with set_critical_points_info(), the critical points are drawn directly
+            if(self.topology_object.GetNumberOfInputConnections(0) == 0):
+                critical_point_actor = helpers.get_critical_point_actor_from_points(self.critical_points)
+            else:
+                critical_point_actor = helpers.get_critical_point_actor(self.topology_object)
             self.list_of_actors.append(critical_point_actor)
 
         if(show_separator):
@@ -248,14 +303,19 @@ class VectorFieldTopology():
             self.list_of_actors.append(separator_actor)
 
         if(show_vectorfield):
-            vectorfield_actor = helpers.get_vector_field_actor(self.vectorfield)
+            vectorfield_actor = helpers.get_vector_field_actor(self.get_vectorfield_samples())
             self.list_of_actors.append(vectorfield_actor)
 
-        self.list_of_actors.append(self.sphere_removed_actor)
+        if(self.removed_sphere is not None):
+            radius, center = self.removed_sphere
+            self.list_of_actors.append(helpers.get_sphere_actor(radius=radius, center=center))
 
 
     def visualize(self) -> None:
         """Starts the rendering"""
+        if(vtk_helper.is_headless()):
+            return
+
         if(len(self.list_of_actors) == 0):
             warnings.warn("List of actors is empty. Make sure to update the list of actors with the function update_list_of_actors()")
 
@@ -0,0 +1,27 @@
+# Render window. Used in start_window() and save_snapshots()
+WINDOW_SIZE = (1920, 1080)
+BACKGROUND_COLOR = (30/255, 30/255, 30/255)
+
+# Offscreen rendering. Used in save_snapshots()
+SNAPSHOT_DIRECTORY = 'snapshots'
+SNAPSHOT_PREFIX = 'snapshot'
+
+# Camera views of the snapshots, the direction from the focal point to the camera and the view up
+CAMERA_VIEWS = {
+    'xy': ((0, 0, 1), (0, 1, 0)),
+    'xz': ((0, -1, 0), (0, 0, 1)),
+    'yz': ((1, 0, 0), (0, 0, 1)),
+    'iso': ((1, -1, 1), (0, 0, 1)),
+}
+
+# Headless mode, no actors are built and vtkRendering modules are never imported. Can be changed with set_headless()
+HEADLESS = False
+
+# Persistent viewer, used in ViewerSession
+VIEWER_WINDOW_NAME = 'Critical points'
+VIEWER_HELP_KEY = 'h'
+# Keys of vtkInteractorStyleTrackballCamera that can't be bound
+VIEWER_RESERVED_KEYS = ['3', 'a', 'c', 'e', 'f', 'j', 'p', 'q', 'r', 's', 't', 'u', 'w']
+
+# Scene export, used in export_scene()
+SCENE_FILENAME = 'scene/scene.vtm'
@@ -1,20 +1,81 @@
-from typing import List
-from vtk import vtkAxesActor, vtkTransform, vtkActor, vtkNamedColors
-from vtkmodules.vtkRenderingCore import (
-    vtkActor,
-    vtkRenderWindow,
-    vtkRenderWindowInteractor,
-    vtkRenderer
-)
-
-def custom_axes() -> vtkAxesActor:
+import logging
+import os
+from types import ModuleType
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+from vtkmodules.vtkCommonColor import vtkNamedColors
+from vtkmodules.vtkCommonDataModel import vtkCompositeDataSet, vtkDataObject, vtkMultiBlockDataSet
+from vtkmodules.vtkCommonTransforms import vtkTransform
+from vtkmodules.vtkIOImage import vtkPNGWriter
+from vtkmodules.vtkIOXML import vtkXMLMultiBlockDataWriter
+import numpy as np
+from vtk_visualization import constants
+
+if TYPE_CHECKING:
+    from vtkmodules.vtkRenderingAnnotation import vtkAxesActor
+    from vtkmodules.vtkRenderingCore import vtkActor
+
+# Rendering modules are only imported by load_rendering_modules(), so nothing is imported in headless mode
+_headless = {'enabled': constants.HEADLESS}
+_rendering = {'modules': None}
+
+# Offscreen state shared by all visualize() calls, the render window and renderer are reused for every snapshot
+_offscreen = {
+    'enabled': False,
+    'directory': constants.SNAPSHOT_DIRECTORY,
+    'prefix': constants.SNAPSHOT_PREFIX,
+    'views': list(constants.CAMERA_VIEWS),
+    'counter': 0,
+    'render_window': None,
+    'renderer': None,
+}
+
+def set_headless(enabled: bool = True) -> None:
+    """Turns headless mode on or off. In headless mode no actors are built, visualize() does nothing and vtkRendering modules are never imported.
+    :enabled: Turns headless mode on or off
+    """
+    _headless['enabled'] = enabled
+
+def is_headless() -> bool:
+    """Returns True if headless mode is on"""
+    return _headless['enabled']
+
+class RenderingModules():
+    """The classes of the vtkRendering modules, e.g. rendering.vtkActor. Returned by load_rendering_modules()."""
+
+    def __init__(self, modules: List[ModuleType]):
+        self._modules = modules
+
+    def __getattr__(self, name: str):
+        for module in self._modules:
+            if(hasattr(module, name)):
+                return getattr(module, name)
+
+        raise AttributeError(f"No vtkRendering class named '{name}'")
+
+def load_rendering_modules() -> RenderingModules:
+    """Imports the vtkRendering modules with the OpenGL backend the first time, and returns their classes. Called before an actor or window is built.
+    e.g. rendering = load_rendering_modules(); actor = rendering.vtkActor()
+    """
+    if(_headless['enabled']):
+        raise RuntimeError("Rendering is turned off in headless mode. Use set_headless(False) to render")
+
+    if(_rendering['modules'] is None):
+        import vtkmodules.vtkRenderingFreeType
+        import vtkmodules.vtkRenderingOpenGL2
+        from vtkmodules import vtkInteractionStyle, vtkRenderingAnnotation, vtkRenderingCore, vtkRenderingLOD
+        _rendering['modules'] = RenderingModules([vtkRenderingCore, vtkRenderingLOD, vtkRenderingAnnotation, vtkInteractionStyle])
+
+    return _rendering['modules']
+
+def custom_axes() -> 'vtkAxesActor':
     """ Returns helper axis """
+    rendering = load_rendering_modules()
 
     # Add X,Y,Z helper axis
     transform = vtkTransform()
     transform.Translate(25.0, -10.0, 0.0)
 
-    axes = vtkAxesActor()
+    axes = rendering.vtkAxesActor()
     #  The axes are positioned with a user transform
     axes.SetUserTransform(transform)
     axes.SetTotalLength(5, 5, 5)
@@ -42,32 +103,181 @@ def custom_axes() -> vtkAxesActor:
 
     return axes
 
-def start_window(list_of_actors: List[ vtkActor ]) -> None:
-    """Starts rendering all the given vtk actors
+def set_offscreen_rendering(enabled: bool = True, directory: str = constants.SNAPSHOT_DIRECTORY, prefix: str = constants.SNAPSHOT_PREFIX, views: Optional[List[str]] = None) -> None:
+    """Makes start_window(), and with it every visualize(), write PNG snapshots instead of opening an interactive window
+    :enabled: Turns offscreen rendering on or off
+    :directory: Directory of the snapshots
+    :prefix: Start of the snapshot filenames, e.g. the timestep. The snapshot counter is reset when it is changed.
+    :views: Names of the camera views in CAMERA_VIEWS (optional), default is all of them
+    """
+    views = list(constants.CAMERA_VIEWS) if views is None else views
+    for view in views:
+        if(view not in constants.CAMERA_VIEWS):
+            raise ValueError(f"Unknown camera view '{view}'. Use one of {list(constants.CAMERA_VIEWS)}")
+
+    if(prefix != _offscreen['prefix']):
+        _offscreen['counter'] = 0
+
+    _offscreen.update({'enabled': enabled, 'directory': directory, 'prefix': prefix, 'views': views})
+
+def is_offscreen() -> bool:
+    """Returns True if offscreen rendering is on"""
+    return _offscreen['enabled']
+
+def save_snapshots(list_of_actors: List[ 'vtkActor' ], filename: Optional[str] = None) -> List[str]:
+    """Renders the actors offscreen from every camera view and saves them as PNG files. Returns the filenames.
+    :list_of_actors: List containing all the vtkActors
+    :filename: Start of the filenames (optional), default is the prefix and a counter
+    """
+    rendering = load_rendering_modules()
+
+    if(_offscreen['render_window'] is None):
+        renderer = rendering.vtkRenderer()
+        renderer.SetBackground(*constants.BACKGROUND_COLOR)
+
+        render_window = rendering.vtkRenderWindow()
+        render_window.SetOffScreenRendering(True)
+        render_window.AddRenderer(renderer)
+        render_window.SetSize(*constants.WINDOW_SIZE)
+
+        _offscreen['render_window'], _offscreen['renderer'] = render_window, renderer
+
+    render_window, renderer = _offscreen['render_window'], _offscreen['renderer']
+
+    if(filename is None):
+        filename = f"{_offscreen['prefix']}_{_offscreen['counter']:04d}"
+        _offscreen['counter'] += 1
+
+    if not os.path.exists(_offscreen['directory']):
+        os.makedirs(_offscreen['directory'])
+
+    renderer.RemoveAllViewProps()
+    renderer.AddActor(custom_axes())
+    for actor in list_of_actors:
+        renderer.AddActor(actor)
+
+    renderer.ResetCamera()
+    camera = renderer.GetActiveCamera()
+    focal_point = np.array(camera.GetFocalPoint())
+    distance = camera.GetDistance()
+
+    list_of_filenames = []
+    for view in _offscreen['views']:
+        direction, view_up = constants.CAMERA_VIEWS[view]
+        direction = np.asarray(direction, dtype=float)/np.linalg.norm(direction)
+
+        camera.SetFocalPoint(*focal_point)
+        camera.SetPosition(*(focal_point + distance*direction))
+        camera.SetViewUp(*view_up)
+        renderer.ResetCamera()
+        render_window.Render()
+
+        window_to_image = rendering.vtkWindowToImageFilter()
+        window_to_image.SetInput(render_window)
+        window_to_image.ReadFrontBufferOff()
+        window_to_image.Update()
+
+        path = f"{_offscreen['directory']}/{filename}_{view}.png"
+        writer = vtkPNGWriter()
+        writer.SetFileName(path)
+        writer.SetInputConnection(window_to_image.GetOutputPort())
+        writer.Write()
+        list_of_filenames.append(path)
+
+    logging.info(f"Saved {len(list_of_filenames)} snapshots to '{_offscreen['directory']}/{filename}_*.png'")
+    return list_of_filenames
+
+def get_actor_datasets(list_of_actors: List[ 'vtkActor' ]) -> List[vtkDataObject]:
+    """Returns a shallow copy of the mapper input of every actor, the geometry and attributes that are rendered. Actors without a mapper are skipped.
+    :list_of_actors: List containing the vtkActors
+    """
+    list_of_datasets = []
+    for actor in list_of_actors:
+        mapper = actor.GetMapper() if hasattr(actor, 'GetMapper') else None
+        if(mapper is None):
+            continue
+
+        if(mapper.GetNumberOfInputConnections(0) > 0):
+            mapper.GetInputAlgorithm().Update()
+
+        dataset = mapper.GetInputDataObject(0, 0)
+        if(dataset is None):
+            continue
+
+        copy = dataset.NewInstance()
+        copy.ShallowCopy(dataset)
+        list_of_datasets.append(copy)
+
+    return list_of_datasets
+
+def export_scene(stages: Dict[str, Union[vtkDataObject, 'vtkActor', List[Union[vtkDataObject, 'vtkActor']]]], filename: str = constants.SCENE_FILENAME) -> None:
+    """Writes the geometry of every stage as one named block of a .vtm multiblock file with binary appended data, to open in ParaView without running anything again.
+    :stages: Dictionary of stage name to a dataset, an actor or a list of them, e.g. {'critical_points': vft.list_of_actors, 'fieldlines': sp_processor.get_fieldlines_polydata()}
+    :filename: Path of the .vtm file. The blocks are written to a directory with the same name.
+    """
+    scene = vtkMultiBlockDataSet()
+    for stage, items in stages.items():
+        items = items if isinstance(items, (list, tuple)) else [items]
+
+        block = vtkMultiBlockDataSet()
+        datasets = [item for item in items if isinstance(item, vtkDataObject)] + get_actor_datasets([item for item in items if not isinstance(item, vtkDataObject)])
+        for dataset in datasets:
+            index = block.GetNumberOfBlocks()
+            block.SetBlock(index, dataset)
+            block.GetMetaData(index).Set(vtkCompositeDataSet.NAME(), f"{stage}_{index}")
+
+        index = scene.GetNumberOfBlocks()
+        scene.SetBlock(index, block)
+        scene.GetMetaData(index).Set(vtkCompositeDataSet.NAME(), stage)
+
+    directory = os.path.dirname(filename)
+    if(directory != '' and not os.path.exists(directory)):
+        os.makedirs(directory)
+
+    writer = vtkXMLMultiBlockDataWriter()
+    writer.SetFileName(filename)
+    writer.SetInputData(scene)
+    writer.SetDataModeToAppended()
+    writer.EncodeAppendedDataOff()
+    writer.SetHeaderTypeToUInt64()
+    writer.Write()
+    logging.info(f"Exported {len(stages)} stages to '{filename}'")
+
+def start_window(list_of_actors: List[ 'vtkActor' ]) -> None:
+    """Starts rendering all the given vtk actors. Saves snapshots instead if offscreen rendering is turned on with set_offscreen_rendering().
     :list_of_actors: List containing all the vtkActors
     """
+    if(_headless['enabled']):
+        logging.info("Headless mode, nothing is rendered.")
+        return
+
+    if(_offscreen['enabled']):
+        save_snapshots(list_of_actors)
+        return
+
+    rendering = load_rendering_modules()
     
     colors = vtkNamedColors()
 
     axes = custom_axes()
     # Renderer
-    renderer = vtkRenderer()
+    renderer = rendering.vtkRenderer()
     renderer.AddActor(axes)
 
     for actor in list_of_actors:
         renderer.AddActor(actor)
 
     renderer.ResetCamera()
-    renderer.SetBackground(30/255,30/255,30/255)  # Background Slate Gray
+    renderer.SetBackground(*constants.BACKGROUND_COLOR)  # Background Slate Gray
 
-    renWin = vtkRenderWindow() 
+    renWin = rendering.vtkRenderWindow() 
     renWin.AddRenderer(renderer)
-    renWin.SetSize(1920,1080)
+    renWin.SetSize(*constants.WINDOW_SIZE)
     renWin.SetWindowName('Critical points')
 
-    iren = vtkRenderWindowInteractor()
+    iren = rendering.vtkRenderWindowInteractor()
     iren.SetRenderWindow(renWin)
     iren.Initialize()
 
     renWin.Render()
-    iren.Start()
\ No newline at end of file
+    iren.Start()
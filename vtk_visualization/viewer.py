@@ -0,0 +1,167 @@
+from collections import OrderedDict
+import logging
+from typing import TYPE_CHECKING, Callable, List, Tuple, Union
+
+from vtkmodules.vtkCommonDataModel import vtkDataObject
+from vtk_visualization import constants, helpers
+
+if TYPE_CHECKING:
+    from vtkmodules.vtkCommonExecutionModel import vtkAlgorithm
+    from vtkmodules.vtkFiltersCore import vtkThreshold
+    from vtkmodules.vtkRenderingCore import vtkProp
+
+
+class ViewerSession():
+    """
+    Render window that stays open while the scene changes. The actors are kept in named layers that are shown or hidden,
+    and named thresholds filter cached data, so a filter change never rebuilds or retraces anything.
+    Key bindings run a callback and render the window again, e.g. to toggle a layer.
+    """
+
+    def __init__(self, window_name: str = constants.VIEWER_WINDOW_NAME):
+        """
+        :window_name: Title of the render window
+        """
+        rendering = helpers.load_rendering_modules()
+
+        self.layers = OrderedDict()
+        self.thresholds = {}
+        self.key_bindings = OrderedDict()
+
+        self.renderer = rendering.vtkRenderer()
+        self.renderer.SetBackground(*constants.BACKGROUND_COLOR)
+        self.renderer.AddActor(helpers.custom_axes())
+
+        self.render_window = rendering.vtkRenderWindow()
+        self.render_window.AddRenderer(self.renderer)
+        self.render_window.SetSize(*constants.WINDOW_SIZE)
+        self.render_window.SetWindowName(window_name)
+
+        self.interactor = None
+        self.bind_key(constants.VIEWER_HELP_KEY, self.print_key_bindings, "Show the key bindings")
+
+    def add_layer(self, name: str, actors: Union['vtkProp', List['vtkProp']], key: str = None, visible: bool = True) -> None:
+        """Adds the actors as one layer. A layer with the same name is replaced.
+        :name: Name of the layer
+        :actors: Actor or list of actors
+        :key: Key that toggles the layer (optional)
+        :visible: Show the layer
+        """
+        if(name in self.layers):
+            self.remove_layer(name)
+
+        actors = list(actors) if isinstance(actors, (list, tuple)) else [actors]
+        for actor in actors:
+            actor.SetVisibility(visible)
+            self.renderer.AddViewProp(actor)
+
+        self.layers[name] = actors
+        if(key is not None):
+            self.bind_key(key, lambda: self.toggle_layer(name), f"Toggle layer '{name}'")
+
+    def remove_layer(self, name: str) -> None:
+        """Removes the actors of the layer from the scene"""
+        for actor in self.__get_layer(name):
+            self.renderer.RemoveViewProp(actor)
+
+        del self.layers[name]
+
+    def set_layer_visibility(self, name: str, visible: bool) -> None:
+        """Shows or hides every actor of the layer"""
+        for actor in self.__get_layer(name):
+            actor.SetVisibility(visible)
+
+        self.render()
+
+    def is_layer_visible(self, name: str) -> bool:
+        """Returns True if any actor of the layer is visible"""
+        return any(actor.GetVisibility() for actor in self.__get_layer(name))
+
+    def toggle_layer(self, name: str) -> None:
+        """Hides a visible layer and shows a hidden one"""
+        self.set_layer_visibility(name, not self.is_layer_visible(name))
+
+    def add_threshold(self, name: str, input_data: Union[vtkDataObject, 'vtkAlgorithm'], array_name: str, threshold_range: Tuple[float, float]) -> 'vtkThreshold':
+        """Returns a named threshold on a cell array. Connect mappers or other thresholds to it, and change the range later with set_threshold_range().
+        :name: Name of the threshold
+        :input_data: Dataset or algorithm, e.g. another threshold, to filter
+        :array_name: Name of the cell array
+        :threshold_range: Lower and upper value that are kept
+        """
+        from vtkmodules.vtkFiltersCore import vtkThreshold
+
+        threshold = vtkThreshold()
+        if(isinstance(input_data, vtkDataObject)):
+            threshold.SetInputData(input_data)
+        else:
+            threshold.SetInputConnection(input_data.GetOutputPort())
+
+        threshold.SetInputArrayToProcess(0, 0, 0, vtkDataObject.FIELD_ASSOCIATION_CELLS, array_name)
+        threshold.SetThresholdFunction(vtkThreshold.THRESHOLD_BETWEEN)
+        threshold.SetLowerThreshold(threshold_range[0])
+        threshold.SetUpperThreshold(threshold_range[1])
+
+        self.thresholds[name] = threshold
+        return threshold
+
+    def set_threshold_range(self, name: str, lower: float, upper: float) -> None:
+        """Changes the range of a named threshold. Only the threshold and the filters after it are updated."""
+        if(name not in self.thresholds):
+            raise ValueError(f"Unknown threshold '{name}'. Use one of {list(self.thresholds)}")
+
+        self.thresholds[name].SetLowerThreshold(lower)
+        self.thresholds[name].SetUpperThreshold(upper)
+        self.render()
+
+    def bind_key(self, key: str, callback: Callable[[], None], description: str = '') -> None:
+        """Runs the callback and renders the window when the key is pressed. A key that is already bound is rebound.
+        :key: Key symbol, e.g. 'd' or 'F1'
+        :callback: Function without arguments
+        :description: Text shown by print_key_bindings()
+        """
+        if(key in constants.VIEWER_RESERVED_KEYS):
+            raise ValueError(f"Key '{key}' is used by the vtk interactor style. Don't use any of {constants.VIEWER_RESERVED_KEYS}")
+
+        self.key_bindings[key] = (description, callback)
+
+    def print_key_bindings(self) -> None:
+        """Logs every key binding"""
+        for key, (description, _) in self.key_bindings.items():
+            logging.info(f"{key}: {description}")
+
+    def render(self) -> None:
+        """Renders the window again, does nothing before start()"""
+        if(self.interactor is not None):
+            self.render_window.Render()
+
+    def start(self) -> None:
+        """Opens the window and starts the interaction. Saves snapshots of the visible layers instead if offscreen rendering is turned on."""
+        if(helpers.is_offscreen()):
+            helpers.save_snapshots([actor for actors in self.layers.values() for actor in actors if actor.GetVisibility()])
+            return
+
+        rendering = helpers.load_rendering_modules()
+
+        self.renderer.ResetCamera()
+
+        self.interactor = rendering.vtkRenderWindowInteractor()
+        self.interactor.SetRenderWindow(self.render_window)
+        self.interactor.SetInteractorStyle(rendering.vtkInteractorStyleTrackballCamera())
+        self.interactor.AddObserver('KeyPressEvent', self.__on_key_press)
+        self.interactor.Initialize()
+
+        self.print_key_bindings()
+        self.render_window.Render()
+        self.interactor.Start()
+
+    def __on_key_press(self, interactor, event) -> None:
+        key = interactor.GetKeySym()
+        if(key in self.key_bindings):
+            self.key_bindings[key][1]()
+            self.render()
+
+    def __get_layer(self, name: str) -> List['vtkProp']:
+        if(name not in self.layers):
+            raise ValueError(f"Unknown layer '{name}'. Use one of {list(self.layers)}")
+
+        return self.layers[name]